@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Action Plan - Mode simulation (--dry-run)
+Interception des requêtes mutantes du transport et plan d'actions JSON
+"""
+
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import requests
+
+ACTION_BLOCKLIST = "blocklist"
+ACTION_REMOVE = "remove"
+ACTION_SEARCH = "search"
+ACTION_REQUEST = "request"
+
+
+def _simulated_response(method, url):
+    """Réponse de succès renvoyée à la place de l'appel intercepté"""
+    response = requests.Response()
+    response.status_code = 201 if method == 'POST' else 200
+    response.url = url
+    response.headers['Content-Type'] = 'application/json'
+    response._content = b'{}'
+    return response
+
+
+def describe_request(method, url, params=None, json=None):
+    """Traduit une requête mutante de l'API *arr en action du plan"""
+    path = urlsplit(url).path.rstrip('/')
+    params = params or {}
+    body = json if isinstance(json, dict) else {}
+    
+    if method == 'DELETE' and '/queue/' in path:
+        blocklist = str(params.get('blocklist', 'false')).lower() == 'true'
+        if path.endswith('/queue/bulk'):
+            queue_ids = list(body.get('ids', []))
+        else:
+            queue_ids = [path.rsplit('/', 1)[-1]]
+            queue_ids = [int(queue_ids[0])] if queue_ids[0].isdigit() else queue_ids
+        return {'type': ACTION_BLOCKLIST if blocklist else ACTION_REMOVE, 'queue_ids': queue_ids}
+    
+    if method == 'POST' and path.endswith('/command'):
+        action = {'type': ACTION_SEARCH, 'command': body.get('name')}
+        action.update({key: value for key, value in body.items() if key != 'name'})
+        return action
+    
+    return {'type': ACTION_REQUEST, 'method': method, 'path': path}
+
+
+class ActionPlan:
+    """Plan d'actions : requêtes interceptées, éléments concernés et durées des phases"""
+    
+    def __init__(self, resolve_app=None):
+        # resolve_app(url) -> nom de l'application (par défaut : hôte de l'URL)
+        self.resolve_app = resolve_app or (lambda url: urlsplit(url).netloc)
+        self._lock = threading.Lock()
+        self._actions = {}
+        self._items = {}
+    
+    def intercept(self, method, url, params=None, json=None, **kwargs):
+        """Intercepteur de ArrTransport : consigne l'action au lieu de l'envoyer"""
+        app_name = self.resolve_app(url)
+        action = describe_request(method, url, params, json)
+        with self._lock:
+            self._actions.setdefault(app_name, []).append(action)
+        return _simulated_response(method, url)
+    
+    def add_items(self, app_name, failed_items):
+        """Éléments en échec retenus pour remédiation : [(item, rule)]"""
+        entries = [{
+            'queue_id': item.get('id'),
+            'title': item.get('title', item.get('movieTitle', 'Unknown')),
+            'status': item.get('status'),
+            'rule': rule.name,
+            'action': rule.action
+        } for item, rule in failed_items]
+        with self._lock:
+            self._items.setdefault(app_name, []).extend(entries)
+    
+    def to_dict(self, metrics=None, outcomes=None, config_path=None):
+        """Plan sérialisable : par application, éléments, actions et durées par phase"""
+        timings = {}
+        if metrics is not None:
+            for (app_name, phase), (count, total) in metrics.request_duration.totals().items():
+                timings.setdefault(app_name, {})[phase] = {'count': count, 'seconds': round(total, 4)}
+        
+        outcomes = outcomes or {}
+        with self._lock:
+            app_names = sorted(set(outcomes) | set(self._actions) | set(self._items) | set(timings))
+            applications = {
+                app_name: {
+                    'outcome': outcomes.get(app_name),
+                    'items': list(self._items.get(app_name, [])),
+                    'actions': list(self._actions.get(app_name, [])),
+                    'timings': timings.get(app_name, {})
+                }
+                for app_name in app_names
+            }
+        
+        plan = {
+            'generated_at': datetime.now().astimezone().isoformat(timespec='seconds'),
+            'config': str(config_path) if config_path else None,
+            'applications': applications
+        }
+        if metrics is not None:
+            plan['cycle_seconds'] = round(metrics.cycle_duration.value(), 4)
+        return plan
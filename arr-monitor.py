@@ -9,30 +9,137 @@ import argparse
 import logging
 import time
 import sys
-import os
-import re
 import platform
 from pathlib import Path
 import yaml
 import requests
-from datetime import datetime, timedelta
 import json
+import threading
+import sqlite3
+import signal
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor, wait
+from queue_cache import QueueStateCache
+from config_refresher import ConfigRefresher
+from docker_discovery import DockerDiscovery, DEFAULT_SOCKET
+from metrics import MonitorMetrics, MetricsServer
+from transport import ArrTransport
+from log_anonymizer import LogAnonymizer, AnonymizingFilter
+from log_pipeline import QueuedLogging
+from progress_tracker import ProgressTracker, format_size
+from state_store import StateStore, item_key, RESULT_SUCCESS, RESULT_FAILURE
+from action_plan import ActionPlan
+from cycle_profiler import CycleProfiler
+from diagnose_report import DiagnoseReport, summarize_queue, latency_summary, FORMAT_CSV, FORMAT_JSON
+from systemd_notify import SystemdNotifier
+from webhook_server import WebhookServer
+from queue_record import (project_page, stream_page, QueueParseError, STREAMING_AVAILABLE,
+                          PARSER_FULL, PARSER_LEAN, PARSER_STREAM)
+from failure_history import FailureHistory, media_key, parse_date
+from failure_rules import FailureClassifier, ACTION_BLOCKLIST_SEARCH, ACTION_REMOVE, ACTION_IGNORE
+from scheduler import AdaptiveScheduler, OUTCOME_ACTIVE, OUTCOME_IDLE, OUTCOME_NORMAL, OUTCOME_ERROR
 
 class ArrMonitor:
-    def __init__(self, config_path="config/config.yaml"):
+    # Taille de page maximale demandée à l'API /api/v3/queue
+    MAX_QUEUE_PAGE_SIZE = 1000
+    
+    # Réglages pris en compte au rechargement en reconstruisant le composant concerné
+    TRANSPORT_SETTINGS = ('connect_timeout', 'read_timeout', 'max_retries', 'retry_backoff',
+                          'max_connections_per_host')
+    WEBHOOK_SERVER_SETTINGS = ('enabled', 'host', 'port', 'token')
+    
+    # Réglages lus une seule fois au démarrage (rechargement impossible)
+    RESTART_SETTINGS = {
+        'logging': ('file', 'max_size_mb', 'backup_count', 'json_file'),
+        'state': ('directory', 'database', 'retention_days')
+    }
+    
+    def __init__(self, config_path="config/config.yaml", dry_run=False):
         self.config_path = config_path  # NOUVELLE LIGNE: stocker le chemin
+        self.dry_run = dry_run
         self.config = self.load_config(config_path)
         self.setup_logging()
-        self.session = requests.Session()
         self.version = self._read_version_file()
-        self.anonymize_enabled = self.config.get('privacy', {}).get('anonymize_logs', True)
+        
+        # Règles de classification des échecs (compilées une fois)
+        self.classifier = FailureClassifier.from_config(self.config)
+
+        # Journal des remédiations (max_retries / retry_delay, persistant entre redémarrages),
+        # ouvert en lecture seule en mode simulation
+        try:
+            self.state_store = StateStore.from_config(self.config, read_only=dry_run)
+        except (sqlite3.Error, OSError) as e:
+            self.logger.error(f"❌ Journal de remédiation indisponible : {e}")
+            self.state_store = None
+        
+        # Plan d'actions du mode simulation (--dry-run)
+        self.action_plan = None
+        
+        # Arrêt propre et rechargement par signal (SIGTERM/SIGINT, SIGHUP), notifications systemd
+        self.stop_event = threading.Event()
+        self._reload_requested = threading.Event()
+        self._wake = threading.Event()
+        self.notifier = SystemdNotifier()
+        
+        # Applications en cours de traitement (isolation entre cycles concurrents)
+        self._inflight_apps = set()
+        self._inflight_lock = threading.Lock()
+        
+        # Caches d'état des queues (analyse incrémentale)
+        self._queue_caches = {}
+        self._progress_trackers = {}
+        self._failure_histories = {}
+        
+        # Instances ne supportant pas DELETE /api/v3/queue/bulk
+        self._bulk_unsupported = set()
+        
+        # Santé des connexions : version et date du dernier /system/status réussi
+        self._connection_health = {}
+        
+        # Métriques Prometheus (codes HTTP attribués à l'application via l'hôte de l'URL)
+        self.metrics = MonitorMetrics()
+        self.metrics_server = None
+        
+        # Spans de durée par phase et profil cProfile (profiling.enabled ou --profile)
+        self.profiler = CycleProfiler.from_config(self.config)
+        self._profiling_forced = False
+        
+        # Réception des webhooks : téléchargements signalés par application, en attente de réanalyse
+        self.webhook_server = None
+        self._webhook_hints = {}
+        self._webhook_lock = threading.Lock()
+        
+        # URL de base (hôte + chemin) -> application : plusieurs instances derrière un même proxy
+        self._app_by_url = {}
+        
+        # Latences des requêtes par application, collectées uniquement en mode diagnostic
+        self._latency_samples = None
+        
+        # Transport HTTP : pools keep-alive par hôte, retries sur lectures, timeouts configurés
+        self.transport = self._build_transport()
+        
+        # Réactualisation native des IPs et clés API (cache TTL, réécriture sur changement uniquement)
+        discovery_config = self.config.get('discovery', {})
+        self.config_refresher = ConfigRefresher(
+            config_path,
+            self._build_discovery(),
+            cache_ttl=discovery_config.get('cache_ttl', 300),
+            backup_count=discovery_config.get('backup_count', 5)
+        )
 
+        if self.config.get('monitoring', {}).get('queue_parser') == PARSER_STREAM and not STREAMING_AVAILABLE:
+            self.logger.warning("⚠️ queue_parser: stream nécessite ijson (pip install ijson), repli sur lean")
+        
         # Optimisations ARM64
         if platform.machine() in ['aarch64', 'arm64']:
-            self.setup_arm64_optimizations()
+            self.setup_arm64_optimizations(self.transport)
+            self.logger.info("🔧 Optimisations ARM64 activées")
         
-        # Vérification des mises à jour au démarrage
-        self.check_for_updates_async()
+        if dry_run:
+            self.enable_dry_run()
+        else:
+            # Vérification des mises à jour au démarrage (cache écrit dans state.directory)
+            self.check_for_updates_async()
         
     def _read_version_file(self):
         """Lit la version depuis le fichier .version"""
@@ -45,62 +152,62 @@ class ArrMonitor:
             pass
         return "1.1.4"  # Fallback
         
-    def setup_arm64_optimizations(self):
+    def setup_arm64_optimizations(self, transport):
         """Optimisations spécifiques pour ARM64"""
         # Timeout plus élevés pour ARM64
-        self.session.timeout = 15
+        if self.config.get('system', {}).get('extended_timeouts', True):
+            transport.extend_timeouts(1.5)
         
         # Headers optimisés pour ARM64
-        self.session.headers.update({
-            'User-Agent': f'Arr-Monitor/{self.version} (ARM64; Linux)'
-        })
-        
-        self.logger.info("🔧 Optimisations ARM64 activées")
+        transport.set_user_agent(f'Arr-Monitor/{self.version} (ARM64; Linux)')
     
-    def check_for_updates_async(self):
-        """Vérifie les mises à jour GitHub en arrière-plan"""
-        try:
-            import subprocess
-            import threading
-            
-            def check_updates():
-                try:
-                    # Utilise le script update_checker en subprocess
-                    result = subprocess.run([
-                        sys.executable, 
-                        os.path.join(os.path.dirname(__file__), 'update_checker.py')
-                    ], capture_output=True, text=True, timeout=10)
-                    
-                    if "Nouvelle version disponible" in result.stdout:
-                        self.logger.info("🆕 Mise à jour disponible ! Lancez le menu pour plus d'infos.")
-                except Exception:
-                    pass  # Ignore les erreurs de vérification silencieusement
-            
-            # Lance la vérification en arrière-plan
-            threading.Thread(target=check_updates, daemon=True).start()
-            
-        except Exception:
-            pass  # Ignore les erreurs d'importation
+    def _build_transport(self):
+        """Transport HTTP construit depuis la configuration courante"""
+        return ArrTransport.from_config(
+            self.config,
+            user_agent=f'Arr-Monitor/{self.version}',
+            hooks=[self._record_http_response]
+        )
     
-    def anonymize_sensitive_data(self, data):
-        """Anonymise les données sensibles dans les logs"""
-        if not self.anonymize_enabled:
-            return data
-            
-        if isinstance(data, str):
-            # Anonymise les adresses IP
-            data = re.sub(r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b', 'xxx.xxx.xxx.xxx', data)
-            
-            # Anonymise les noms d'utilisateur
-            data = re.sub(r'/home/[^/\s]+', '/home/[USER]', data)
-            
-            # Anonymise les hostnames
-            data = re.sub(r'@[a-zA-Z0-9.-]+', '@[HOSTNAME]', data)
-            
-            # Anonymise les API keys partiellement (garde les 4 premiers caractères)
-            data = re.sub(r'([a-zA-Z0-9]{4})[a-zA-Z0-9]{20,}', r'\1***', data)
-            
-        return data
+    def _build_discovery(self):
+        """Détection Docker construite depuis la section discovery"""
+        discovery_config = self.config.get('discovery', {})
+        return DockerDiscovery(
+            socket_path=discovery_config.get('docker_socket', DEFAULT_SOCKET),
+            patterns=discovery_config.get('patterns'),
+            docker_network=discovery_config.get('docker_network', 'traefik_proxy')
+        )
+    
+    def check_for_updates_async(self):
+        """Vérifie les mises à jour GitHub en arrière-plan (updates.check_on_startup)
+        
+        La vérification s'exécute dans un thread du processus ; la réponse GitHub
+        est mise en cache dans state.directory (updates.cache_ttl), de sorte qu'un
+        redémarrage du service ne relance pas d'appel réseau.
+        """
+        updates_config = self.config.get('updates', {})
+        if not updates_config.get('check_on_startup', True):
+            return
+        
+        state_dir = Path(self.config.get('state', {}).get('directory', 'data'))
+        
+        def check_updates():
+            try:
+                # Import différé : hors du chemin de démarrage
+                from update_checker import UpdateChecker
+                
+                checker = UpdateChecker(repo=updates_config.get('github_repo', 'kesurof/Arr-Monitor'),
+                                        current_version=self.version,
+                                        cache_path=state_dir / 'update-check.json',
+                                        cache_ttl=updates_config.get('cache_ttl', 86400))
+                latest_version, _, download_url = checker.check_for_updates()
+                if latest_version:
+                    self.logger.info(f"🆕 Mise à jour disponible : v{latest_version} ({download_url}). "
+                                     f"Lancez le menu pour plus d'infos.")
+            except Exception as e:
+                self.logger.debug(f"Vérification des mises à jour impossible : {e}")
+        
+        threading.Thread(target=check_updates, name="update-check", daemon=True).start()
     
     def load_config(self, config_path):
         """Charge la configuration depuis le fichier YAML"""
@@ -116,160 +223,498 @@ class ArrMonitor:
             sys.exit(1)
     
     def setup_logging(self):
-        """Configure le système de logs"""
+        """Configure le système de logs (file non bloquante, rotation par taille)"""
         log_config = self.config.get('logging', {})
         log_level = getattr(logging, log_config.get('level', 'INFO'))
         log_file = log_config.get('file', 'logs/arr-monitor.log')
         
-        # Créer le répertoire des logs s'il n'existe pas
-        Path(log_file).parent.mkdir(exist_ok=True)
+        # Anonymisation appliquée une seule fois par enregistrement, à l'émission
+        self.anonymizer = LogAnonymizer.from_config(self.config)
+        self.anonymizing_filter = AnonymizingFilter(self.anonymizer)
+        
+        # Écritures disque/console déportées dans un thread dédié
+        self.log_pipeline = QueuedLogging(
+            log_file,
+            max_size_mb=log_config.get('max_size_mb', 10),
+            backup_count=log_config.get('backup_count', 5),
+            json_file=log_config.get('json_file') or None,
+            filters=[self.anonymizing_filter]
+        )
+        self.log_pipeline.start()
         
         # Configuration du logging avec rotation
         logging.basicConfig(
             level=log_level,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler()
-            ]
+            handlers=[self.log_pipeline.queue_handler]
         )
         self.logger = logging.getLogger(__name__)
         
+    def enable_dry_run(self):
+        """Mode simulation : les requêtes mutantes sont interceptées et consignées dans un plan
+        
+        La queue est analysée entièrement (sans cache incrémental) et aucun état
+        persistant n'est modifié : caches, historique et journal des remédiations.
+        """
+        self.dry_run = True
+        self.action_plan = ActionPlan(self._resolve_app)
+        self.transport.interceptor = self.action_plan.intercept
+        self.config.setdefault('state', {})['queue_cache'] = False
+    
+    @property
+    def simulation_prefix(self):
+        """Préfixe des logs d'actions simulées (--dry-run)"""
+        return "[simulation] " if self.action_plan is not None else ""
+    
+    def enable_profiling(self, cprofile_cycles=None):
+        """Active l'instrumentation des cycles (--profile) indépendamment de profiling.enabled"""
+        self.profiler.close()
+        self.profiler = CycleProfiler.from_config(self.config, force=True, cprofile_cycles=cprofile_cycles)
+        self._profiling_forced = True
+        trace_file = self.profiler.trace_file or "désactivée"
+        self.logger.info(f"🧪 Profilage activé : trace {trace_file} ({self.profiler.trace_format}), "
+                         f"cProfile sur {self.profiler.cprofile_cycles} cycle(s)")
+    
+    def start_metrics_server(self):
+        """Démarre l'endpoint /metrics si metrics.enabled"""
+        metrics_config = self.config.get('metrics', {})
+        if not metrics_config.get('enabled', False) or self.metrics_server is not None:
+            return
+        
+        try:
+            server = MetricsServer(self.metrics,
+                                   host=metrics_config.get('host', '0.0.0.0'),
+                                   port=metrics_config.get('port', 9310))
+            server.start()
+            self.metrics_server = server
+        except OSError as e:
+            self.logger.error(f"❌ Impossible de démarrer le serveur de métriques : {e}")
+    
+    def start_webhook_server(self):
+        """Démarre le récepteur de webhooks Sonarr/Radarr si webhook.enabled"""
+        webhook_config = self.config.get('webhook', {})
+        if not webhook_config.get('enabled', False) or self.webhook_server is not None:
+            return
+        
+        try:
+            server = WebhookServer(self.handle_webhook,
+                                   host=webhook_config.get('host', '0.0.0.0'),
+                                   port=webhook_config.get('port', 9311),
+                                   token=webhook_config.get('token'))
+            server.start()
+            self.webhook_server = server
+        except OSError as e:
+            self.logger.error(f"❌ Impossible de démarrer le récepteur de webhooks : {e}")
+    
+    def handle_webhook(self, app_name, payload):
+        """Traite un événement webhook (thread du serveur) ; retourne le code HTTP
+        
+        Les événements retenus (webhook.events) programment une réanalyse immédiate
+        de l'application ; le downloadId signalé force la réévaluation de l'élément
+        même si son empreinte n'a pas changé.
+        """
+        app_config = self.config.get('applications', {}).get(app_name)
+        if not app_config or not app_config.get('enabled', False):
+            return 404
+        
+        event_type = payload.get('eventType', 'unknown')
+        self.metrics.webhook_events.inc(app=app_name, event=event_type)
+        
+        events = self.config.get('webhook', {}).get('events', ['DownloadFailed', 'ManualInteractionRequired'])
+        if event_type not in events:
+            self.logger.debug(f"📬 {app_name} webhook {event_type} ignoré")
+            return 200
+        
+        download_id = str(payload.get('downloadId') or '').lower()
+        with self._webhook_lock:
+            hints = self._webhook_hints.setdefault(app_name, set())
+            if download_id:
+                hints.add(download_id)
+        
+        self.logger.info(f"📬 {app_name} webhook {event_type} : réanalyse programmée")
+        self._wake.set()
+        return 202
+    
+    def _webhook_apps(self):
+        """Applications ayant des événements webhook en attente"""
+        with self._webhook_lock:
+            return list(self._webhook_hints)
+    
+    def _take_webhook_hints(self, app_name):
+        """Retire et retourne les downloadId signalés pour une application"""
+        with self._webhook_lock:
+            return self._webhook_hints.pop(app_name, set())
+    
+    def _register_app_host(self, app_name, url):
+        """Associe l'URL de base d'une application à son nom (métriques HTTP, plan de simulation)"""
+        parts = urlsplit(url)
+        self._app_by_url[f"{parts.netloc}{parts.path.rstrip('/')}".lower()] = app_name
+    
+    def _resolve_app(self, url):
+        """Application dont l'URL de base préfixe l'URL demandée (la plus longue), sinon 'unknown'"""
+        parts = urlsplit(url)
+        target = f"{parts.netloc}{parts.path}".lower()
+        best_prefix, best_app = "", 'unknown'
+        for prefix, app_name in list(self._app_by_url.items()):
+            if len(prefix) > len(best_prefix) and (target == prefix or target.startswith(prefix + "/")):
+                best_prefix, best_app = prefix, app_name
+        return best_app
+    
+    def _record_http_response(self, response, *args, **kwargs):
+        """Hook requests : compte les codes de statut HTTP par application"""
+        app_name = self._resolve_app(response.url)
+        self.metrics.http_responses.inc(app=app_name, code=response.status_code)
+        if self._latency_samples is not None:
+            self._latency_samples.setdefault(app_name, []).append(response.elapsed.total_seconds())
+    
     def test_connection(self, app_name, url, api_key):
         """Test la connexion à l'API d'une application"""
         try:
             headers = {'X-Api-Key': api_key}
-            response = self.session.get(f"{url}/api/v3/system/status", headers=headers, timeout=10)
+            with self.metrics.request_duration.time(app=app_name, phase='test_connection'):
+                response = self.transport.get(f"{url}/api/v3/system/status", headers=headers)
             
             if response.status_code == 200:
                 data = response.json()
                 version = data.get('version', 'Unknown')
                 self.logger.info(f"✅ {app_name} connecté (v{version})")
+                self._connection_health[app_name] = {'version': version, 'checked_at': time.monotonic()}
                 return True
             else:
                 self.logger.error(f"❌ {app_name} erreur HTTP {response.status_code}")
+                self._connection_health.pop(app_name, None)
                 return False
                 
         except requests.exceptions.RequestException as e:
             self.logger.error(f"❌ {app_name} connexion échouée : {e}")
+            self._connection_health.pop(app_name, None)
             return False
     
-    def call_refresh_config(self):
-        """Appelle la fonction refresh_config d'arr-launcher.sh en mode non-interactif"""
-        try:
-            import subprocess
-            script_dir = Path(__file__).parent
-            launcher_script = script_dir / "arr-launcher.sh"
+    def ensure_connection(self, app_name, url, api_key):
+        """Vérifie la connexion en réutilisant le dernier /system/status réussi
+        
+        Le statut complet n'est redemandé qu'après une erreur ou à l'expiration de
+        monitoring.status_ttl ; entre-temps, la récupération de la queue sert de
+        sonde de disponibilité.
+        """
+        health = self._connection_health.get(app_name)
+        status_ttl = self.config.get('monitoring', {}).get('status_ttl', 3600)
+        
+        if health and time.monotonic() - health['checked_at'] < status_ttl:
+            self.logger.debug(f"✅ {app_name} connexion en cache (v{health['version']})")
+            return True
+        
+        return self.test_connection(app_name, url, api_key)
+    
+    def refresh_config(self, force=False):
+        """Réactualise les IPs et clés API puis recharge la configuration si elle a changé
+        
+        La détection des conteneurs n'est relancée que si force est vrai (démarrage,
+        échec de connexion) et que le résultat en cache a expiré ; le simple
+        rechargement repose sur le mtime du fichier de configuration.
+        """
+        with self.profiler.span('refresh_config'):
+            if self.config.get('discovery', {}).get('enabled', True):
+                try:
+                    self.config_refresher.refresh(self.config, force=force)
+                except Exception as e:
+                    self.logger.error(f"❌ Erreur lors du refresh config : {e}")
             
-            if launcher_script.exists():
-                self.logger.info("🔄 Appel de la fonction refresh_config...")
-                
-                # Préparer l'environnement avec mode automatique
-                env = os.environ.copy()
-                env["REFRESH_AUTOMATIC"] = "true"  # MODE NON-INTERACTIF
-                
-                # Appeler la fonction refresh_config du script arr-launcher.sh
-                result = subprocess.run([
-                    "bash", "-c", 
-                    f"source {launcher_script} && refresh_config"
-                ], capture_output=True, text=True, timeout=60, env=env)  # Timeout augmenté à 60s
-                
-                if result.returncode == 0:
-                    self.logger.info("✅ Refresh config terminé avec succès")
-                    # Recharger la configuration mise à jour
-                    self.config = self.load_config(self.config_path)
-                    return True
-                else:
-                    self.logger.warning(f"⚠️ Refresh config a échoué : {result.stderr}")
-                    return False
-            else:
-                self.logger.warning("⚠️ Script arr-launcher.sh non trouvé")
-                return False
-                
-        except subprocess.TimeoutExpired:
-            self.logger.error("❌ Timeout lors du refresh config (>60s)")
+            if self.config_refresher.config_changed():
+                self.logger.info("📝 Configuration modifiée, rechargement")
+                return self.reload_config()
             return False
-        except Exception as e:
-            self.logger.error(f"❌ Erreur lors du refresh config : {e}")
+    
+    def reload_config(self):
+        """Recharge la configuration sans redémarrage (SIGHUP ou fichier modifié)
+        
+        Un fichier illisible ou invalide est signalé et la configuration
+        courante est conservée.
+        """
+        try:
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                config = yaml.safe_load(f)
+        except (OSError, yaml.YAMLError) as e:
+            self.logger.error(f"❌ Rechargement impossible, configuration conservée : {e}")
             return False
+        if not isinstance(config, dict):
+            self.logger.error("❌ Rechargement impossible, configuration conservée : fichier vide ou invalide")
+            return False
+        
+        # Référence mtime à jour : pas de second rechargement par refresh_config
+        self.config_refresher.config_changed()
+        self._apply_config(config)
+        self.logger.info("📝 Configuration rechargée")
+        return True
+    
+    def _apply_config(self, config):
+        """Installe une configuration chargée et reconstruit ce qui en dépend
+        
+        Règles de détection, transport HTTP, anonymisation, niveau de log,
+        détection Docker, profilage et serveurs métriques/webhooks suivent la
+        nouvelle configuration ; les réglages lus une seule fois (fichiers de
+        log, état persistant) sont signalés comme nécessitant un redémarrage.
+        """
+        previous, self.config = self.config, config
+        if self.action_plan is not None:
+            # Le mode simulation ne doit pas être levé par un rechargement
+            self.config.setdefault('state', {})['queue_cache'] = False
+        
+        def changed(section, keys=None):
+            old, new = previous.get(section) or {}, config.get(section) or {}
+            if keys is None:
+                return old != new
+            return any(old.get(key) != new.get(key) for key in keys)
+        
+        self._apply_detection_rules()
+        
+        if changed('monitoring', self.TRANSPORT_SETTINGS) or changed('system'):
+            transport = self._build_transport()
+            if platform.machine() in ['aarch64', 'arm64']:
+                self.setup_arm64_optimizations(transport)
+            transport.interceptor = self.transport.interceptor
+            self.transport, previous_transport = transport, self.transport
+            previous_transport.close()
+            self.logger.info("🔌 Transport HTTP reconstruit (timeouts, retries, connexions)")
+        
+        if changed('privacy'):
+            self.anonymizer = LogAnonymizer.from_config(self.config)
+            self.anonymizing_filter.anonymizer = self.anonymizer
+        
+        if changed('logging', ('level',)):
+            log_level = self.config.get('logging', {}).get('level', 'INFO')
+            if isinstance(getattr(logging, str(log_level).upper(), None), int):
+                logging.getLogger().setLevel(getattr(logging, str(log_level).upper()))
+                self.logger.info(f"📝 Niveau de log : {log_level}")
+            else:
+                self.logger.error(f"❌ Niveau de log inconnu, niveau précédent conservé : {log_level}")
+        
+        if changed('discovery'):
+            discovery_config = self.config.get('discovery', {})
+            self.config_refresher.set_discovery(self._build_discovery(),
+                                                cache_ttl=discovery_config.get('cache_ttl', 300),
+                                                backup_count=discovery_config.get('backup_count', 5))
+        
+        if changed('profiling') and not self._profiling_forced:
+            self.profiler.close()
+            self.profiler = CycleProfiler.from_config(self.config)
+        
+        if changed('metrics'):
+            if self.metrics_server is not None:
+                self.metrics_server.stop()
+                self.metrics_server = None
+            self.start_metrics_server()
+        
+        if changed('webhook', self.WEBHOOK_SERVER_SETTINGS):
+            if self.webhook_server is not None:
+                self.webhook_server.stop()
+                self.webhook_server = None
+            self.start_webhook_server()
+        
+        restart_settings = [f"{section}.{key}" for section, keys in self.RESTART_SETTINGS.items()
+                            for key in keys if changed(section, (key,))]
+        if restart_settings:
+            self.logger.warning(f"⚠️ Redémarrage nécessaire pour appliquer : {', '.join(restart_settings)}")
+    
+    def _apply_detection_rules(self):
+        """Recompile les règles de détection ; réinitialise les caches de queue si elles changent"""
+        try:
+            classifier = FailureClassifier.from_config(self.config)
+        except ValueError as e:
+            self.logger.error(f"❌ Règles de détection invalides, règles précédentes conservées : {e}")
+        else:
+            if classifier.digest != self.classifier.digest:
+                # Les éléments jugés sains avec les anciennes règles doivent être réévalués
+                self.logger.info("🧹 Règles de détection modifiées, caches de queue réinitialisés")
+                for queue_cache in self._queue_caches.values():
+                    queue_cache.clear()
+                self._queue_caches.clear()
+            self.classifier = classifier
 
+    def _queue_parser(self):
+        """Mode de parsing de la queue (monitoring.queue_parser), stream -> lean sans ijson"""
+        queue_parser = self.config.get('monitoring', {}).get('queue_parser', PARSER_LEAN)
+        if queue_parser == PARSER_STREAM and not STREAMING_AVAILABLE:
+            return PARSER_LEAN
+        return queue_parser
+    
+    def _fetch_queue_page(self, app_name, url, headers, page, page_size):
+        """Récupère une page de la queue (None en cas d'erreur HTTP)"""
+        params = {
+            'page': page, 
+            'pageSize': page_size,
+            'sortKey': 'timeleft',
+            'sortDirection': 'ascending'
+        }
+        
+        queue_parser = self._queue_parser()
+        with self.metrics.request_duration.time(app=app_name, phase='get_queue_page'):
+            with self.profiler.span('queue_page_request', app=app_name, page=page):
+                response = self.transport.get(f"{url}/api/v3/queue", 
+                                              headers=headers, 
+                                              params=params,
+                                              stream=queue_parser == PARSER_STREAM)
+            
+            if response.status_code == 200 and queue_parser == PARSER_STREAM:
+                # Parsing en flux : seuls les champs utiles sont matérialisés
+                response.raw.decode_content = True
+                try:
+                    with self.profiler.span('queue_page_stream', app=app_name, page=page):
+                        return stream_page(response.raw)
+                except QueueParseError as e:
+                    self.logger.error(f"❌ {app_name} erreur lecture queue page {page} : {e}")
+                    return None
+                finally:
+                    response.close()
+        
+        if response.status_code == 200:
+            with self.profiler.span('queue_page_decode', app=app_name, page=page):
+                data = response.json()
+                return data if queue_parser == PARSER_FULL else project_page(data)
+        
+        response.close()
+        self.logger.error(f"❌ {app_name} erreur récupération queue page {page} : {response.status_code}")
+        return None
+    
     def get_queue(self, app_name, url, api_key):
-        """Récupère la queue des téléchargements avec pagination complète"""
+        """Récupère la queue des téléchargements avec pagination complète (None en cas d'échec)
+        
+        La première page fournit totalRecords ; les pages suivantes sont ensuite
+        récupérées en parallèle (monitoring.queue_page_workers) et réassemblées
+        dans l'ordre. Une queue partielle n'est jamais retournée : le cache
+        incrémental et le suivi de progression la prendraient pour complète.
+        """
         try:
             headers = {'X-Api-Key': api_key, 'Content-Type': 'application/json'}
-            all_items = []
-            page = 1
-            page_size = 50
-            
-            while True:
-                # Utiliser la pagination pour récupérer tous les éléments
-                params = {
-                    'page': page, 
-                    'pageSize': page_size,
-                    'sortKey': 'timeleft',
-                    'sortDirection': 'ascending'
-                }
-                
-                response = self.session.get(f"{url}/api/v3/queue", 
-                                          headers=headers, 
-                                          params=params, 
-                                          timeout=15)
+            monitoring_config = self.config.get('monitoring', {})
+            page_size = min(max(int(monitoring_config.get('queue_page_size', 50)), 1), self.MAX_QUEUE_PAGE_SIZE)
+            page_workers = max(1, int(monitoring_config.get('queue_page_workers', 4)))
+            if self.profiler.profiling:
+                # cProfile n'observe que le thread courant
+                page_workers = 1
+            
+            data = self._fetch_queue_page(app_name, url, headers, 1, page_size)
+            if data is None:
+                self._connection_health.pop(app_name, None)
+                return None
+            
+            if not isinstance(data, dict):
+                # Format liste directe (fallback)
+                return data
+            
+            all_items = list(data.get('records', []))
+            total_records = data.get('totalRecords', 0)
+            self.logger.debug(f"📄 {app_name} Page 1: {len(all_items)} éléments (Total: {len(all_items)}/{total_records})")
+            
+            if all_items and len(all_items) < total_records:
+                total_pages = -(-total_records // page_size)
+                remaining_pages = range(2, total_pages + 1)
+                fetch_page = lambda page: self._fetch_queue_page(app_name, url, headers, page, page_size)
                 
-                if response.status_code == 200:
-                    data = response.json()
+                executor = None
+                if page_workers > 1:
+                    executor = ThreadPoolExecutor(max_workers=min(page_workers, len(remaining_pages)),
+                                                  thread_name_prefix=f"{app_name}-queue")
+                try:
+                    pages = executor.map(fetch_page, remaining_pages) if executor else map(fetch_page, remaining_pages)
                     
-                    if isinstance(data, dict):
-                        records = data.get('records', [])
-                        total_records = data.get('totalRecords', 0)
-                        
+                    # Réassemblage dans l'ordre des pages ; une page en échec ou vide avant
+                    # totalRecords rend la queue incomplète : le cycle est traité comme une erreur
+                    for page, page_data in zip(remaining_pages, pages):
+                        records = page_data.get('records', []) if isinstance(page_data, dict) else []
                         if not records:
-                            break
-                            
+                            self.logger.error(f"❌ {app_name} queue incomplète : page {page} "
+                                              f"{'en échec' if page_data is None else 'vide'} "
+                                              f"({len(all_items)}/{total_records} éléments)")
+                            self._connection_health.pop(app_name, None)
+                            return None
+                        
                         all_items.extend(records)
                         self.logger.debug(f"📄 {app_name} Page {page}: {len(records)} éléments (Total: {len(all_items)}/{total_records})")
-                        
-                        # Si on a récupéré tous les éléments
-                        if len(all_items) >= total_records:
-                            break
-                            
-                        page += 1
-                    else:
-                        # Format liste directe (fallback)
-                        all_items = data
-                        break
-                else:
-                    self.logger.error(f"❌ {app_name} erreur récupération queue page {page} : {response.status_code}")
-                    break
+                finally:
+                    if executor is not None:
+                        executor.shutdown()
                     
             self.logger.debug(f"📊 {app_name} Total récupéré: {len(all_items)} éléments")
             return all_items
             
         except requests.exceptions.RequestException as e:
             self.logger.error(f"❌ {app_name} erreur queue : {e}")
-            return []
+            self._connection_health.pop(app_name, None)
+            return None
     
-    def get_history(self, app_name, url, api_key, since_hours=24):
-        """Récupère l'historique des téléchargements"""
-        try:
-            headers = {'X-Api-Key': api_key}
-            since_date = datetime.now() - timedelta(hours=since_hours)
+    def get_history(self, app_name, url, api_key, since_id=None, since_hours=24, page_size=250):
+        """Parcourt l'historique des téléchargements, du plus récent au plus ancien
+        
+        Générateur paginé : la lecture s'arrête au premier enregistrement déjà
+        traité (id <= since_id) ou antérieur à since_hours, de sorte qu'un cycle
+        sans nouvel événement ne coûte qu'une page. Les erreurs HTTP sont levées
+        (requests.exceptions.RequestException) pour que l'appelant ne valide pas
+        une lecture incomplète.
+        """
+        headers = {'X-Api-Key': api_key}
+        cutoff = time.time() - since_hours * 3600
+        page = 1
+        
+        while True:
             params = {
-                'since': since_date.isoformat(),
-                'pageSize': 100
+                'page': page,
+                'pageSize': page_size,
+                'sortKey': 'date',
+                'sortDirection': 'descending'
             }
-            response = self.session.get(f"{url}/api/v3/history", headers=headers, params=params, timeout=10)
+            with self.metrics.request_duration.time(app=app_name, phase='get_history'):
+                response = self.transport.get(f"{url}/api/v3/history", headers=headers, params=params)
             
-            if response.status_code == 200:
-                return response.json().get('records', [])
-            else:
-                self.logger.error(f"❌ {app_name} erreur récupération historique : {response.status_code}")
-                return []
-                
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"❌ {app_name} erreur historique : {e}")
-            return []
+            if response.status_code != 200:
+                raise requests.exceptions.HTTPError(f"page {page} : HTTP {response.status_code}", response=response)
+            
+            data = response.json()
+            records = data.get('records', [])
+            for record in records:
+                if since_id is not None and record.get('id', 0) <= since_id:
+                    return
+                timestamp = parse_date(record.get('date'))
+                if timestamp is not None and timestamp < cutoff:
+                    return
+                yield record
+            
+            if not records or page * page_size >= data.get('totalRecords', 0):
+                return
+            page += 1
     
-    def blocklist_and_search(self, app_name, url, api_key, download_id):
+    def update_failure_history(self, app_name, url, api_key):
+        """Lit les nouveaux événements d'historique et met à jour le comptage des échecs
+        
+        Retourne le FailureHistory de l'application (None si detection.history désactivé).
+        """
+        failure_history = self.get_failure_history(app_name)
+        if failure_history is None:
+            return None
+        
+        history_config = self.config.get('detection', {}).get('history', {})
+        page_size = min(max(int(history_config.get('page_size', 250)), 1), self.MAX_QUEUE_PAGE_SIZE)
+        since_hours = failure_history.window / 3600
+        
+        last_id = None
+        new_events = failed_events = 0
+        try:
+            for record in self.get_history(app_name, url, api_key, since_id=failure_history.last_id,
+                                           since_hours=since_hours, page_size=page_size):
+                if last_id is None:
+                    last_id = record.get('id')
+                new_events += 1
+                failed_events += failure_history.record(record)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # Marque haute inchangée : la lecture reprendra depuis le même point
+            self.logger.warning(f"⚠️ {app_name} lecture de l'historique incomplète : {e}")
+            return failure_history
+        
+        failure_history.commit(last_id)
+        if new_events:
+            self.logger.debug(f"📜 {app_name} Historique: {new_events} nouvel(s) événement(s), {failed_events} échec(s)")
+        return failure_history
+    
+    def blocklist_and_search(self, app_name, url, api_key, download_id, search=True):
         """Bloque la release défaillante et lance une nouvelle recherche"""
         try:
             headers = {'X-Api-Key': api_key, 'Content-Type': 'application/json'}
@@ -280,16 +725,17 @@ class ArrMonitor:
                 'blocklist': 'true'
             }
             
-            response = self.session.delete(f"{url}/api/v3/queue/{download_id}", 
-                                         headers=headers, 
-                                         params=params, 
-                                         timeout=15)
+            with self.metrics.request_duration.time(app=app_name, phase='blocklist_and_search'):
+                response = self.transport.delete(f"{url}/api/v3/queue/{download_id}", 
+                                                 headers=headers, 
+                                                 params=params)
             
             if response.status_code in [200, 204]:
-                self.logger.info(f"🚫 {app_name} release {download_id} bloquée et supprimée")
+                self.logger.info(f"🚫 {self.simulation_prefix}{app_name} release {download_id} bloquée et supprimée")
                 
                 # Étape 2: Lancer une recherche de nouveaux téléchargements
-                self.trigger_missing_search(app_name, url, api_key)
+                if search:
+                    self.trigger_missing_search(app_name, url, api_key)
                 
                 return True
             else:
@@ -300,43 +746,162 @@ class ArrMonitor:
             self.logger.error(f"❌ {app_name} erreur blocklist {download_id} : {e}")
             return False
     
+    def blocklist_bulk(self, app_name, url, api_key, download_ids, blocklist=True):
+        """Bloque et supprime plusieurs releases via DELETE /api/v3/queue/bulk
+        
+        Les ids sont envoyés par lots (actions.bulk_chunk_size). Si le serveur
+        refuse l'appel groupé, les ids restants passent par blocklist_and_search
+        (ou remove_download sans blocklist) élément par élément. Retourne la liste
+        des ids effectivement supprimés.
+        """
+        chunk_size = max(1, int(self.config.get('actions', {}).get('bulk_chunk_size', 100)))
+        headers = {'X-Api-Key': api_key, 'Content-Type': 'application/json'}
+        params = {
+            'removeFromClient': 'true',
+            'blocklist': 'true' if blocklist else 'false'
+        }
+        removed_ids = []
+        
+        for start in range(0, len(download_ids), chunk_size):
+            chunk = download_ids[start:start + chunk_size]
+            
+            if url in self._bulk_unsupported:
+                remaining = download_ids[start:]
+                return removed_ids + self._blocklist_one_by_one(app_name, url, api_key, remaining, blocklist)
+            
+            try:
+                with self.metrics.request_duration.time(app=app_name, phase='blocklist_bulk'):
+                    response = self.transport.delete(f"{url}/api/v3/queue/bulk",
+                                                     headers=headers,
+                                                     params=params,
+                                                     json={'ids': chunk})
+            except requests.exceptions.RequestException as e:
+                self.logger.error(f"❌ {app_name} erreur blocklist groupé ({len(chunk)} éléments) : {e}")
+                continue
+            
+            if response.status_code in [200, 204]:
+                removed_ids.extend(chunk)
+                if blocklist:
+                    self.logger.info(f"🚫 {self.simulation_prefix}{app_name} {len(chunk)} releases bloquées et supprimées")
+                else:
+                    self.logger.info(f"🗑️  {self.simulation_prefix}{app_name} {len(chunk)} téléchargements supprimés")
+            elif response.status_code in [400, 404, 405]:
+                # Endpoint groupé non supporté par cette version : repli élément par élément
+                self.logger.warning(f"⚠️ {app_name} suppression groupée refusée ({response.status_code}), repli élément par élément")
+                self._bulk_unsupported.add(url)
+                return removed_ids + self._blocklist_one_by_one(app_name, url, api_key, download_ids[start:], blocklist)
+            else:
+                self.logger.error(f"❌ {app_name} erreur blocklist groupé ({len(chunk)} éléments) : {response.status_code}")
+        
+        return removed_ids
+    
+    def _blocklist_one_by_one(self, app_name, url, api_key, download_ids, blocklist=True):
+        """Repli : bloque les releases une par une, sans recherche intermédiaire"""
+        removed_ids = []
+        for download_id in download_ids:
+            if blocklist:
+                removed = self.blocklist_and_search(app_name, url, api_key, download_id, search=False)
+            else:
+                removed = self.remove_download(app_name, url, api_key, download_id)
+            if removed:
+                removed_ids.append(download_id)
+                # Délai plus long pour éviter la surcharge de l'API
+                time.sleep(2)
+        return removed_ids
+    
+    def _post_command(self, app_name, url, api_key, command, phase):
+        """Envoie une commande à l'API /api/v3/command"""
+        headers = {'X-Api-Key': api_key, 'Content-Type': 'application/json'}
+        with self.metrics.request_duration.time(app=app_name, phase=phase):
+            response = self.transport.post(f"{url}/api/v3/command", 
+                                           headers=headers, 
+                                           json=command)
+        return response.status_code == 201, response.status_code
+    
+    def get_app_type(self, app_name):
+        """Type d'application (sonarr/radarr) : clé type du bloc, sinon déduit du nom
+        
+        Les instances multiples détectées sont nommées d'après leur conteneur
+        (radarr-4k, films, ...) : seule la clé type écrite par la détection
+        permet alors de choisir les commandes adaptées.
+        """
+        app_config = self.config.get('applications', {}).get(app_name) or {}
+        app_type = str(app_config.get('type') or '').lower()
+        if app_type in ('sonarr', 'radarr'):
+            return app_type
+        return 'radarr' if 'radarr' in app_name.lower() else 'sonarr'
+    
     def trigger_missing_search(self, app_name, url, api_key):
         """Lance une recherche pour les éléments manqués"""
         try:
-            headers = {'X-Api-Key': api_key, 'Content-Type': 'application/json'}
-            
-            # Commande différente selon l'application
-            if app_name.lower() == 'radarr':
+            # Commande différente selon le type d'application
+            if self.get_app_type(app_name) == 'radarr':
                 search_command = {'name': 'MissingMoviesSearch'}
-            elif app_name.lower() == 'sonarr':
-                search_command = {'name': 'MissingEpisodeSearch'}
             else:
-                search_command = {'name': 'MissingEpisodeSearch'}  # Fallback
+                search_command = {'name': 'MissingEpisodeSearch'}
             
-            response = self.session.post(f"{url}/api/v3/command", 
-                                       headers=headers, 
-                                       json=search_command, 
-                                       timeout=30)
+            success, status_code = self._post_command(app_name, url, api_key, search_command,
+                                                      'trigger_missing_search')
             
-            if response.status_code == 201:
-                self.logger.info(f"🔍 {app_name} recherche de nouveaux téléchargements lancée")
+            if success:
+                self.logger.info(f"🔍 {self.simulation_prefix}{app_name} recherche de nouveaux téléchargements lancée")
                 return True
             else:
-                self.logger.warning(f"⚠️ {app_name} impossible de lancer la recherche automatique : {response.status_code}")
+                self.logger.warning(f"⚠️ {app_name} impossible de lancer la recherche automatique : {status_code}")
                 return False
                 
         except requests.exceptions.RequestException as e:
             self.logger.warning(f"⚠️ {app_name} erreur lors du lancement de recherche : {e}")
             return False
     
+    def trigger_targeted_search(self, app_name, url, api_key, items):
+        """Lance une recherche ciblée (EpisodeSearch/MoviesSearch) sur les éléments traités
+        
+        Les episodeId/movieId des enregistrements de queue sont dédupliqués puis
+        envoyés en une commande par type (découpée par actions.bulk_chunk_size).
+        Sans identifiant exploitable, repli sur la recherche globale.
+        """
+        episode_ids = sorted({item.get('episodeId') for item in items if item.get('episodeId')})
+        movie_ids = sorted({item.get('movieId') for item in items if item.get('movieId')})
+        
+        if not episode_ids and not movie_ids:
+            return self.trigger_missing_search(app_name, url, api_key)
+        
+        chunk_size = max(1, int(self.config.get('actions', {}).get('bulk_chunk_size', 100)))
+        commands = []
+        for start in range(0, len(episode_ids), chunk_size):
+            commands.append({'name': 'EpisodeSearch', 'episodeIds': episode_ids[start:start + chunk_size]})
+        for start in range(0, len(movie_ids), chunk_size):
+            commands.append({'name': 'MoviesSearch', 'movieIds': movie_ids[start:start + chunk_size]})
+        
+        all_sent = True
+        for command in commands:
+            ids_key = 'episodeIds' if command['name'] == 'EpisodeSearch' else 'movieIds'
+            try:
+                success, status_code = self._post_command(app_name, url, api_key, command,
+                                                          'trigger_targeted_search')
+            except requests.exceptions.RequestException as e:
+                self.logger.warning(f"⚠️ {app_name} erreur lors du lancement de {command['name']} : {e}")
+                all_sent = False
+                continue
+            
+            if success:
+                self.logger.info(f"🔍 {self.simulation_prefix}{app_name} {command['name']} lancée ({len(command[ids_key])} élément(s))")
+            else:
+                self.logger.warning(f"⚠️ {app_name} impossible de lancer {command['name']} : {status_code}")
+                all_sent = False
+        
+        return all_sent
+    
     def remove_download(self, app_name, url, api_key, download_id):
         """Supprime un téléchargement de la queue"""
         try:
             headers = {'X-Api-Key': api_key}
-            response = self.session.delete(f"{url}/api/v3/queue/{download_id}", headers=headers, timeout=10)
+            with self.metrics.request_duration.time(app=app_name, phase='remove_download'):
+                response = self.transport.delete(f"{url}/api/v3/queue/{download_id}", headers=headers)
             
             if response.status_code in [200, 204]:
-                self.logger.info(f"🗑️  {app_name} téléchargement {download_id} supprimé")
+                self.logger.info(f"🗑️  {self.simulation_prefix}{app_name} téléchargement {download_id} supprimé")
                 return True
             else:
                 self.logger.error(f"❌ {app_name} erreur suppression {download_id} : {response.status_code}")
@@ -346,23 +911,120 @@ class ArrMonitor:
             self.logger.error(f"❌ {app_name} erreur suppression {download_id} : {e}")
             return False
     
+    def classify_item(self, item):
+        """Retourne la règle de détection correspondant à l'élément (None si aucune)"""
+        rule = self.classifier.classify(item)
+        if rule is not None:
+            # Log pour confirmer la détection
+            self.logger.debug(f"🎯 Règle '{rule.name}' ({rule.action}) - Error: {item.get('errorMessage', '')}")
+        return rule
+    
     def is_download_failed(self, item):
-        """Vérifie si un téléchargement a l'erreur qBittorrent spécifique UNIQUEMENT"""
-        error_message = item.get('errorMessage', '')
+        """Vérifie si un téléchargement correspond à une règle de détection à traiter"""
+        rule = self.classify_item(item)
+        return rule is not None and rule.action != ACTION_IGNORE
+    
+    def get_failure_history(self, app_name):
+        """Retourne le comptage des échecs issu de l'historique (None si désactivé)"""
+        history_config = self.config.get('detection', {}).get('history', {})
+        if not history_config.get('enabled', True):
+            return None
         
-        # DÉTECTION STRICTE : Seulement l'erreur qBittorrent spécifique
-        is_qbittorrent_error = (
-            error_message and "qBittorrent is reporting an error" in error_message
-        )
+        if app_name not in self._failure_histories:
+            state_dir = Path(self.config.get('state', {}).get('directory', 'data'))
+            path = state_dir / f"history-{app_name}.json" if self.action_plan is None else None
+            self._failure_histories[app_name] = FailureHistory(path)
+        failure_history = self._failure_histories[app_name]
+        failure_history.window = history_config.get('window', 86400)
+        return failure_history
+    
+    def apply_retry_policy(self, app_name, failed_items, queue_diff=None):
+        """Filtre les éléments à remédier selon le journal des tentatives
         
-        if is_qbittorrent_error:
-            # Log pour confirmer la détection
-            self.logger.debug(f"🎯 Erreur qBittorrent détectée - Error: {error_message}")
+        Un élément ayant atteint actions.max_retries est abandonné ; un élément
+        dont la dernière tentative date de moins de actions.retry_delay secondes
+        est reporté au cycle suivant. Retourne (éléments autorisés, éléments abandonnés).
+        """
+        actions_config = self.config.get('actions', {})
+        max_retries = int(actions_config.get('max_retries', 3))
+        retry_delay = actions_config.get('retry_delay', 60)
+        notify_failures = actions_config.get('notify_failures', True)
+        
+        stats = self.state_store.attempt_stats(app_name, [item_key(item) for item, _ in failed_items])
+        now = time.time()
+        allowed = []
+        abandoned = []
         
-        return is_qbittorrent_error
+        for item, rule in failed_items:
+            title = item.get('title', item.get('movieTitle', 'Unknown'))
+            attempts, last_attempt = stats.get(item_key(item), (0, 0))
+            
+            if attempts >= max_retries:
+                log = self.logger.error if notify_failures else self.logger.warning
+                log(f"🛑 {app_name} échec persistant ({attempts} tentative(s)), abandon : {title}")
+                abandoned.append((item, rule))
+                continue
+            
+            if now - last_attempt < retry_delay:
+                self.logger.info(f"⏳ {app_name} nouvelle tentative dans {retry_delay - (now - last_attempt):.0f}s : {title}")
+                # Réévaluer cet élément au prochain cycle
+                if queue_diff is not None:
+                    queue_diff.forget(item.get('id'))
+                continue
+            
+            allowed.append((item, rule))
+        
+        return allowed, abandoned
+    
+    def get_queue_cache(self, app_name):
+        """Retourne le cache d'état de queue d'une application (None si désactivé)"""
+        state_config = self.config.get('state', {})
+        if not state_config.get('queue_cache', True):
+            return None
+        
+        if app_name not in self._queue_caches:
+            state_dir = Path(state_config.get('directory', 'data'))
+            self._queue_caches[app_name] = QueueStateCache(state_dir / f"queue-state-{app_name}.json",
+                                                           rules_digest=self.classifier.digest)
+        return self._queue_caches[app_name]
+    
+    def get_progress_tracker(self, app_name):
+        """Retourne le suivi de progression d'une application (None si detection.stall désactivé)"""
+        if self.classifier.stall_rule is None:
+            return None
+        
+        stall_config = self.config.get('detection', {}).get('stall', {})
+        if app_name not in self._progress_trackers:
+            self._progress_trackers[app_name] = ProgressTracker(
+                samples=stall_config.get('samples', 12)
+            )
+        tracker = self._progress_trackers[app_name]
+        tracker.window = stall_config.get('window', 7200)
+        return tracker
+    
+    def detect_stalled(self, app_name, queue):
+        """Échantillonne la progression de la queue et retourne les éléments bloqués"""
+        tracker = self.get_progress_tracker(app_name)
+        if tracker is None:
+            return []
+        
+        statuses = self.classifier.stall_rule.statuses
+        tracked = [item for item in queue if str(item.get('status') or '').lower() in statuses]
+        stalled = tracker.observe(tracked)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"📈 {app_name} Progression: {len(tracker)} suivis, {len(stalled)} bloqués, "
+                              f"débit {format_size(tracker.total_throughput())}/s")
+        return stalled
     
     def process_application(self, app_name, app_config):
-        """Traite une application (Sonarr ou Radarr)"""
+        """Traite une application (Sonarr ou Radarr)
+        
+        Retourne le résultat de l'analyse (OUTCOME_*) utilisé par le scheduler
+        adaptatif, ou None si l'application n'est pas analysée.
+        """
+        # downloadId signalés par webhook (consommés même si l'analyse s'interrompt)
+        webhook_download_ids = self._take_webhook_hints(app_name)
+        
         if not app_config.get('enabled', False):
             self.logger.debug(f"⏭️  {app_name} désactivé")
             return
@@ -375,16 +1037,33 @@ class ArrMonitor:
             return
         
         self.logger.info(f"🔍 Analyse de {app_name}...")
+        self._register_app_host(app_name, url)
         
-        # Test de connexion
-        if not self.test_connection(app_name, url, api_key):
-            return
+        # Test de connexion (statut en cache tant qu'il est valide)
+        with self.profiler.span('ensure_connection', app=app_name):
+            connected = self.ensure_connection(app_name, url, api_key)
+        if not connected:
+            return OUTCOME_ERROR
+        
+        # Récupération de la queue (sert aussi de sonde de disponibilité)
+        with self.profiler.span('get_queue', app=app_name):
+            queue = self.get_queue(app_name, url, api_key)
+        if queue is None:
+            return OUTCOME_ERROR
+        
+        # Nouveaux événements d'historique (lecture incrémentale depuis la marque haute)
+        with self.profiler.span('failure_history', app=app_name):
+            failure_history = self.update_failure_history(app_name, url, api_key)
+        
+        queue_cache = self.get_queue_cache(app_name)
         
-        # Récupération de la queue
-        queue = self.get_queue(app_name, url, api_key)
         if not queue:
             self.logger.info(f"📭 {app_name} queue vide")
-            return
+            self.metrics.set_queue_status(app_name, {})
+            if queue_cache is not None:
+                queue_cache.commit(queue_cache.diff([]))
+            self.detect_stalled(app_name, [])
+            return OUTCOME_IDLE
         
         self.logger.info(f"📋 {app_name} {len(queue)} éléments en queue")
         
@@ -395,74 +1074,389 @@ class ArrMonitor:
             status_count[status] = status_count.get(status, 0) + 1
         
         self.logger.debug(f"📊 {app_name} Statuts: {dict(sorted(status_count.items()))}")
+        self.metrics.set_queue_status(app_name, status_count)
+        
+        # Analyse incrémentale : seuls les éléments nouveaux ou modifiés sont réévalués
+        if queue_cache is not None:
+            with self.profiler.span('queue_diff', app=app_name):
+                queue_diff = queue_cache.diff(queue)
+            candidates = queue_diff.delta
+            self.logger.debug(f"🧮 {app_name} Delta: {queue_diff.summary()}")
+        else:
+            queue_diff = None
+            candidates = queue
+        
+        # Éléments signalés par webhook : réévalués même sans changement d'empreinte
+        if webhook_download_ids and queue_diff is not None:
+            candidates = candidates + [item for item in queue_diff.unchanged
+                                       if str(item.get('downloadId') or '').lower() in webhook_download_ids]
         
         actions_config = self.config.get('actions', {})
-        processed_items = 0
+        failed_items = []
         
-        for item in queue:
-            item_id = item.get('id')
-            title = item.get('title', item.get('movieTitle', 'Unknown'))
-            status = item.get('status', 'unknown')
-            error_message = item.get('errorMessage', '')
-            
-            # Vérification des erreurs avec détection élargie
-            if self.is_download_failed(item):
+        with self.profiler.span('classify', app=app_name, items=len(candidates)):
+            for item in candidates:
+                # Classification par les règles de détection (detection.rules)
+                rule = self.classify_item(item)
+                if rule is None or rule.action == ACTION_IGNORE:
+                    continue
+                
+                title = item.get('title', item.get('movieTitle', 'Unknown'))
+                status = item.get('status', 'unknown')
+                error_message = item.get('errorMessage', '')
+                
                 self.logger.warning(f"❌ {app_name} erreur détectée : {title}")
-                self.logger.warning(f"   📊 Status: {status}")
+                self.logger.warning(f"   📊 Status: {status} | Règle: {rule.name} ({rule.action})")
                 if error_message:
-                    # Anonymiser le message d'erreur s'il contient des infos sensibles
-                    safe_error = self.anonymize_sensitive_data(error_message)
-                    self.logger.warning(f"   🚨 Erreur: {safe_error}")
+                    self.logger.warning(f"   🚨 Erreur: {error_message}")
+                failed_items.append((item, rule))
+        
+        # Téléchargements sans progression sur la fenêtre detection.stall.window
+        stall_rule = self.classifier.stall_rule
+        if stall_rule is not None and stall_rule.action != ACTION_IGNORE:
+            failed_ids = {item.get('id') for item, _ in failed_items}
+            with self.profiler.span('detect_stalled', app=app_name):
+                stalled_items = self.detect_stalled(app_name, queue)
+            tracker = self._progress_trackers[app_name]
+            for item in stalled_items:
+                if item.get('id') in failed_ids:
+                    continue
                 
-                if actions_config.get('auto_retry', True):
-                    self.logger.info(f"🔄 {app_name} traitement de l'erreur pour: {title}")
-                    if self.blocklist_and_search(app_name, url, api_key, item_id):
-                        processed_items += 1
-                        # Délai plus long pour éviter la surcharge de l'API
-                        time.sleep(2)
+                title = item.get('title', item.get('movieTitle', 'Unknown'))
+                series = tracker.get(item.get('id'))
+                sizeleft, observed_at = series.newest()
+                stalled_minutes = int((observed_at - series.last_progress_at) // 60)
+                rate = series.throughput()
+                eta = series.eta()
+                trend = (f"{format_size(rate or 0)}/s sur {int(series.span() // 60)} min, "
+                         f"fin estimée {f'dans {int(eta // 60)} min' if eta else 'inconnue'}")
+                self.logger.warning(f"⏳ {app_name} téléchargement bloqué : {title}")
+                self.logger.warning(f"   📊 Aucune progression depuis {stalled_minutes} min | Restant: {format_size(sizeleft)} "
+                                    f"| Débit: {trend} | Règle: {stall_rule.name} ({stall_rule.action})")
+                failed_items.append((item, stall_rule))
+        
+        processed_items = 0
+        if failed_items:
+            self.metrics.failed_items.inc(len(failed_items), app=app_name)
+        
+        # Politique de nouvelles tentatives (actions.max_retries / actions.retry_delay)
+        remediable = failed_items
+        abandoned = []
+        if failed_items and actions_config.get('auto_retry', True) and self.state_store is not None:
+            with self.profiler.span('retry_policy', app=app_name):
+                remediable, abandoned = self.apply_retry_policy(app_name, failed_items, queue_diff)
+        
+        # Blocages reportés (retry_delay) : signalés de nouveau tant qu'ils persistent.
+        # Abandonnés ou sans remédiation automatique : signalés une seule fois.
+        tracker = self._progress_trackers.get(app_name)
+        if tracker is not None and actions_config.get('auto_retry', True):
+            settled_ids = {item.get('id') for item, _ in remediable + abandoned}
+            for item, rule in failed_items:
+                if rule is stall_rule and item.get('id') not in settled_ids:
+                    tracker.release(item.get('id'))
+        
+        if remediable and actions_config.get('auto_retry', True):
+            # Remédiation groupée par action : suppressions bulk puis une seule recherche par application
+            self.logger.info(f"🔄 {app_name} traitement de {len(remediable)} erreur(s)")
+            if self.action_plan is not None:
+                self.action_plan.add_items(app_name, remediable)
+            removed_ids = set()
+            with self.profiler.span('remediation', app=app_name, items=len(remediable)):
+                for action, blocklist in ((ACTION_BLOCKLIST_SEARCH, True), (ACTION_REMOVE, False)):
+                    action_ids = [item.get('id') for item, rule in remediable if rule.action == action]
+                    if action_ids:
+                        removed_ids.update(self.blocklist_bulk(app_name, url, api_key, action_ids, blocklist=blocklist))
+            
+            processed_items = len(removed_ids)
+            self.metrics.remediations.inc(processed_items, app=app_name, result='success')
+            self.metrics.remediations.inc(len(remediable) - processed_items, app=app_name, result='failure')
+            
+            for item, rule in remediable:
+                title = item.get('title', item.get('movieTitle', 'Unknown'))
+                succeeded = item.get('id') in removed_ids
+                if self.state_store is not None:
+                    self.state_store.record(app_name, item_key(item), rule.action,
+                                            RESULT_SUCCESS if succeeded else RESULT_FAILURE,
+                                            rule=rule.name, title=title)
+                if not succeeded:
+                    self.logger.error(f"❌ {app_name} échec du traitement pour: {title}")
+                    # Réévaluer cet élément au prochain cycle
+                    if queue_diff is not None:
+                        queue_diff.forget(item.get('id'))
+                    if tracker is not None and rule is stall_rule:
+                        tracker.release(item.get('id'))
+            
+            # Nouvelle recherche uniquement pour les releases bloquées
+            searched_items = [item for item, rule in remediable
+                              if rule.action == ACTION_BLOCKLIST_SEARCH and item.get('id') in removed_ids]
+            if failure_history is not None and searched_items:
+                # Releases successives en échec pour le même épisode/film : release bloquée mais pas de nouvelle recherche
+                max_failures = self.config.get('detection', {}).get('history', {}).get('max_failures', 3)
+                repeated = [item for item in searched_items
+                            if failure_history.count(media_key(item)) >= max_failures]
+                for item in repeated:
+                    title = item.get('title', item.get('movieTitle', 'Unknown'))
+                    self.logger.warning(f"🔁 {app_name} échecs répétés ({failure_history.count(media_key(item))}), "
+                                        f"recherche suspendue : {title}")
+                repeated_ids = {item.get('id') for item in repeated}
+                searched_items = [item for item in searched_items if item.get('id') not in repeated_ids]
+            if searched_items:
+                with self.profiler.span('search', app=app_name, items=len(searched_items)):
+                    if actions_config.get('search_mode', 'targeted') == 'targeted':
+                        self.trigger_targeted_search(app_name, url, api_key, searched_items)
                     else:
-                        self.logger.error(f"❌ {app_name} échec du traitement pour: {title}")
+                        self.trigger_missing_search(app_name, url, api_key)
+        
+        if queue_cache is not None:
+            with self.profiler.span('queue_cache_commit', app=app_name):
+                queue_cache.commit(queue_diff)
         
         if processed_items > 0:
-            self.logger.info(f"✅ {app_name} {processed_items} éléments traités")
+            self.logger.info(f"✅ {self.simulation_prefix}{app_name} {processed_items} éléments traités")
         else:
             self.logger.info(f"✅ {app_name} aucun problème détecté")
+        
+        # Éléments abandonnés (max_retries) : plus rien à faire, pas de raccourcissement de l'intervalle
+        abandoned_ids = {item.get('id') for item, _ in abandoned}
+        pending_items = [item for item, _ in failed_items if item.get('id') not in abandoned_ids]
+        if processed_items > 0 or (pending_items and queue_diff is not None):
+            return OUTCOME_ACTIVE
+        if queue_diff is not None and not queue_diff.delta and not queue_diff.gone:
+            return OUTCOME_IDLE
+        return OUTCOME_NORMAL
     
-    def run_cycle(self):
-        """Exécute un cycle complet de surveillance"""
+    def _process_application_isolated(self, app_name, app_config):
+        """Traite une application en isolant ses erreurs des autres applications"""
+        try:
+            with self.profiler.span('process_application', app=app_name):
+                return self.process_application(app_name, app_config)
+        except Exception as e:
+            self.logger.error(f"❌ Erreur traitement {app_name} : {e}")
+            return OUTCOME_ERROR
+        finally:
+            with self._inflight_lock:
+                self._inflight_apps.discard(app_name)
+    
+    def run_cycle(self, app_names=None):
+        """Exécute un cycle complet de surveillance
+        
+        app_names limite le cycle à certaines applications. Retourne le résultat
+        d'analyse de chaque application traitée.
+        """
         self.logger.info("🚀 Début du cycle de surveillance")
+        cycle_start = time.monotonic()
+        self.profiler.begin_cycle()
         
         applications = self.config.get('applications', {})
+        if app_names is not None:
+            applications = {name: conf for name, conf in applications.items() if name in app_names}
+        monitoring_config = self.config.get('monitoring', {})
+        max_workers = max(1, int(monitoring_config.get('max_workers', 4)))
+        app_timeout = monitoring_config.get('app_timeout', 600)
         
-        for app_name, app_config in applications.items():
-            try:
-                self.process_application(app_name, app_config)
-            except Exception as e:
-                self.logger.error(f"❌ Erreur traitement {app_name} : {e}")
+        # Ignorer les applications encore en cours depuis un cycle précédent (instance bloquée)
+        pending = []
+        with self._inflight_lock:
+            for app_name, app_config in applications.items():
+                if app_name in self._inflight_apps:
+                    self.logger.warning(f"⏳ {app_name} toujours en cours depuis le cycle précédent, ignoré")
+                    continue
+                self._inflight_apps.add(app_name)
+                pending.append((app_name, app_config))
+        
+        outcomes = {}
+        
+        if max_workers == 1 or len(pending) <= 1 or self.profiler.profiling:
+            # Mode séquentiel (comportement historique, ou cycle observé par cProfile)
+            for app_name, app_config in pending:
+                outcomes[app_name] = self._process_application_isolated(app_name, app_config)
+        else:
+            # Mode concurrent : chaque application est analysée dans son propre thread
+            executor = ThreadPoolExecutor(max_workers=min(max_workers, len(pending)),
+                                          thread_name_prefix="arr-app")
+            futures = {
+                executor.submit(self._process_application_isolated, app_name, app_config): app_name
+                for app_name, app_config in pending
+            }
+            done, not_done = wait(futures, timeout=app_timeout)
+            for future in done:
+                outcomes[futures[future]] = future.result()
+            for future in not_done:
+                self.logger.error(f"⏱️ {futures[future]} dépasse {app_timeout}s, poursuite en arrière-plan")
+            # Ne pas attendre les applications bloquées : elles seront ignorées au prochain cycle
+            executor.shutdown(wait=False)
+        
+        # Écriture groupée des tentatives du cycle (jamais en simulation)
+        if self.state_store is not None and self.action_plan is None:
+            with self.profiler.span('state_flush'):
+                self.state_store.flush()
+        
+        self.profiler.end_cycle(outcomes=outcomes)
+        cycle_duration = time.monotonic() - cycle_start
+        self.metrics.cycle_duration.set(cycle_duration)
+        self.metrics.last_cycle.set(time.time())
+        self.logger.info(f"✅ Cycle terminé ({cycle_duration:.1f}s)")
+        return outcomes
+    
+    def request_stop(self, *_):
+        """Demande l'arrêt : le cycle en cours se termine, l'attente est interrompue"""
+        self.stop_event.set()
+        self._wake.set()
+    
+    def request_reload(self, *_):
+        """Demande le rechargement de la configuration avant le prochain cycle"""
+        self._reload_requested.set()
+        self._wake.set()
+    
+    def install_signal_handlers(self):
+        """SIGTERM/SIGINT : arrêt propre ; SIGHUP : rechargement de la configuration
+        
+        Les gestionnaires se contentent de positionner des événements (pas de log
+        dans le contexte du signal) ; la boucle principale les traite.
+        """
+        try:
+            signal.signal(signal.SIGTERM, self.request_stop)
+            signal.signal(signal.SIGINT, self.request_stop)
+            signal.signal(signal.SIGHUP, self.request_reload)
+        except ValueError:
+            # Hors du thread principal : signaux non disponibles
+            self.logger.debug("Gestionnaires de signaux non installés (thread secondaire)")
+    
+    def _wait(self, seconds):
+        """Attente interruptible (arrêt, rechargement) qui entretient le watchdog systemd"""
+        deadline = time.monotonic() + seconds
+        self.notifier.watchdog()
+        while not self._wake.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._wake.wait(min(remaining, self.notifier.watchdog_interval or remaining))
+            self.notifier.watchdog()
+        self._wake.clear()
+    
+    def _handle_reload_request(self):
+        """Traite un SIGHUP en attente ; retourne True si la configuration a été rechargée"""
+        if not self._reload_requested.is_set():
+            return False
         
-        self.logger.info("✅ Cycle terminé")
+        self._reload_requested.clear()
+        self.logger.info("🔄 Rechargement demandé (SIGHUP)")
+        self.notifier.reloading()
+        reloaded = self.reload_config()
+        self.notifier.ready("Configuration rechargée" if reloaded else "Rechargement refusé")
+        return reloaded
+    
+    def shutdown(self):
+        """Libère les ressources : journal des remédiations, serveur de métriques, connexions"""
+        self.notifier.stopping()
+        if self.state_store is not None and self.action_plan is None:
+            self.state_store.close()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        if self.webhook_server is not None:
+            self.webhook_server.stop()
+        self.profiler.close()
+        self.transport.close()
     
     def run_continuous(self):
         """Exécute la surveillance en continu avec refresh automatique des IPs et clés API"""
-        check_interval = self.config.get('monitoring', {}).get('check_interval', 300)
-        self.logger.info(f"🔄 Démarrage surveillance continue (intervalle: {check_interval}s)")
+        monitoring_config = self.config.get('monitoring', {})
+        check_interval = monitoring_config.get('check_interval', 300)
+        self.install_signal_handlers()
+        self.start_metrics_server()
+        self.start_webhook_server()
+        self.notifier.ready("Surveillance démarrée")
+        
+        try:
+            if not monitoring_config.get('adaptive_scheduling', True):
+                return self._run_fixed_interval(check_interval)
+            return self._run_adaptive()
+        finally:
+            self.shutdown()
+    
+    def _build_scheduler(self):
+        """Scheduler adaptatif ; avec les webhooks, le polling complet suit webhook.poll_interval"""
+        monitoring_config = dict(self.config.get('monitoring', {}))
+        webhook_config = self.config.get('webhook', {})
+        if webhook_config.get('enabled', False) and webhook_config.get('poll_interval'):
+            monitoring_config['check_interval'] = webhook_config['poll_interval']
+        return AdaptiveScheduler.from_config(monitoring_config)
+    
+    def _run_adaptive(self):
+        """Boucle adaptative : chaque application a sa propre échéance (AdaptiveScheduler)"""
+        scheduler = self._build_scheduler()
+        self.logger.info(f"🔄 Démarrage surveillance continue adaptative "
+                         f"(intervalle: {scheduler.base_interval}s, "
+                         f"bornes: {scheduler.min_interval}s-{scheduler.max_interval}s)")
+
+        # Détection initiale, puis uniquement après un échec de connexion
+        refresh_needed = True
 
         try:
-            while True:
-                # ÉTAPE 1: APPELER LA FONCTION REFRESH EXISTANTE D'ARR-LAUNCHER
-                self.logger.info("🌐 Réactualisation automatique des IPs et clés API...")
-                refresh_success = self.call_refresh_config()
+            while not self.stop_event.is_set():
+                # ÉTAPE 1: RÉACTUALISER LA CONFIGURATION SI NÉCESSAIRE
+                if self._handle_reload_request():
+                    # Nouvelles bornes : toutes les applications sont réanalysées immédiatement
+                    scheduler = self._build_scheduler()
+                self.refresh_config(force=refresh_needed)
+                refresh_needed = False
+                
+                # ÉTAPE 2: ANALYSER LES APPLICATIONS DONT L'ÉCHÉANCE EST ATTEINTE
+                app_names = [name for name, conf in self.config.get('applications', {}).items()
+                             if conf.get('enabled', False)]
+                for app_name in self._webhook_apps():
+                    scheduler.trigger(app_name)
+                # Une application retirée puis réactivée repart de l'intervalle de base, analysée immédiatement
+                scheduler.retain(app_names)
+                due_apps = scheduler.due(app_names)
+                
+                if due_apps:
+                    outcomes = self.run_cycle(due_apps)
+                    refresh_needed = OUTCOME_ERROR in outcomes.values()
+                    for app_name in due_apps:
+                        interval = scheduler.record(app_name, outcomes.get(app_name))
+                        self.logger.debug(f"📅 {app_name} prochaine analyse dans {interval:.0f}s")
                 
-                if refresh_success:
+                # ÉTAPE 3: PAUSE JUSQU'À LA PROCHAINE ÉCHÉANCE
+                if self.stop_event.is_set():
+                    break
+                wait_time = scheduler.seconds_until_next(app_names)
+                self.logger.info(f"⏰ Attente {wait_time:.0f} secondes...")
+                self._wait(wait_time)
+            
+            self.logger.info("🛑 Arrêt demandé, surveillance terminée")
+                
+        except KeyboardInterrupt:
+            self.logger.info("🛑 Arrêt demandé par l'utilisateur")
+        except Exception as e:
+            self.logger.error(f"❌ Erreur fatale : {e}")
+            sys.exit(1)
+    
+    def _run_fixed_interval(self, check_interval):
+        """Boucle historique à intervalle fixe (monitoring.adaptive_scheduling: false)"""
+        self.logger.info(f"🔄 Démarrage surveillance continue (intervalle: {check_interval}s)")
+
+        refresh_needed = True
+
+        try:
+            while not self.stop_event.is_set():
+                # ÉTAPE 1: RÉACTUALISER LA CONFIGURATION SI NÉCESSAIRE
+                reloaded = self._handle_reload_request()
+                if self.refresh_config(force=refresh_needed) or reloaded:
                     # Mettre à jour l'intervalle potentiellement modifié
                     check_interval = self.config.get('monitoring', {}).get('check_interval', 300)
                 
                 # ÉTAPE 2: EXÉCUTER LE CYCLE AVEC LA CONFIGURATION MISE À JOUR
-                self.run_cycle()
+                outcomes = self.run_cycle()
+                refresh_needed = OUTCOME_ERROR in outcomes.values()
 
                 # ÉTAPE 3: PAUSE AVANT LE PROCHAIN CYCLE
+                if self.stop_event.is_set():
+                    break
                 self.logger.info(f"⏰ Attente {check_interval} secondes...")
-                time.sleep(check_interval)
+                self._wait(check_interval)
+            
+            self.logger.info("🛑 Arrêt demandé, surveillance terminée")
                 
         except KeyboardInterrupt:
             self.logger.info("🛑 Arrêt demandé par l'utilisateur")
@@ -471,73 +1465,126 @@ class ArrMonitor:
             sys.exit(1)
     
     def diagnose_queue(self, app_name, app_config):
-        """Mode diagnostic pour analyser la queue en détail"""
+        """Mode diagnostic : analyse détaillée de la queue d'une application
+        
+        Retourne le résumé de la queue (statuts, règles, éléments en échec) ou
+        {'error': ...} si l'application est injoignable.
+        """
         url = app_config.get('url')
         api_key = app_config.get('api_key')
         
         if not url or not api_key:
             self.logger.error(f"❌ {app_name} configuration incomplète pour diagnostic")
-            return
+            return {'error': "configuration incomplète"}
         
         self.logger.info(f"🔬 DIAGNOSTIC {app_name}...")
         self.logger.info(f"📡 URL: {url}")
         self.logger.info(f"🔑 API Key: {api_key[:8]}***")
+        self._register_app_host(app_name, url)
         
         # Test de connexion
         if not self.test_connection(app_name, url, api_key):
-            return
+            return {'url': url, 'error': "connexion échouée"}
         
         # Récupération de la queue
         queue = self.get_queue(app_name, url, api_key)
-        if not queue:
+        if queue is None:
+            return {'url': url, 'error': "récupération de la queue échouée"}
+        
+        result = summarize_queue(queue, self.classifier.classify)
+        result['url'] = url
+        result['version'] = self._connection_health.get(app_name, {}).get('version')
+        return result
+    
+    def log_diagnosis(self, app_name, result, limit=5):
+        """Résumé lisible du diagnostic d'une application (limit=None : tous les éléments)"""
+        if result.get('error'):
+            self.logger.info(f"❌ {app_name} diagnostic impossible : {result['error']}")
+            return
+        if not result['total_items']:
             self.logger.info(f"📭 {app_name} queue vide")
             return
         
         self.logger.info(f"📊 {app_name} DIAGNOSTIC COMPLET:")
-        self.logger.info(f"📋 Total éléments: {len(queue)}")
-        
-        # Analyse des statuts
-        status_count = {}
-        error_items = []
-        
-        for item in queue:
-            status = item.get('status', 'unknown').lower()
-            status_count[status] = status_count.get(status, 0) + 1
-            
-            if self.is_download_failed(item):
-                error_items.append(item)
+        self.logger.info(f"📋 Total éléments: {result['total_items']}")
         
-        # Affichage des statistiques
         self.logger.info("📊 STATUTS COMPLETS:")
-        for status, count in sorted(status_count.items()):
+        for status, count in result['statuses'].items():
             self.logger.info(f"   {status}: {count}")
         
-        self.logger.info(f"🚨 ERREURS DÉTECTÉES: {len(error_items)}")
+        error_count = result['error_count']
+        self.logger.info(f"🚨 ERREURS DÉTECTÉES: {error_count}")
+        if not error_count:
+            return
         
-        if error_items:
-            self.logger.info("📋 Détail des erreurs:")
-            for i, error in enumerate(error_items[:5], 1):  # Limiter à 5 pour l'affichage
-                title = error.get('title', error.get('movieTitle', 'Titre inconnu'))
-                status = error.get('status', 'N/A')
-                error_msg = error.get('errorMessage', '')
-                tracked_status = error.get('trackedDownloadStatus', '')
-                tracked_state = error.get('trackedDownloadState', '')
-                
-                self.logger.info(f"   {i}. {title}")
-                self.logger.info(f"      Status: {status}")
-                if error_msg:
-                    safe_error = self.anonymize_sensitive_data(error_msg)
-                    self.logger.info(f"      Erreur: {safe_error}")
-                if tracked_status:
-                    self.logger.info(f"      Tracked Status: {tracked_status}")
-                if tracked_state:
-                    self.logger.info(f"      Tracked State: {tracked_state}")
-                self.logger.info("")
-            
-            if len(error_items) > 5:
-                self.logger.info(f"   ... et {len(error_items) - 5} autres erreurs")
-        
-        return len(error_items)
+        self.logger.info("🏷️ Règles:")
+        for rule_name, count in result['rules'].items():
+            self.logger.info(f"   {rule_name}: {count}")
+        
+        shown = result['error_items'] if limit is None else result['error_items'][:limit]
+        self.logger.info("📋 Détail des erreurs (plus anciennes d'abord):")
+        for i, error in enumerate(shown, 1):
+            self.logger.info(f"   {i}. {error['title']}")
+            self.logger.info(f"      Status: {error['status'] or 'N/A'} ({error['rule']})")
+            if error['error_message']:
+                self.logger.info(f"      Erreur: {error['error_message']}")
+            if error['tracked_download_status']:
+                self.logger.info(f"      Tracked Status: {error['tracked_download_status']}")
+            if error['tracked_download_state']:
+                self.logger.info(f"      Tracked State: {error['tracked_download_state']}")
+            if error['age_hours'] is not None:
+                self.logger.info(f"      En queue depuis: {error['age_hours']}h")
+            self.logger.info("")
+        
+        if error_count > len(shown):
+            self.logger.info(f"   ... et {error_count - len(shown)} autres erreurs (--all pour tout afficher)")
+    
+    def diagnose_all(self, limit=5):
+        """Diagnostique toutes les applications activées en parallèle (monitoring.max_workers)
+        
+        Retourne un DiagnoseReport incluant les latences des requêtes par application.
+        """
+        applications = {name: conf for name, conf in self.config.get('applications', {}).items()
+                         if conf.get('enabled', False)}
+        monitoring_config = self.config.get('monitoring', {})
+        max_workers = max(1, int(monitoring_config.get('max_workers', 4)))
+        app_timeout = monitoring_config.get('app_timeout', 600)
+        
+        report = DiagnoseReport(limit)
+        self._latency_samples = {}
+        
+        if applications:
+            executor = ThreadPoolExecutor(max_workers=min(max_workers, len(applications)),
+                                          thread_name_prefix="arr-diagnose")
+            futures = {
+                executor.submit(self.diagnose_queue, app_name, app_config): app_name
+                for app_name, app_config in applications.items()
+            }
+            done, not_done = wait(futures, timeout=app_timeout)
+            for future in done:
+                app_name = futures[future]
+                try:
+                    report.add(app_name, future.result())
+                except Exception as e:
+                    self.logger.error(f"❌ {app_name} erreur de diagnostic : {e}")
+                    report.add(app_name, {'error': str(e)})
+            for future in not_done:
+                self.logger.error(f"⏱️ {futures[future]} dépasse {app_timeout}s, diagnostic abandonné")
+                report.add(futures[future], {'error': f"délai de {app_timeout}s dépassé"})
+            executor.shutdown(wait=False)
+        
+        # Latences : par requête (réponses HTTP) et cumul par phase
+        samples, self._latency_samples = self._latency_samples, None
+        phases = {}
+        for (app_name, phase), (count, total) in self.metrics.request_duration.totals().items():
+            phases.setdefault(app_name, {})[phase] = {'count': count, 'seconds': round(total, 4)}
+        for app_name in applications:
+            result = report.get(app_name)
+            if result is not None:
+                result['latency'] = latency_summary(samples.get(app_name, ()))
+                result['phases'] = phases.get(app_name, {})
+        
+        return report
 
 def main():
     parser = argparse.ArgumentParser(description="Arr Monitor - Surveillance Sonarr/Radarr")
@@ -548,9 +1595,23 @@ def main():
     parser.add_argument('--debug', '-d', action='store_true', 
                        help='Mode debug (logs verbeux)')
     parser.add_argument('--dry-run', '-n', action='store_true', 
-                       help='Mode simulation (aucune action)')
+                       help='Mode simulation (aucune action, plan JSON sur la sortie standard)')
+    parser.add_argument('--plan-output', metavar='FICHIER',
+                       help='Fichier du plan d\'actions en mode simulation')
+    parser.add_argument('--profile', action='store_true',
+                       help='Trace des durées par phase à chaque cycle (section profiling)')
+    parser.add_argument('--profile-cycles', type=int, metavar='N',
+                       help='Avec --profile : profil cProfile des N premiers cycles')
     parser.add_argument('--diagnose', action='store_true', 
                        help='Mode diagnostic complet de la queue')
+    parser.add_argument('--limit', type=int, default=5, metavar='N',
+                       help='Diagnostic : nombre d\'éléments en échec détaillés par application (défaut : 5)')
+    parser.add_argument('--all', action='store_true',
+                       help='Diagnostic : détailler tous les éléments en échec')
+    parser.add_argument('--report', metavar='FICHIER',
+                       help='Diagnostic : rapport JSON ou CSV (selon l\'extension, - pour la sortie standard)')
+    parser.add_argument('--report-format', choices=(FORMAT_JSON, FORMAT_CSV),
+                       help='Diagnostic : format du rapport (défaut : selon l\'extension)')
     
     args = parser.parse_args()
     
@@ -559,25 +1620,48 @@ def main():
         logging.getLogger().setLevel(logging.DEBUG)
     
     try:
-        monitor = ArrMonitor(args.config)
+        monitor = ArrMonitor(args.config, dry_run=args.dry_run and not args.diagnose)
+        if args.profile:
+            monitor.enable_profiling(args.profile_cycles)
         
         if args.diagnose:
-            # Mode diagnostic spécial
+            # Mode diagnostic : toutes les instances en parallèle, résumé lisible + rapport JSON/CSV
             monitor.logger.info("🔬 MODE DIAGNOSTIC ACTIVÉ")
-            applications = monitor.config.get('applications', {})
+            limit = None if args.all else max(0, args.limit)
+            diagnose_start = time.monotonic()
+            report = monitor.diagnose_all(limit)
+            diagnose_duration = time.monotonic() - diagnose_start
             
-            total_errors = 0
-            for app_name, app_config in applications.items():
-                if app_config.get('enabled', False):
-                    errors = monitor.diagnose_queue(app_name, app_config)
-                    if errors:
-                        total_errors += errors
+            for app_name, result in report.to_dict()['applications'].items():
+                monitor.log_diagnosis(app_name, result, limit)
             
-            monitor.logger.info(f"🎯 DIAGNOSTIC TERMINÉ - Total erreurs trouvées: {total_errors}")
+            monitor.logger.info(f"🎯 DIAGNOSTIC TERMINÉ - Total erreurs trouvées: {report.total_errors} "
+                                f"({diagnose_duration:.1f}s)")
             
+            if args.report:
+                report_format = args.report_format or (
+                    FORMAT_CSV if args.report.lower().endswith('.csv') else FORMAT_JSON)
+                content = report.render(report_format, diagnose_duration)
+                if args.report == '-':
+                    sys.stdout.write(content)
+                else:
+                    Path(args.report).write_text(content, encoding='utf-8')
+                    monitor.logger.info(f"📝 Rapport de diagnostic enregistré : {args.report}")
+            
+            if report.failed_apps:
+                sys.exit(2)
+        
         elif args.dry_run:
             monitor.logger.info("🧪 Mode simulation activé - aucune action ne sera effectuée")
-            # TODO: Implémenter le mode dry-run complet
+            outcomes = monitor.run_cycle()
+            
+            plan = monitor.action_plan.to_dict(monitor.metrics, outcomes, config_path=args.config)
+            plan_json = json.dumps(plan, indent=2, ensure_ascii=False)
+            if args.plan_output:
+                Path(args.plan_output).write_text(plan_json + "\n", encoding='utf-8')
+                monitor.logger.info(f"📝 Plan d'actions enregistré : {args.plan_output}")
+            else:
+                print(plan_json)
             
         elif args.test:
             monitor.run_cycle()
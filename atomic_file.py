@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Atomic File - Écriture atomique des fichiers d'état et de configuration
+Fichier temporaire voisin puis os.replace : un lecteur ne voit jamais de fichier tronqué
+"""
+
+import json
+import os
+from pathlib import Path
+
+
+def write_text_atomic(path, text):
+    """Remplace le contenu de path ; OSError est propagée à l'appelant (fichier d'origine intact)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def write_json_atomic(path, data):
+    """Sérialise data en JSON compact puis l'écrit de façon atomique"""
+    write_text_atomic(path, json.dumps(data, separators=(',', ':')))
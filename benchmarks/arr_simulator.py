@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Arr Simulator - Simulateur local de l'API /api/v3 de Sonarr/Radarr pour les benchmarks
+Queue synthétique paginée (taille et proportion d'échecs configurables), historique,
+suppressions unitaires et groupées, commandes, latence et injection d'erreurs
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+KIND_SONARR = "sonarr"
+KIND_RADARR = "radarr"
+
+API_PREFIX = "/api/v3"
+DEFAULT_API_KEY = "0123456789abcdef0123456789abcdef"
+
+# Échecs reconnus par les règles de détection par défaut
+FAILURE_MESSAGE = "qBittorrent is reporting an error"
+
+
+def _iso(moment):
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _queue_item(kind, index, failed, now):
+    """Élément de queue au format *arr, objets imbriqués compris (taille réaliste)"""
+    item = {
+        'id': index,
+        'downloadId': f"SIM{index:08X}",
+        'title': f"Simulated.Release.{index}.1080p.WEB.H264-SIM",
+        'status': 'warning' if failed else 'downloading',
+        'trackedDownloadStatus': 'warning' if failed else 'ok',
+        'trackedDownloadState': 'downloading',
+        'errorMessage': FAILURE_MESSAGE if failed else '',
+        'statusMessages': [{'title': f"Simulated.Release.{index}", 'messages': [FAILURE_MESSAGE]}] if failed else [],
+        'size': 4_000_000_000,
+        'sizeleft': 4_000_000_000 - (index * 7919) % 4_000_000_000,
+        'timeleft': '00:42:00',
+        'added': _iso(now - timedelta(minutes=index % 10_000)),
+        'estimatedCompletionTime': _iso(now + timedelta(minutes=42)),
+        'protocol': 'torrent',
+        'downloadClient': 'qBittorrent',
+        'indexer': 'Simulated Indexer',
+        'outputPath': f"/downloads/complete/Simulated.Release.{index}",
+        'quality': {'quality': {'id': 3, 'name': 'WEBDL-1080p', 'source': 'web', 'resolution': 1080},
+                    'revision': {'version': 1, 'real': 0, 'isRepack': False}},
+        'customFormats': [],
+        'languages': [{'id': 1, 'name': 'English'}]
+    }
+    if kind == KIND_SONARR:
+        series_id = index // 10 + 1
+        item.update({
+            'seriesId': series_id,
+            'episodeId': index + 1,
+            'seasonNumber': 1,
+            'series': {'id': series_id, 'title': f"Simulated Series {series_id}", 'year': 2020,
+                       'overview': "Lorem ipsum dolor sit amet. " * 8, 'images': [], 'genres': ['Drama']},
+            'episode': {'id': index + 1, 'seriesId': series_id, 'episodeNumber': index % 24 + 1,
+                        'title': f"Episode {index}", 'overview': "Lorem ipsum. " * 6}
+        })
+    else:
+        item.update({
+            'movieId': index + 1,
+            'movie': {'id': index + 1, 'title': f"Simulated Movie {index}", 'year': 2020,
+                      'overview': "Lorem ipsum dolor sit amet. " * 8, 'images': [], 'genres': ['Drama']}
+        })
+    return item
+
+
+class ArrSimulator:
+    """Instance Sonarr/Radarr simulée, servie dans un thread dédié
+    
+    latency (+ jitter aléatoire) est appliquée à chaque requête ; error_rate est
+    la probabilité de répondre 503 aux lectures de queue et d'historique. Les
+    suppressions retirent réellement les éléments de la queue (reset() la
+    régénère). Les requêtes reçues sont comptées par (méthode, endpoint).
+    """
+    
+    def __init__(self, kind=KIND_SONARR, queue_size=1000, failure_ratio=0.1, history_size=0,
+                 latency=0.0, jitter=0.0, error_rate=0.0, api_key=DEFAULT_API_KEY,
+                 host="127.0.0.1", port=0, seed=0, version="4.0.0.0"):
+        self.kind = kind
+        self.queue_size = queue_size
+        self.failure_ratio = failure_ratio
+        self.history_size = history_size
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.api_key = api_key
+        self.host = host
+        self.port = port
+        self.seed = seed
+        self.version = version
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self.requests = {}
+        self.reset()
+    
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+    
+    def reset(self):
+        """Régénère la queue et l'historique synthétiques et remet les compteurs à zéro"""
+        now = datetime.now(timezone.utc)
+        rng = random.Random(self.seed)
+        queue = [_queue_item(self.kind, index, rng.random() < self.failure_ratio, now)
+                 for index in range(self.queue_size)]
+        media_field = 'seriesId' if self.kind == KIND_SONARR else 'movieId'
+        history = [{
+            'id': self.history_size - index,
+            'eventType': 'downloadFailed' if index % 4 == 0 else 'grabbed',
+            'date': _iso(now - timedelta(seconds=30 * index)),
+            'downloadId': f"SIM{index:08X}",
+            media_field: index // 10 + 1 if self.kind == KIND_SONARR else index + 1,
+            **({'episodeId': index + 1} if self.kind == KIND_SONARR else {}),
+            'sourceTitle': f"Simulated.Release.{index}"
+        } for index in range(self.history_size)]
+        
+        with self._lock:
+            self.queue = queue
+            self.history = history
+            self.requests = {}
+    
+    def request_count(self, method=None):
+        with self._lock:
+            return sum(count for (req_method, _), count in self.requests.items()
+                       if method is None or req_method == method)
+    
+    def reset_counters(self):
+        with self._lock:
+            self.requests = {}
+    
+    # Endpoints
+    
+    def _count(self, method, path):
+        endpoint = path[len(API_PREFIX):] if path.startswith(API_PREFIX) else path
+        if endpoint.startswith('/queue/') and endpoint != '/queue/bulk':
+            endpoint = '/queue/{id}'
+        key = (method, endpoint)
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+    
+    def _delay(self):
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+    
+    def _injected_error(self):
+        return self.error_rate > 0 and self._random.random() < self.error_rate
+    
+    def _paginate(self, records, query):
+        page = max(1, int(query.get('page', ['1'])[0]))
+        page_size = max(1, int(query.get('pageSize', ['10'])[0]))
+        return {
+            'page': page,
+            'pageSize': page_size,
+            'totalRecords': len(records),
+            'records': records[(page - 1) * page_size:page * page_size]
+        }
+    
+    def handle(self, method, path, query, body):
+        """Traite une requête et retourne (code HTTP, objet JSON ou None)"""
+        self._count(method, path)
+        self._delay()
+        
+        if method == 'GET' and path == f"{API_PREFIX}/system/status":
+            return 200, {'appName': self.kind.capitalize(), 'version': self.version}
+        
+        if method == 'GET' and path == f"{API_PREFIX}/queue":
+            if self._injected_error():
+                return 503, None
+            with self._lock:
+                return 200, self._paginate(self.queue, query)
+        
+        if method == 'GET' and path == f"{API_PREFIX}/history":
+            if self._injected_error():
+                return 503, None
+            with self._lock:
+                return 200, self._paginate(self.history, query)
+        
+        if method == 'DELETE' and path == f"{API_PREFIX}/queue/bulk":
+            ids = set((body or {}).get('ids', []))
+            with self._lock:
+                self.queue = [item for item in self.queue if item['id'] not in ids]
+            return 200, None
+        
+        if method == 'DELETE' and path.startswith(f"{API_PREFIX}/queue/"):
+            queue_id = path.rsplit('/', 1)[-1]
+            with self._lock:
+                remaining = [item for item in self.queue if str(item['id']) != queue_id]
+                found = len(remaining) != len(self.queue)
+                self.queue = remaining
+            return (200, None) if found else (404, None)
+        
+        if method == 'POST' and path == f"{API_PREFIX}/command":
+            return 201, {'id': self._random.randint(1, 1_000_000), 'name': (body or {}).get('name'),
+                         'status': 'queued'}
+        
+        return 404, None
+    
+    # Serveur HTTP
+    
+    def start(self):
+        simulator = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def _dispatch(self, method):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                raw_body = self.rfile.read(length) if length else b''
+                if self.headers.get('X-Api-Key') != simulator.api_key:
+                    return self._reply(401, None)
+                try:
+                    body = json.loads(raw_body) if raw_body else None
+                except ValueError:
+                    return self._reply(400, None)
+                status, payload = simulator.handle(method, parts.path, parse_qs(parts.query), body)
+                self._reply(status, payload)
+            
+            def _reply(self, status, payload):
+                data = json.dumps(payload).encode('utf-8') if payload is not None else b''
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def do_GET(self):
+                self._dispatch('GET')
+            
+            def do_POST(self):
+                self._dispatch('POST')
+            
+            def do_DELETE(self):
+                self._dispatch('DELETE')
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name=f"sim-{self.kind}", daemon=True).start()
+        return self
+    
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulateur local de l'API Sonarr/Radarr")
+    parser.add_argument('--kind', choices=(KIND_SONARR, KIND_RADARR), default=KIND_SONARR)
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8989)
+    parser.add_argument('--items', type=int, default=1000, help='Taille de la queue')
+    parser.add_argument('--failure-ratio', type=float, default=0.1, help='Proportion d\'éléments en échec')
+    parser.add_argument('--history', type=int, default=0, help='Nombre d\'événements d\'historique')
+    parser.add_argument('--latency', type=float, default=0.0, help='Latence par requête (secondes)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Latence aléatoire additionnelle (secondes)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probabilité de 503 sur les lectures')
+    parser.add_argument('--api-key', default=DEFAULT_API_KEY)
+    args = parser.parse_args()
+    
+    simulator = ArrSimulator(kind=args.kind, queue_size=args.items, failure_ratio=args.failure_ratio,
+                             history_size=args.history, latency=args.latency, jitter=args.jitter,
+                             error_rate=args.error_rate, api_key=args.api_key,
+                             host=args.host, port=args.port).start()
+    print(f"{args.kind} simulé sur {simulator.url} (clé API {args.api_key}), Ctrl+C pour arrêter")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
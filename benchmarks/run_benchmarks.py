@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Run Benchmarks - Mesures de performance d'Arr Monitor contre le simulateur local
+Chaque scénario s'exécute dans un processus dédié (durées, CPU et pic RSS isolés) ;
+les requêtes sont comptées côté simulateur
+"""
+
+import argparse
+import importlib.util
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(BENCH_DIR))
+
+from arr_simulator import ArrSimulator, KIND_RADARR, KIND_SONARR  # noqa: E402
+
+# Scénario -> variantes (surcharges de la section monitoring)
+SCENARIOS = {
+    'startup': {None: {}},
+    'get_queue': {
+        'full': {'queue_parser': 'full'},
+        'lean': {'queue_parser': 'lean'},
+        'stream': {'queue_parser': 'stream'}
+    },
+    'page_prefetch': {
+        'workers=1': {'queue_page_workers': 1},
+        'workers=4': {'queue_page_workers': 4}
+    },
+    'run_cycle': {None: {}},
+    'diagnose_queue': {None: {}},
+    'anonymizer': {None: {}}
+}
+
+# Lignes représentatives d'un cycle avec erreurs qBittorrent (messages de queue bruts inclus)
+ANONYMIZER_LINES = (
+    "✅ sonarr connecté (v4.0.0.0)",
+    "❌ sonarr erreur détectée : Show.Name.S02E05.1080p.WEB.H264-GROUP",
+    "   🚨 Erreur: qBittorrent is reporting an error",
+    "   🚨 Erreur: qBittorrent is reporting an error: tracker udp://tracker.example.org:6969/announce "
+    "unreachable (connection to 185.21.216.143 timed out)",
+    "   🚨 Erreur: qBittorrent is reporting an error: No space left on device "
+    "(/home/seedbox/torrents/Show.Name.S02E05.1080p.WEB.H264-GROUP/part.mkv)",
+    "⏳ radarr téléchargement bloqué : Movie.Title.2023.2160p.UHD.BluRay.x265-GROUP",
+    "❌ radarr connexion échouée : HTTPConnectionPool(host='172.18.0.5', port=7878): Read timed out",
+    "🔑 API Key: 0123abcd***",
+    "📁 Config trouvée : /home/seedbox/.config/sonarr/config.xml sur seedbox.example.org",
+    "🚫 sonarr 12 releases bloquées et supprimées"
+)
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux : kilo-octets, macOS : octets
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _load_monitor_module():
+    spec = importlib.util.spec_from_file_location('arr_monitor', REPO_ROOT / 'arr-monitor.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Scénarios (exécutés dans le processus enfant)
+
+def _bench_startup(config_path, args):
+    start = time.perf_counter()
+    module = _load_monitor_module()
+    imported = time.perf_counter()
+    monitor = module.ArrMonitor(str(config_path))
+    ready = time.perf_counter()
+    monitor.shutdown()
+    return {'durations': [ready - start], 'import_seconds': round(imported - start, 4),
+            'init_seconds': round(ready - imported, 4)}
+
+
+def _bench_get_queue(config_path, args):
+    monitor = _load_monitor_module().ArrMonitor(str(config_path))
+    app_config = monitor.config['applications']['sonarr']
+    durations = []
+    items = 0
+    try:
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            queue = monitor.get_queue('sonarr', app_config['url'], app_config['api_key'])
+            durations.append(time.perf_counter() - start)
+            items = len(queue or ())
+    finally:
+        monitor.shutdown()
+    return {'durations': durations, 'items': items, 'parser': monitor._queue_parser()}
+
+
+def _bench_run_cycle(config_path, args):
+    monitor = _load_monitor_module().ArrMonitor(str(config_path))
+    durations = []
+    try:
+        for _ in range(args.cycles):
+            start = time.perf_counter()
+            monitor.run_cycle()
+            durations.append(time.perf_counter() - start)
+    finally:
+        monitor.shutdown()
+    steady = durations[1:] or durations
+    return {'durations': durations, 'first_cycle_seconds': round(durations[0], 4),
+            'steady_cycle_seconds': round(sum(steady) / len(steady), 4)}
+
+
+def _bench_diagnose_queue(config_path, args):
+    monitor = _load_monitor_module().ArrMonitor(str(config_path))
+    durations = []
+    try:
+        for _ in range(args.repeat):
+            for app_name, app_config in monitor.config['applications'].items():
+                start = time.perf_counter()
+                monitor.diagnose_queue(app_name, app_config)
+                durations.append(time.perf_counter() - start)
+    finally:
+        monitor.shutdown()
+    return {'durations': durations}
+
+
+def _bench_anonymizer(config_path, args):
+    from log_anonymizer import LogAnonymizer
+    anonymizer = LogAnonymizer()
+    lines = ANONYMIZER_LINES * 20_000
+    durations = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        for line in lines:
+            anonymizer.anonymize(line)
+        durations.append(time.perf_counter() - start)
+    best = min(durations)
+    return {'durations': durations, 'lines_per_second': round(len(lines) / best) if best else None}
+
+
+BENCHES = {
+    'startup': _bench_startup,
+    'get_queue': _bench_get_queue,
+    'page_prefetch': _bench_get_queue,
+    'run_cycle': _bench_run_cycle,
+    'diagnose_queue': _bench_diagnose_queue,
+    'anonymizer': _bench_anonymizer
+}
+
+
+def run_worker(args):
+    """Processus enfant : exécute un scénario et écrit son résultat JSON sur la sortie standard"""
+    cpu_start = time.process_time()
+    result = BENCHES[args.worker](Path(args.config), args)
+    result['cpu_seconds'] = round(time.process_time() - cpu_start, 4)
+    result['peak_rss_mb'] = _peak_rss_mb()
+    print(json.dumps(result))
+
+
+# Orchestration (processus parent)
+
+def write_config(directory, simulators, overrides, log_level):
+    """Configuration de benchmark : config.yaml du dépôt + instances simulées, sans découverte ni serveurs"""
+    with open(REPO_ROOT / 'config.yaml', 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    
+    config['applications'] = {
+        simulator.kind: {'enabled': True, 'url': simulator.url, 'api_key': simulator.api_key}
+        for simulator in simulators
+    }
+    config['monitoring'].update(overrides)
+    config['state'] = dict(config.get('state', {}), directory=str(directory / 'data'))
+    config['logging'] = dict(config.get('logging', {}), level=log_level,
+                             file=str(directory / 'logs' / 'arr-monitor.log'), json_file='')
+    config['discovery'] = dict(config.get('discovery', {}), enabled=False)
+    config['updates'] = dict(config.get('updates', {}), check_on_startup=False)
+    config['metrics'] = dict(config.get('metrics', {}), enabled=False)
+    config['webhook'] = dict(config.get('webhook', {}), enabled=False)
+    
+    config_path = directory / 'config.yaml'
+    with open(config_path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+    return config_path
+
+
+def run_scenario(scenario, variant, overrides, simulators, args):
+    for simulator in simulators:
+        simulator.reset()
+    
+    with tempfile.TemporaryDirectory(prefix='arr-bench-') as tmp:
+        config_path = write_config(Path(tmp), simulators, overrides, args.log_level)
+        command = [sys.executable, str(Path(__file__).resolve()), '--worker', scenario,
+                   '--config', str(config_path), '--repeat', str(args.repeat), '--cycles', str(args.cycles)]
+        completed = subprocess.run(command, stdout=subprocess.PIPE,
+                                   stderr=None if args.verbose else subprocess.DEVNULL,
+                                   text=True, cwd=tmp)
+    
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        return {'scenario': scenario, 'variant': variant, 'error': f"code retour {completed.returncode}"}
+    
+    result = json.loads(lines[-1])
+    durations = result.pop('durations')
+    requests_total = sum(simulator.request_count() for simulator in simulators)
+    result.update({
+        'scenario': scenario,
+        'variant': variant,
+        'iterations': len(durations),
+        'best_seconds': round(min(durations), 4),
+        'mean_seconds': round(sum(durations) / len(durations), 4),
+        'requests': requests_total,
+        'requests_per_iteration': round(requests_total / len(durations), 1),
+        'requests_by_endpoint': {
+            f"{simulator.kind} {method} {endpoint}": count
+            for simulator in simulators
+            for (method, endpoint), count in sorted(simulator.requests.items())
+        }
+    })
+    return result
+
+
+def print_table(results):
+    header = f"{'scénario':<16} {'variante':<10} {'meilleur (s)':>12} {'moyen (s)':>10} {'req/it':>8} {'CPU (s)':>8} {'RSS (Mo)':>9}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        variant = result['variant'] or '-'
+        if 'error' in result:
+            print(f"{result['scenario']:<16} {variant:<10} erreur : {result['error']}")
+            continue
+        print(f"{result['scenario']:<16} {variant:<10} {result['best_seconds']:>12.4f} {result['mean_seconds']:>10.4f} "
+              f"{result['requests_per_iteration']:>8} {result['cpu_seconds']:>8.2f} {result['peak_rss_mb']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks Arr Monitor (simulateur Sonarr/Radarr local)")
+    parser.add_argument('scenarios', nargs='*', metavar='SCÉNARIO', help=f"Scénarios à exécuter (défaut : tous) : {', '.join(SCENARIOS)}")
+    parser.add_argument('--items', type=int, default=5000, help='Éléments par queue simulée')
+    parser.add_argument('--failure-ratio', type=float, default=0.05, help='Proportion d\'éléments en échec')
+    parser.add_argument('--history', type=int, default=500, help='Événements d\'historique par instance')
+    parser.add_argument('--latency', type=float, default=0.02, help='Latence par requête (secondes)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Latence aléatoire additionnelle (secondes)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probabilité de 503 sur les lectures')
+    parser.add_argument('--repeat', type=int, default=5, help='Répétitions par scénario')
+    parser.add_argument('--cycles', type=int, default=5, help='Cycles du scénario run_cycle')
+    parser.add_argument('--log-level', default='WARNING', help='Niveau de log du moniteur pendant les mesures')
+    parser.add_argument('--output', '-o', metavar='FICHIER', help='Résultats détaillés en JSON')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Afficher les logs des processus mesurés')
+    parser.add_argument('--worker', choices=list(BENCHES), help=argparse.SUPPRESS)
+    parser.add_argument('--config', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        return run_worker(args)
+    unknown = [scenario for scenario in args.scenarios if scenario not in SCENARIOS]
+    if unknown:
+        parser.error(f"scénario inconnu : {', '.join(unknown)}")
+    
+    simulators = [
+        ArrSimulator(kind=kind, queue_size=args.items, failure_ratio=args.failure_ratio,
+                     history_size=args.history, latency=args.latency, jitter=args.jitter,
+                     error_rate=args.error_rate, seed=seed).start()
+        for seed, kind in enumerate((KIND_SONARR, KIND_RADARR))
+    ]
+    
+    results = []
+    try:
+        for scenario in args.scenarios or SCENARIOS:
+            for variant, overrides in SCENARIOS[scenario].items():
+                print(f"⏱️  {scenario} {variant or ''}".rstrip(), file=sys.stderr)
+                results.append(run_scenario(scenario, variant, overrides, simulators, args))
+    finally:
+        for simulator in simulators:
+            simulator.stop()
+    
+    print_table(results)
+    if args.output:
+        settings = {key: getattr(args, key) for key in
+                    ('items', 'failure_ratio', 'history', 'latency', 'jitter', 'error_rate', 'repeat', 'cycles')}
+        Path(args.output).write_text(json.dumps({'settings': settings, 'results': results}, indent=2,
+                                                ensure_ascii=False) + "\n", encoding='utf-8')
+
+
+if __name__ == "__main__":
+    main()
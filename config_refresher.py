@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Config Refresher - Réactualisation native des IPs et clés API Sonarr/Radarr
+Remplace l'appel à refresh_config d'arr-launcher.sh dans la boucle de surveillance
+"""
+
+import json
+import logging
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+
+from atomic_file import write_text_atomic
+
+
+class ConfigRefresher:
+    """Réactualisation de la configuration avec cache TTL et détection de changement
+    
+    La détection n'est relancée que sur signal (démarrage, échec de connexion) et
+    au plus une fois par cache_ttl. Le fichier de configuration n'est réécrit (avec
+    sauvegarde) que si les valeurs détectées diffèrent de celles en place.
+    """
+    
+    def __init__(self, config_path, discovery, cache_ttl=300, backup_count=5):
+        self.config_path = Path(config_path)
+        self.discovery = discovery
+        self.cache_ttl = cache_ttl
+        self.backup_count = backup_count
+        self.logger = logging.getLogger(__name__)
+        self._discovered = None
+        self._discovered_at = 0.0
+        self._mtime = self._current_mtime()
+    
+    def _current_mtime(self):
+        try:
+            return self.config_path.stat().st_mtime_ns
+        except OSError:
+            return None
+    
+    def config_changed(self):
+        """Vérifie (via mtime) si le fichier de configuration a été modifié depuis la dernière lecture"""
+        mtime = self._current_mtime()
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        return True
+    
+    def set_discovery(self, discovery, cache_ttl=300, backup_count=5):
+        """Remplace la détection (configuration rechargée) ; le résultat en cache est oublié"""
+        self.discovery = discovery
+        self.cache_ttl = cache_ttl
+        self.backup_count = backup_count
+        self._discovered = None
+        self._discovered_at = 0.0
+    
+    def discover(self, force=False):
+        """Résultat de détection, mis en cache pendant cache_ttl secondes"""
+        now = time.monotonic()
+        if self._discovered is None or (force and now - self._discovered_at >= self.cache_ttl):
+            started = time.monotonic()
+            self._discovered = self.discovery.discover()
+            self._discovered_at = now
+            self.logger.debug(f"🔍 Détection terminée en {time.monotonic() - started:.2f}s : {sorted(self._discovered)}")
+        return self._discovered
+    
+    def refresh(self, config, force=False):
+        """Met à jour le fichier de configuration si la détection diffère. Retourne True si réécrit."""
+        discovered = self.discover(force=force)
+        applications = config.get('applications', {}) or {}
+        
+        updates = {}
+        for app_name, values in discovered.items():
+            current = applications.get(app_name) or {}
+            wanted = {'enabled': True, 'type': values['type'], 'url': values['url'], 'api_key': values['api_key']}
+            if any(current.get(key) != value for key, value in wanted.items()):
+                updates[app_name] = wanted
+        
+        if not updates:
+            return False
+        
+        self._rewrite_config(updates)
+        return True
+    
+    def _rewrite_config(self, updates):
+        """Réécrit les blocs d'application concernés en conservant le reste du fichier"""
+        text = self.config_path.read_text(encoding='utf-8')
+        new_text = text
+        for app_name, values in updates.items():
+            new_text = update_app_block(new_text, app_name, values)
+        
+        if new_text == text:
+            return
+        
+        backup_file = self.config_path.with_name(
+            f"{self.config_path.name}.backup.{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        backup_file.write_text(text, encoding='utf-8')
+        self._prune_backups()
+        
+        write_text_atomic(self.config_path, new_text)
+        
+        for app_name, values in updates.items():
+            self.logger.info(f"✅ {app_name} configuré : {values['url']}")
+        self.logger.info(f"💾 Sauvegarde créée : {backup_file.name}")
+    
+    def _prune_backups(self):
+        """Ne conserve que les backup_count sauvegardes les plus récentes"""
+        backups = sorted(self.config_path.parent.glob(f"{self.config_path.name}.backup.*"))
+        for old_backup in backups[:-self.backup_count] if self.backup_count > 0 else backups:
+            try:
+                old_backup.unlink()
+            except OSError:
+                pass
+
+
+def update_app_block(text, app_name, values):
+    """Met à jour (ou ajoute) le bloc applications.<app_name> d'un config.yaml, commentaires conservés"""
+    lines = text.splitlines(keepends=True)
+    
+    apps_index = next((i for i, line in enumerate(lines) if re.match(r'^applications:\s*(#.*)?$', line)), None)
+    if apps_index is None:
+        lines.append("\napplications:\n")
+        apps_index = len(lines) - 1
+    
+    # Fin de la section applications : première ligne non indentée suivante
+    section_end = next((i for i in range(apps_index + 1, len(lines))
+                        if lines[i].strip() and not lines[i].startswith((' ', '\t', '#'))), len(lines))
+    
+    block_start = next((i for i in range(apps_index + 1, section_end)
+                        if re.match(rf'^\s{{2}}{re.escape(app_name)}:\s*(#.*)?$', lines[i])), None)
+    
+    if block_start is None:
+        # Insertion après le dernier élément non vide de la section
+        insert_at = section_end
+        while insert_at > apps_index + 1 and not lines[insert_at - 1].strip():
+            insert_at -= 1
+        if insert_at > 0 and not lines[insert_at - 1].endswith('\n'):
+            lines[insert_at - 1] += '\n'
+        block = [f"  {app_name}:\n"] + [f"    {key}: {_yaml_value(value)}\n" for key, value in values.items()]
+        lines[insert_at:insert_at] = block
+        return ''.join(lines)
+    
+    block_end = next((i for i in range(block_start + 1, section_end)
+                      if lines[i].strip() and not lines[i].startswith('    ')
+                      and not lines[i].lstrip().startswith('#')), section_end)
+    
+    remaining = dict(values)
+    for i in range(block_start + 1, block_end):
+        match = re.match(r'^(\s{4})(\w+):(\s*)([^#\n]*?)(\s*#.*)?(\n?)$', lines[i])
+        if match and match.group(2) in remaining:
+            indent, key, spacing, _, comment, newline = match.groups()
+            lines[i] = f"{indent}{key}:{spacing or ' '}{_yaml_value(remaining.pop(key))}{comment or ''}{newline}"
+    
+    if remaining:
+        insert_at = block_end
+        while insert_at > block_start + 1 and not lines[insert_at - 1].strip():
+            insert_at -= 1
+        lines[insert_at:insert_at] = [f"    {key}: {_yaml_value(value)}\n" for key, value in remaining.items()]
+    
+    return ''.join(lines)
+
+
+def _yaml_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return json.dumps(str(value))
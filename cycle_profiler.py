@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Cycle Profiler - Instrumentation optionnelle des cycles de surveillance
+Spans de durée par phase, trace par cycle (JSON lines ou format Chrome trace-event)
+et profil cProfile des N premiers cycles ; coût quasi nul lorsqu'il est désactivé
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+
+FORMAT_JSONL = "jsonl"
+FORMAT_CHROME = "chrome"
+
+_NULL_SPAN = nullcontext()
+
+
+class NullProfiler:
+    """Profileur désactivé : spans sans effet, aucune allocation par appel"""
+
+    enabled = False
+    profiling = False
+
+    def span(self, name, **attrs):
+        return _NULL_SPAN
+
+    def begin_cycle(self):
+        pass
+
+    def end_cycle(self, **attrs):
+        pass
+
+    def close(self):
+        pass
+
+
+class CycleProfiler:
+    """Spans par phase regroupés par cycle, écrits à la fin de chaque cycle
+
+    Les spans émis entre deux cycles (rafraîchissement de la configuration,
+    rechargement) sont rattachés au cycle suivant. cProfile n'observe que le
+    thread qui l'active (et un seul profil peut être actif à partir de Python
+    3.12) : pendant les cycles profilés, profiling est vrai et l'appelant
+    exécute le cycle dans un seul thread.
+    """
+
+    def __init__(self, trace_file, trace_format=FORMAT_JSONL, cprofile_cycles=0, output_dir="logs/profiles"):
+        self.enabled = True
+        self.trace_file = Path(trace_file) if trace_file else None
+        self.trace_format = trace_format
+        self.cprofile_cycles = max(0, int(cprofile_cycles))
+        self.output_dir = Path(output_dir)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._spans = []
+        self._cycle = 0
+        self._cycle_start = None
+        self._profile = None
+        self._trace = None
+        self._known_threads = set()
+        self._pid = os.getpid()
+
+    @classmethod
+    def from_config(cls, config, force=False, cprofile_cycles=None):
+        """Crée le profileur depuis la section profiling (NullProfiler si désactivé et non forcé)"""
+        profiling_config = config.get('profiling', {})
+        if not (force or profiling_config.get('enabled', False)):
+            return NullProfiler()
+
+        trace_format = profiling_config.get('format', FORMAT_JSONL)
+        default_trace = f"logs/arr-monitor-trace.{'json' if trace_format == FORMAT_CHROME else 'jsonl'}"
+        return cls(
+            profiling_config.get('trace_file', default_trace),
+            trace_format=trace_format,
+            cprofile_cycles=profiling_config.get('cprofile_cycles', 0) if cprofile_cycles is None else cprofile_cycles,
+            output_dir=profiling_config.get('output_dir', 'logs/profiles')
+        )
+
+    @property
+    def profiling(self):
+        """Vrai pendant un cycle observé par cProfile"""
+        return self._profile is not None
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """Mesure la durée du bloc encadré (attributs libres : app, page, ...)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            thread = threading.current_thread()
+            with self._lock:
+                self._spans.append((name, thread.native_id, thread.name, start, end - start, attrs))
+
+    def begin_cycle(self):
+        self._cycle += 1
+        self._cycle_start = time.perf_counter()
+        if self._cycle <= self.cprofile_cycles:
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def end_cycle(self, **attrs):
+        """Clôture le cycle : écriture de la trace et du profil cProfile éventuel"""
+        end = time.perf_counter()
+
+        if self._profile is not None:
+            self._profile.disable()
+            self._dump_profile(self._profile)
+            self._profile = None
+
+        with self._lock:
+            spans, self._spans = self._spans, []
+        if self.trace_file is None or self._cycle_start is None:
+            return
+
+        try:
+            if self.trace_format == FORMAT_CHROME:
+                self._write_chrome(spans, end, attrs)
+            else:
+                self._write_jsonl(spans, end, attrs)
+        except OSError as e:
+            self.logger.error(f"❌ Écriture de la trace impossible ({self.trace_file}) : {e}")
+
+    def _dump_profile(self, profile):
+        path = self.output_dir / f"cycle-{self._cycle:04d}.pstats"
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(str(path))
+            self.logger.info(f"🧪 Profil cProfile du cycle {self._cycle} : {path} (python -m pstats {path})")
+        except OSError as e:
+            self.logger.error(f"❌ Écriture du profil impossible ({path}) : {e}")
+
+    def _open_trace(self):
+        if self._trace is None:
+            self.trace_file.parent.mkdir(parents=True, exist_ok=True)
+            self._trace = open(self.trace_file, 'a', encoding='utf-8')
+            if self.trace_format == FORMAT_CHROME and self._trace.tell() == 0:
+                # Format JSON array : le "]" final est facultatif pour chrome://tracing et Perfetto
+                self._trace.write("[\n")
+        return self._trace
+
+    def _write_jsonl(self, spans, end, attrs):
+        cycle_start = self._cycle_start
+        totals = {}
+        entries = []
+        for name, _, thread_name, start, duration, span_attrs in spans:
+            totals[name] = totals.get(name, 0.0) + duration
+            entries.append({'name': name, 'thread': thread_name, 'start': round(start - cycle_start, 6),
+                            'duration': round(duration, 6), **span_attrs})
+
+        record = {
+            'cycle': self._cycle,
+            'timestamp': datetime.now().astimezone().isoformat(timespec='seconds'),
+            'duration': round(end - cycle_start, 6),
+            'totals': {name: round(total, 6) for name, total in sorted(totals.items())},
+            'spans': entries,
+            **attrs
+        }
+        trace = self._open_trace()
+        trace.write(json.dumps(record, ensure_ascii=False) + "\n")
+        trace.flush()
+
+    def _write_chrome(self, spans, end, attrs):
+        cycle_thread = threading.current_thread()
+        events = [('cycle', cycle_thread.native_id, cycle_thread.name, self._cycle_start,
+                   end - self._cycle_start, {'cycle': self._cycle, **attrs})] + spans
+
+        lines = []
+        for name, tid, thread_name, start, duration, span_attrs in events:
+            if tid not in self._known_threads:
+                self._known_threads.add(tid)
+                lines.append({'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid,
+                              'args': {'name': thread_name}})
+            lines.append({'name': name, 'ph': 'X', 'pid': self._pid, 'tid': tid,
+                          'ts': round(start * 1_000_000, 1), 'dur': round(duration * 1_000_000, 1),
+                          'args': span_attrs})
+
+        trace = self._open_trace()
+        trace.write("".join(json.dumps(line, ensure_ascii=False) + ",\n" for line in lines))
+        trace.flush()
+
+    def close(self):
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile = None
+        if self._trace is not None:
+            self._trace.close()
+            self._trace = None
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Diagnose Report - Rapport de diagnostic multi-instances (--diagnose)
+Histogrammes de statuts, classes d'erreurs, éléments bloqués les plus anciens et
+latences des requêtes par application, exportables en JSON ou CSV
+"""
+
+import csv
+import io
+import json
+import threading
+import time
+from datetime import datetime
+
+from failure_history import parse_date
+from failure_rules import ACTION_IGNORE
+
+FORMAT_JSON = "json"
+FORMAT_CSV = "csv"
+
+# Nombre de messages d'erreur distincts conservés par application
+MAX_ERROR_MESSAGES = 20
+
+CSV_FIELDS = (
+    'app', 'queue_id', 'title', 'status', 'rule', 'action', 'error_message',
+    'tracked_download_state', 'tracked_download_status', 'added', 'age_hours'
+)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def latency_summary(samples):
+    """Nombre, moyenne, p50, p95 et maximum des latences (secondes)"""
+    values = sorted(samples)
+    if not values:
+        return {'count': 0}
+    return {
+        'count': len(values),
+        'mean': round(sum(values) / len(values), 4),
+        'p50': round(_percentile(values, 0.50), 4),
+        'p95': round(_percentile(values, 0.95), 4),
+        'max': round(values[-1], 4)
+    }
+
+
+def summarize_queue(queue, classify, now=None):
+    """Agrège une queue : statuts, règles et messages d'erreur, éléments en échec du plus ancien au plus récent
+    
+    classify(item) retourne la règle de détection de l'élément (None si aucune) ;
+    les règles d'action ignore ne sont pas comptées comme erreurs.
+    """
+    now = time.time() if now is None else now
+    status_count = {}
+    rule_count = {}
+    message_count = {}
+    error_items = []
+    
+    for item in queue:
+        status = (item.get('status') or 'unknown').lower()
+        status_count[status] = status_count.get(status, 0) + 1
+        
+        rule = classify(item)
+        if rule is None or rule.action == ACTION_IGNORE:
+            continue
+        
+        rule_count[rule.name] = rule_count.get(rule.name, 0) + 1
+        message = item.get('errorMessage') or ''
+        if message:
+            message_count[message] = message_count.get(message, 0) + 1
+        
+        added_at = parse_date(item.get('added'))
+        error_items.append({
+            'queue_id': item.get('id'),
+            'title': item.get('title', item.get('movieTitle', 'Titre inconnu')),
+            'status': item.get('status'),
+            'rule': rule.name,
+            'action': rule.action,
+            'error_message': message,
+            'tracked_download_state': item.get('trackedDownloadState'),
+            'tracked_download_status': item.get('trackedDownloadStatus'),
+            'added': item.get('added'),
+            'age_hours': round((now - added_at) / 3600, 1) if added_at else None
+        })
+    
+    # Les plus anciens d'abord ; éléments sans date d'ajout en fin de liste
+    error_items.sort(key=lambda entry: -entry['age_hours'] if entry['age_hours'] is not None else float('inf'))
+    top_messages = sorted(message_count.items(), key=lambda pair: (-pair[1], pair[0]))[:MAX_ERROR_MESSAGES]
+    
+    return {
+        'total_items': len(queue),
+        'statuses': dict(sorted(status_count.items())),
+        'error_count': len(error_items),
+        'rules': dict(sorted(rule_count.items())),
+        'error_messages': dict(top_messages),
+        'error_items': error_items
+    }
+
+
+class DiagnoseReport:
+    """Résultats de diagnostic par application, sérialisables en JSON ou CSV"""
+    
+    def __init__(self, limit=None):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._applications = {}
+    
+    def add(self, app_name, result):
+        with self._lock:
+            self._applications[app_name] = result
+    
+    def get(self, app_name):
+        with self._lock:
+            return self._applications.get(app_name)
+    
+    @property
+    def total_errors(self):
+        with self._lock:
+            return sum(result.get('error_count', 0) for result in self._applications.values())
+    
+    @property
+    def failed_apps(self):
+        """Applications injoignables ou en erreur pendant le diagnostic"""
+        with self._lock:
+            return sorted(name for name, result in self._applications.items() if result.get('error'))
+    
+    def to_dict(self, duration=None):
+        with self._lock:
+            applications = {}
+            for app_name in sorted(self._applications):
+                result = dict(self._applications[app_name])
+                if self.limit is not None and 'error_items' in result:
+                    result['error_items'] = result['error_items'][:self.limit]
+                applications[app_name] = result
+        
+        report = {
+            'generated_at': datetime.now().astimezone().isoformat(timespec='seconds'),
+            'limit': self.limit,
+            'total_errors': sum(result.get('error_count', 0) for result in applications.values()),
+            'applications': applications
+        }
+        if duration is not None:
+            report['duration_seconds'] = round(duration, 3)
+        return report
+    
+    def to_csv(self):
+        """Une ligne par élément en échec (les agrégats restent dans le rapport JSON)"""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for app_name, result in self.to_dict()['applications'].items():
+            for entry in result.get('error_items', []):
+                writer.writerow({'app': app_name, **entry})
+        return buffer.getvalue()
+    
+    def render(self, report_format=FORMAT_JSON, duration=None):
+        if report_format == FORMAT_CSV:
+            return self.to_csv()
+        return json.dumps(self.to_dict(duration), indent=2, ensure_ascii=False) + "\n"
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Docker Discovery - Détection des instances Sonarr/Radarr via l'API Docker Engine
+Interroge directement /var/run/docker.sock (aucun processus docker lancé)
+"""
+
+import http.client
+import io
+import json
+import logging
+import os
+import re
+import socket
+import tarfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from urllib.parse import quote
+
+
+DEFAULT_SOCKET = "/var/run/docker.sock"
+
+# Motifs (regex) testés sur le nom et l'image des conteneurs, port interne par défaut
+DEFAULT_PATTERNS = {
+    'sonarr': [r'sonarr'],
+    'radarr': [r'radarr'],
+}
+DEFAULT_PORTS = {'sonarr': 8989, 'radarr': 7878}
+
+
+class DockerAPIError(Exception):
+    """Erreur de communication avec l'API Docker Engine"""
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """Connexion HTTP sur un socket Unix"""
+    
+    def __init__(self, socket_path, timeout=5):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+    
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class DockerClient:
+    """Client minimal de l'API Docker Engine (liste des conteneurs, lecture de fichier)"""
+    
+    def __init__(self, socket_path=DEFAULT_SOCKET, timeout=5):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._connection = None
+    
+    def _request(self, path):
+        if self._connection is None:
+            self._connection = _UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+        try:
+            self._connection.request('GET', path, headers={'Host': 'docker'})
+            response = self._connection.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            self.close()
+            raise DockerAPIError(f"{path} : {e}") from e
+        
+        if response.status != 200:
+            raise DockerAPIError(f"{path} : HTTP {response.status}")
+        return body
+    
+    def list_containers(self):
+        """Conteneurs en cours d'exécution (GET /containers/json)"""
+        return json.loads(self._request('/containers/json'))
+    
+    def read_file(self, container_id, path):
+        """Contenu d'un fichier du conteneur via l'archive tar (GET /containers/{id}/archive)"""
+        body = self._request(f'/containers/{quote(container_id)}/archive?path={quote(path)}')
+        with tarfile.open(fileobj=io.BytesIO(body)) as archive:
+            for member in archive:
+                if member.isfile():
+                    return archive.extractfile(member).read().decode('utf-8', errors='replace')
+        return None
+    
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def parse_arr_config(xml_text):
+    """Extrait ApiKey, Port et UrlBase d'un config.xml Sonarr/Radarr"""
+    try:
+        root = ET.fromstring(xml_text)
+    except ET.ParseError:
+        return {}
+    
+    values = {}
+    api_key = (root.findtext('ApiKey') or '').strip()
+    if api_key:
+        values['api_key'] = api_key
+    port = (root.findtext('Port') or '').strip()
+    if port.isdigit():
+        values['port'] = int(port)
+    url_base = (root.findtext('UrlBase') or '').strip().strip('/')
+    if url_base:
+        values['url_base'] = f"/{url_base}"
+    return values
+
+
+class DockerDiscovery:
+    """Détection de toutes les instances Sonarr/Radarr : un appel de liste puis lecture de config.xml"""
+    
+    def __init__(self, socket_path=DEFAULT_SOCKET, patterns=None, docker_network="traefik_proxy",
+                 settings_storage=None, user=None, client=None):
+        self.client = client or DockerClient(socket_path)
+        self.docker_network = docker_network
+        self.settings_storage = settings_storage if settings_storage is not None else os.environ.get('SETTINGS_STORAGE')
+        self.user = user or os.environ.get('USER', '')
+        self.logger = logging.getLogger(__name__)
+        
+        self._patterns = {
+            app_type: [re.compile(pattern, re.IGNORECASE) for pattern in app_patterns]
+            for app_type, app_patterns in (patterns or DEFAULT_PATTERNS).items()
+        }
+    
+    def _app_type(self, container):
+        """Type d'application (sonarr/radarr) d'un conteneur, d'après son nom ou son image"""
+        candidates = [name.lstrip('/') for name in container.get('Names', [])]
+        candidates.append(container.get('Image', ''))
+        for app_type, patterns in self._patterns.items():
+            if any(pattern.search(candidate) for pattern in patterns for candidate in candidates):
+                return app_type
+        return None
+    
+    def _container_host(self, container, internal_port):
+        """Hôte et port joignables : réseau préféré, première IP disponible, puis port publié"""
+        networks = (container.get('NetworkSettings') or {}).get('Networks') or {}
+        
+        ip_address = (networks.get(self.docker_network) or {}).get('IPAddress')
+        if not ip_address:
+            ip_address = next((net.get('IPAddress') for net in networks.values() if net.get('IPAddress')), None)
+        if ip_address:
+            return ip_address, internal_port
+        
+        for port in container.get('Ports') or []:
+            if port.get('PrivatePort') == internal_port and port.get('PublicPort'):
+                return 'localhost', port['PublicPort']
+        return None, None
+    
+    def _read_config(self, container, app_type):
+        """config.xml : montage /config lisible depuis l'hôte, archive du conteneur, puis chemins standards"""
+        candidates = []
+        for mount in container.get('Mounts') or []:
+            if mount.get('Destination') == '/config' and mount.get('Source'):
+                candidates.append(Path(mount['Source']) / 'config.xml')
+        
+        for path in candidates:
+            try:
+                return parse_arr_config(path.read_text(encoding='utf-8'))
+            except OSError:
+                continue
+        
+        try:
+            xml_text = self.client.read_file(container['Id'], '/config/config.xml')
+            if xml_text:
+                return parse_arr_config(xml_text)
+        except (DockerAPIError, tarfile.TarError, KeyError) as e:
+            self.logger.debug(f"🐳 Lecture config.xml impossible dans le conteneur : {e}")
+        
+        fallbacks = [Path(f"/home/{self.user}") / ".config" / app_type.capitalize() / "config.xml"]
+        if self.settings_storage:
+            fallbacks.insert(0, Path(self.settings_storage) / "docker" / self.user / app_type / "config" / "config.xml")
+        for path in fallbacks:
+            try:
+                return parse_arr_config(path.read_text(encoding='utf-8'))
+            except OSError:
+                continue
+        return {}
+    
+    def discover(self):
+        """Retourne {nom_application: {'type': ..., 'url': ..., 'api_key': ...}} pour chaque instance détectée
+        
+        Une instance unique d'un type garde le nom du type (sonarr/radarr) ; avec
+        plusieurs instances, chacune est nommée d'après son conteneur et seul
+        'type' indique s'il s'agit d'un Sonarr ou d'un Radarr.
+        """
+        try:
+            containers = self.client.list_containers()
+        except (DockerAPIError, ValueError) as e:
+            self.logger.debug(f"🐳 API Docker indisponible : {e}")
+            return {}
+        
+        instances = {}
+        for container in sorted(containers, key=lambda c: (c.get('Names') or [''])[0]):
+            app_type = self._app_type(container)
+            if app_type:
+                instances.setdefault(app_type, []).append(container)
+        
+        discovered = {}
+        try:
+            for app_type, app_containers in instances.items():
+                for container in app_containers:
+                    settings = self._read_config(container, app_type)
+                    internal_port = settings.get('port', DEFAULT_PORTS.get(app_type))
+                    host, port = self._container_host(container, internal_port)
+                    if not host or not settings.get('api_key'):
+                        continue
+                    
+                    container_name = (container.get('Names') or [''])[0].lstrip('/')
+                    app_name = app_type if len(app_containers) == 1 else container_name
+                    discovered[app_name] = {
+                        'type': app_type,
+                        'url': f"http://{host}:{port}{settings.get('url_base', '')}",
+                        'api_key': settings['api_key']
+                    }
+        finally:
+            self.client.close()
+        
+        return discovered
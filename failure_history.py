@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Failure History - Comptage des échecs de téléchargement issus de l'historique Sonarr/Radarr
+Marque haute (dernier id d'historique traité) persistée pour une lecture incrémentale
+"""
+
+import json
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+
+from atomic_file import write_json_atomic
+
+EVENT_DOWNLOAD_FAILED = "downloadFailed"
+
+# Version du format persisté (les compteurs d'un format antérieur sont ignorés)
+FORMAT_VERSION = 2
+
+
+def media_key(record):
+    """Clé de regroupement d'un enregistrement (queue ou historique) : épisode ou film
+    
+    Sonarr écrit une ligne d'historique par épisode : une saison complète en
+    échec ne compte qu'une fois pour chacun de ses épisodes.
+    """
+    if record.get('episodeId'):
+        return f"episode:{record['episodeId']}"
+    if record.get('movieId'):
+        return f"movie:{record['movieId']}"
+    return None
+
+
+def parse_date(value):
+    """Date ISO 8601 de l'API (suffixe Z accepté) en timestamp, None si illisible"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class FailureHistory:
+    """Releases en échec par épisode/film sur une fenêtre glissante, avec marque haute persistée
+    
+    Les échecs sont indexés par downloadId : un compteur indique combien de
+    releases distinctes ont échoué pour un même élément, et ré-enregistrer une
+    page déjà vue (après un échec de pagination) ne le fausse pas.
+    """
+    
+    def __init__(self, path=None, window=86400, clock=time.time):
+        self.path = Path(path) if path else None
+        self.window = window
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+        self.last_id = None
+        self._failures = {}
+        self._dirty = False
+        self.load()
+    
+    def record(self, record):
+        """Comptabilise un enregistrement d'historique s'il s'agit d'un échec récent"""
+        if record.get('eventType') != EVENT_DOWNLOAD_FAILED:
+            return False
+        
+        key = media_key(record)
+        timestamp = parse_date(record.get('date'))
+        if key is None or record.get('id') is None or timestamp is None:
+            return False
+        if timestamp < self.clock() - self.window:
+            return False
+        
+        # Sans downloadId (anciennes entrées), chaque ligne d'historique compte pour une release
+        download_id = str(record.get('downloadId') or f"history:{record['id']}").lower()
+        events = self._failures.setdefault(key, {})
+        if timestamp > events.get(download_id, 0):
+            events[download_id] = timestamp
+            self._dirty = True
+        return True
+    
+    def commit(self, last_id):
+        """Avance la marque haute après une lecture complète, purge la fenêtre et sauvegarde"""
+        if last_id is not None and (self.last_id is None or last_id > self.last_id):
+            self.last_id = last_id
+            self._dirty = True
+        self.prune()
+        if self._dirty:
+            self.save()
+            self._dirty = False
+    
+    def prune(self):
+        """Évince les échecs sortis de la fenêtre"""
+        cutoff = self.clock() - self.window
+        for key in list(self._failures):
+            events = {download_id: ts for download_id, ts in self._failures[key].items() if ts >= cutoff}
+            if len(events) == len(self._failures[key]):
+                continue
+            if events:
+                self._failures[key] = events
+            else:
+                del self._failures[key]
+            self._dirty = True
+    
+    def count(self, key):
+        """Nombre de releases distinctes en échec pour un épisode/un film dans la fenêtre"""
+        return len(self._failures.get(key, ()))
+    
+    def load(self):
+        """Charge la marque haute et les échecs depuis le disque"""
+        if not self.path or not self.path.exists():
+            return
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.last_id = data.get('last_id')
+            if data.get('version') != FORMAT_VERSION:
+                # Compteurs par série d'un format antérieur : non réutilisables
+                self._failures = {}
+                return
+            self._failures = {
+                key: {str(download_id): float(ts) for download_id, ts in events.items()}
+                for key, events in data.get('failures', {}).items()
+            }
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            self.logger.warning(f"⚠️ Historique d'échecs illisible, réinitialisation : {e}")
+            self.last_id = None
+            self._failures = {}
+    
+    def save(self):
+        """Sauvegarde atomique sur le disque"""
+        if not self.path:
+            return
+        
+        try:
+            write_json_atomic(self.path, {'version': FORMAT_VERSION, 'last_id': self.last_id, 'failures': self._failures})
+        except OSError as e:
+            self.logger.warning(f"⚠️ Impossible d'enregistrer l'historique d'échecs : {e}")
+    
+    def __len__(self):
+        return len(self._failures)
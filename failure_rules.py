@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Failure Rules - Classification des éléments de queue Sonarr/Radarr en échec
+Règles déclarées en YAML, compilées une fois en table de dispatch indexée par statut
+"""
+
+import hashlib
+import json
+import re
+
+ACTION_BLOCKLIST_SEARCH = "blocklist_search"   # Blocklist + suppression + nouvelle recherche
+ACTION_REMOVE = "remove"                       # Suppression simple de la queue
+ACTION_IGNORE = "ignore"                       # Reconnu mais laissé en place
+
+ACTIONS = (ACTION_BLOCKLIST_SEARCH, ACTION_REMOVE, ACTION_IGNORE)
+
+# Règle historique : UNIQUEMENT l'erreur qBittorrent spécifique
+DEFAULT_RULES = [
+    {
+        'name': 'qbittorrent_error',
+        'error_message': 'qBittorrent is reporting an error',
+        'action': ACTION_BLOCKLIST_SEARCH,
+    },
+]
+
+
+def _as_set(value):
+    if value is None:
+        return None
+    values = value if isinstance(value, (list, tuple)) else [value]
+    return frozenset(str(v).lower() for v in values)
+
+
+def _status_messages_text(item):
+    """Concatène titres et messages de statusMessages pour une recherche regex unique"""
+    parts = []
+    for entry in item.get('statusMessages') or ():
+        if isinstance(entry, dict):
+            if entry.get('title'):
+                parts.append(entry['title'])
+            parts.extend(entry.get('messages') or ())
+        elif entry:
+            parts.append(str(entry))
+    return "\n".join(parts)
+
+
+class FailureRule:
+    """Règle compilée : tous les critères présents doivent correspondre"""
+    
+    __slots__ = ('name', 'action', 'statuses', 'tracked_states', 'tracked_statuses',
+                 'error_regex', 'status_messages_regex')
+    
+    def __init__(self, name, action=ACTION_BLOCKLIST_SEARCH, status=None, tracked_download_state=None,
+                 tracked_download_status=None, error_message=None, status_messages=None):
+        if action not in ACTIONS:
+            raise ValueError(f"règle '{name}' : action inconnue '{action}' (attendu : {', '.join(ACTIONS)})")
+        if not any((status, tracked_download_state, tracked_download_status, error_message, status_messages)):
+            raise ValueError(f"règle '{name}' : au moins un critère est requis")
+        
+        self.name = name
+        self.action = action
+        self.statuses = _as_set(status)
+        self.tracked_states = _as_set(tracked_download_state)
+        self.tracked_statuses = _as_set(tracked_download_status)
+        try:
+            self.error_regex = re.compile(error_message) if error_message else None
+            self.status_messages_regex = re.compile(status_messages) if status_messages else None
+        except re.error as e:
+            raise ValueError(f"règle '{name}' : expression régulière invalide : {e}") from e
+    
+    def signature(self):
+        """Description stable de la règle (empreinte du jeu de règles)"""
+        return [
+            self.name, self.action,
+            sorted(self.statuses or ()), sorted(self.tracked_states or ()), sorted(self.tracked_statuses or ()),
+            self.error_regex.pattern if self.error_regex else None,
+            self.status_messages_regex.pattern if self.status_messages_regex else None
+        ]
+    
+    def matches(self, item):
+        """Vérifie les critères hors statut (déjà résolu par l'index)"""
+        if self.tracked_states is not None and \
+                str(item.get('trackedDownloadState') or '').lower() not in self.tracked_states:
+            return False
+        if self.tracked_statuses is not None and \
+                str(item.get('trackedDownloadStatus') or '').lower() not in self.tracked_statuses:
+            return False
+        if self.error_regex is not None:
+            error_message = item.get('errorMessage')
+            if not error_message or not self.error_regex.search(error_message):
+                return False
+        if self.status_messages_regex is not None:
+            text = _status_messages_text(item)
+            if not text or not self.status_messages_regex.search(text):
+                return False
+        return True
+
+
+class FailureClassifier:
+    """Table de dispatch : statut -> règles candidates, dans l'ordre de déclaration"""
+    
+    def __init__(self, rules, stall_rule=None):
+        self.rules = list(rules)
+        self.stall_rule = stall_rule
+        
+        wildcard = [rule for rule in self.rules if rule.statuses is None]
+        indexed_statuses = {status for rule in self.rules if rule.statuses for status in rule.statuses}
+        self._wildcard = tuple(wildcard)
+        self._by_status = {
+            status: tuple(rule for rule in self.rules if rule.statuses is None or status in rule.statuses)
+            for status in indexed_statuses
+        }
+        
+        # Empreinte des règles compilées : invalide les caches de queue si elles changent
+        signatures = [rule.signature() for rule in self.rules]
+        signatures.append(stall_rule.signature() if stall_rule is not None else None)
+        self.digest = hashlib.sha1(json.dumps(signatures).encode('utf-8')).hexdigest()[:16]
+    
+    @classmethod
+    def from_config(cls, config):
+        """Compile detection.rules (ou la règle qBittorrent historique par défaut)"""
+        rule_configs = config.get('detection', {}).get('rules') or DEFAULT_RULES
+        rules = []
+        for index, rule_config in enumerate(rule_configs, 1):
+            rule_config = dict(rule_config)
+            if not rule_config.pop('enabled', True):
+                continue
+            name = rule_config.pop('name', f"rule_{index}")
+            try:
+                rules.append(FailureRule(name, **rule_config))
+            except TypeError as e:
+                raise ValueError(f"règle '{name}' : {e}") from e
+        
+        # Téléchargements sans progression (detection.stall), limités aux statuts suivis
+        stall_config = config.get('detection', {}).get('stall', {})
+        stall_rule = None
+        if stall_config.get('enabled', False):
+            stall_rule = FailureRule('stalled', stall_config.get('action', ACTION_BLOCKLIST_SEARCH),
+                                     status=stall_config.get('statuses', ['downloading']))
+        return cls(rules, stall_rule)
+    
+    def classify(self, item):
+        """Première règle correspondant à l'élément, ou None"""
+        status = str(item.get('status') or '').lower()
+        for rule in self._by_status.get(status, self._wildcard):
+            if rule.matches(item):
+                return rule
+        return None
@@ -160,10 +160,13 @@ if [ -f "$SOURCE_DIR/arr-launcher.sh" ]; then
     echo "✅ arr-launcher.sh copié"
 fi
 
-if [ -f "$SOURCE_DIR/update_checker.py" ]; then
-    cp "$SOURCE_DIR/update_checker.py" ./
-    echo "✅ update_checker.py copié"
-fi
+# Modules Python complémentaires (update_checker.py, queue_cache.py, ...)
+for module_file in "$SOURCE_DIR"/*.py; do
+    module_name=$(basename "$module_file")
+    [ "$module_name" = "arr-monitor.py" ] && continue
+    cp "$module_file" ./
+    echo "✅ $module_name copié"
+done
 
 if [ -f "$SOURCE_DIR/.version" ]; then
     cp "$SOURCE_DIR/.version" ./
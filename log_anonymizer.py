@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Log Anonymizer - Anonymisation des données sensibles dans les logs
+Motifs combinés en une seule expression compilée, appliquée une fois par enregistrement
+"""
+
+import logging
+import re
+
+# Préfiltre : une chaîne sans chiffre, sans '@' et sans '/home/' ne contient rien à masquer
+_PREFILTER = re.compile(r'[0-9@]|/home/')
+
+# (nom du groupe, motif, clé de configuration privacy)
+_PATTERNS = (
+    ('ip', r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b', 'hide_ip_addresses'),
+    ('user', r'/home/[^/\s]+', 'hide_usernames'),
+    ('host', r'@[a-zA-Z0-9.-]+', 'hide_hostnames'),
+    ('apikey', r'(?P<apikey_prefix>[a-zA-Z0-9]{4})[a-zA-Z0-9]{20,}', None),
+)
+
+_REPLACEMENTS = {
+    'ip': lambda match: 'xxx.xxx.xxx.xxx',
+    'user': lambda match: '/home/[USER]',
+    'host': lambda match: '@[HOSTNAME]',
+    # Les clés API sont partiellement conservées (4 premiers caractères)
+    'apikey': lambda match: f"{match.group('apikey_prefix')}***",
+}
+
+
+class LogAnonymizer:
+    """Anonymiseur mono-passe : IPs, noms d'utilisateur, hostnames et clés API"""
+    
+    def __init__(self, enabled=True, hide_ip_addresses=True, hide_usernames=True, hide_hostnames=True):
+        flags = {
+            'hide_ip_addresses': hide_ip_addresses,
+            'hide_usernames': hide_usernames,
+            'hide_hostnames': hide_hostnames,
+        }
+        active = [(name, pattern) for name, pattern, flag in _PATTERNS if flag is None or flags[flag]]
+        self.enabled = enabled and bool(active)
+        self._regex = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in active)) if active else None
+    
+    @classmethod
+    def from_config(cls, config):
+        """Construit l'anonymiseur depuis la section privacy de la configuration"""
+        privacy_config = config.get('privacy', {})
+        return cls(
+            enabled=privacy_config.get('anonymize_logs', True),
+            hide_ip_addresses=privacy_config.get('hide_ip_addresses', True),
+            hide_usernames=privacy_config.get('hide_usernames', True),
+            hide_hostnames=privacy_config.get('hide_hostnames', True)
+        )
+    
+    def _replace(self, match):
+        return _REPLACEMENTS[match.lastgroup](match)
+    
+    def anonymize(self, text):
+        """Anonymise une chaîne (retournée telle quelle si rien à masquer)"""
+        if not self.enabled or not isinstance(text, str) or not _PREFILTER.search(text):
+            return text
+        return self._regex.sub(self._replace, text)
+
+
+class AnonymizingFilter(logging.Filter):
+    """Filtre logging : anonymise chaque enregistrement une seule fois, au moment de l'émission"""
+    
+    def __init__(self, anonymizer):
+        super().__init__()
+        self.anonymizer = anonymizer
+    
+    def filter(self, record):
+        if self.anonymizer.enabled and not getattr(record, 'anonymized', False):
+            message = record.getMessage()
+            record.msg = self.anonymizer.anonymize(message)
+            record.args = None
+            record.anonymized = True
+        return True
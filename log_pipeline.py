@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Log Pipeline - Journalisation non bloquante pour Arr Monitor
+Les enregistrements passent par une file (QueueHandler) ; un thread dédié (QueueListener)
+écrit sur la console, dans un fichier à rotation par taille et optionnellement en JSON lines
+"""
+
+import atexit
+import json
+import logging
+import queue
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Un objet JSON par ligne : horodatage, niveau, logger, thread, message"""
+    
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class QueuedLogging:
+    """Pipeline QueueHandler -> QueueListener -> handlers (console, fichier, JSON lines)"""
+    
+    def __init__(self, log_file, max_size_mb=10, backup_count=5, json_file=None, filters=()):
+        max_bytes = int(max_size_mb * 1024 * 1024)
+        formatter = logging.Formatter(LOG_FORMAT)
+        
+        handlers = [
+            self._rotating_handler(log_file, max_bytes, backup_count, formatter),
+            logging.StreamHandler()
+        ]
+        handlers[1].setFormatter(formatter)
+        if json_file:
+            handlers.append(self._rotating_handler(json_file, max_bytes, backup_count, JsonLinesFormatter()))
+        
+        # Les filtres (anonymisation) s'exécutent dans le thread d'écriture, hors du chemin critique
+        for handler in handlers:
+            for log_filter in filters:
+                handler.addFilter(log_filter)
+        
+        self.handlers = handlers
+        self.queue = queue.SimpleQueue()
+        self.queue_handler = QueueHandler(self.queue)
+        # Le message est figé (arguments fusionnés) avant la mise en file ; la mise en forme
+        # finale (horodatage, niveau) est faite par les handlers du listener
+        self.queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self._started = False
+    
+    @staticmethod
+    def _rotating_handler(path, max_bytes, backup_count, formatter):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        handler.setFormatter(formatter)
+        return handler
+    
+    def start(self):
+        if not self._started:
+            self.listener.start()
+            self._started = True
+            atexit.register(self.stop)
+    
+    def stop(self):
+        """Vide la file et ferme les handlers"""
+        if self._started:
+            self._started = False
+            self.listener.stop()
+            for handler in self.handlers:
+                handler.close()
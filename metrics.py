@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Metrics - Exposition des métriques Arr Monitor au format texte Prometheus
+Compteurs, jauges et histogrammes étiquetés, servis sur /metrics sans dépendance externe
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Famille de métriques étiquetées"""
+    
+    metric_type = None
+    
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+    
+    def remove_matching(self, **labels):
+        """Supprime les séries dont les étiquettes correspondent (ex. statuts disparus d'une application)"""
+        indexes = [(self.labelnames.index(name), str(value)) for name, value in labels.items()]
+        with self._lock:
+            for key in [k for k in self._values if all(k[i] == v for i, v in indexes)]:
+                del self._values[key]
+    
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._sample_lines(key, value))
+        return lines
+    
+    def _sample_lines(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+    
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    metric_type = "gauge"
+    
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+    
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+    
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+    
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = state[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+    
+    def totals(self):
+        """Nombre d'observations et somme par série : {labels: (count, sum)}"""
+        with self._lock:
+            return {key: (state[2], state[1]) for key, state in self._values.items()}
+    
+    @contextmanager
+    def time(self, **labels):
+        """Mesure la durée du bloc encadré"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+    
+    def _sample_lines(self, key, value):
+        counts, total, count = value
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MonitorMetrics:
+    """Métriques de surveillance Arr Monitor"""
+    
+    def __init__(self):
+        self.request_duration = Histogram(
+            "arr_monitor_request_duration_seconds",
+            "Durée des appels API par application et par phase",
+            ("app", "phase"))
+        self.http_responses = Counter(
+            "arr_monitor_http_responses_total",
+            "Réponses HTTP reçues par application et code de statut",
+            ("app", "code"))
+        self.failed_items = Counter(
+            "arr_monitor_failed_items_total",
+            "Éléments de queue détectés en échec",
+            ("app",))
+        self.remediations = Counter(
+            "arr_monitor_remediations_total",
+            "Remédiations (blocklist + suppression) par résultat",
+            ("app", "result"))
+        self.queue_items = Gauge(
+            "arr_monitor_queue_items",
+            "Éléments en queue par statut",
+            ("app", "status"))
+        self.cycle_duration = Gauge(
+            "arr_monitor_cycle_duration_seconds",
+            "Durée du dernier cycle de surveillance")
+        self.webhook_events = Counter(
+            "arr_monitor_webhook_events_total",
+            "Événements webhook reçus par application et type",
+            ("app", "event"))
+        self.last_cycle = Gauge(
+            "arr_monitor_last_cycle_timestamp_seconds",
+            "Horodatage de fin du dernier cycle")
+    
+    def set_queue_status(self, app_name, status_count):
+        """Remplace la répartition par statut de la queue d'une application"""
+        self.queue_items.remove_matching(app=app_name)
+        for status, count in status_count.items():
+            self.queue_items.set(count, app=app_name, status=status)
+    
+    def render(self):
+        lines = []
+        for metric in vars(self).values():
+            if isinstance(metric, _Metric):
+                lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serveur HTTP exposant /metrics dans un thread dédié"""
+    
+    def __init__(self, metrics, host="0.0.0.0", port=9310):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.logger = logging.getLogger(__name__)
+        self._server = None
+    
+    def start(self):
+        # Import différé : serveur HTTP chargé uniquement s'il est activé
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        
+        metrics = self.metrics
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True).start()
+        self.logger.info(f"📈 Métriques Prometheus disponibles sur http://{self.host}:{self.port}/metrics")
+    
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Progress Tracker - Suivi de la progression des téléchargements entre les cycles
+Échantillons (sizeleft, timestamp) en tampon circulaire de taille fixe par élément
+"""
+
+import time
+from array import array
+
+DEFAULT_SAMPLES = 12
+
+_SIZE_UNITS = ("o", "Ko", "Mo", "Go", "To")
+
+
+def format_size(num_bytes):
+    """Taille lisible en unités binaires françaises (1.5 Go)"""
+    value = float(num_bytes)
+    for unit in _SIZE_UNITS[:-1]:
+        if abs(value) < 1024:
+            return f"{value:.0f} {unit}" if unit == "o" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} {_SIZE_UNITS[-1]}"
+
+
+class ProgressSeries:
+    """Tampon circulaire d'échantillons (sizeleft, timestamp) d'un élément"""
+    
+    __slots__ = ('sizes', 'times', 'head', 'count', 'last_progress_at', 'flagged')
+    
+    def __init__(self, capacity):
+        self.sizes = array('d', bytes(8 * capacity))
+        self.times = array('d', bytes(8 * capacity))
+        self.head = 0
+        self.count = 0
+        self.last_progress_at = None
+        self.flagged = False
+    
+    @property
+    def capacity(self):
+        return len(self.sizes)
+    
+    def add(self, sizeleft, timestamp):
+        if self.count:
+            previous = self.sizes[(self.head - 1) % self.capacity]
+            if sizeleft < previous:
+                self.last_progress_at = timestamp
+                self.flagged = False
+        else:
+            self.last_progress_at = timestamp
+        
+        self.sizes[self.head] = sizeleft
+        self.times[self.head] = timestamp
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+    
+    def newest(self):
+        index = (self.head - 1) % self.capacity
+        return self.sizes[index], self.times[index]
+    
+    def oldest(self):
+        index = (self.head - self.count) % self.capacity
+        return self.sizes[index], self.times[index]
+    
+    def span(self):
+        """Durée couverte par les échantillons conservés (secondes)"""
+        if self.count < 2:
+            return 0.0
+        return self.newest()[1] - self.oldest()[1]
+    
+    def throughput(self):
+        """Débit moyen en octets/s sur la fenêtre d'échantillons (None si insuffisant)"""
+        if self.count < 2:
+            return None
+        old_size, old_time = self.oldest()
+        new_size, new_time = self.newest()
+        elapsed = new_time - old_time
+        if elapsed <= 0:
+            return None
+        return max(old_size - new_size, 0.0) / elapsed
+    
+    def eta(self):
+        """Temps restant estimé en secondes (None si aucun débit mesurable)"""
+        rate = self.throughput()
+        if not rate:
+            return None
+        return self.newest()[0] / rate
+
+
+class ProgressTracker:
+    """Détecte les téléchargements sans progression au-delà d'une fenêtre configurable
+    
+    La mémoire reste bornée : capacité fixe par élément et éviction des éléments
+    qui ne sont plus observés dans la queue. Un élément bloqué n'est signalé
+    qu'une fois, jusqu'à une reprise de progression ou un appel à release().
+    """
+    
+    def __init__(self, window=3600, samples=DEFAULT_SAMPLES, clock=time.time):
+        self.window = window
+        self.samples = max(int(samples), 2)
+        self.clock = clock
+        self._series = {}
+    
+    def __len__(self):
+        return len(self._series)
+    
+    def observe(self, items, now=None):
+        """Enregistre un échantillon par élément et évince ceux qui ont disparu
+        
+        Retourne les éléments sans progression depuis au moins `window` secondes
+        qui n'ont pas déjà été signalés.
+        """
+        now = self.clock() if now is None else now
+        stalled = []
+        seen = set()
+        
+        for item in items:
+            item_id = item.get('id')
+            sizeleft = item.get('sizeleft')
+            if item_id is None or sizeleft is None:
+                continue
+            
+            seen.add(item_id)
+            series = self._series.get(item_id)
+            if series is None:
+                series = self._series[item_id] = ProgressSeries(self.samples)
+            series.add(float(sizeleft), now)
+            
+            if sizeleft > 0 and not series.flagged and now - series.last_progress_at >= self.window:
+                series.flagged = True
+                stalled.append(item)
+        
+        for item_id in self._series.keys() - seen:
+            del self._series[item_id]
+        
+        return stalled
+    
+    def get(self, item_id):
+        return self._series.get(item_id)
+    
+    def release(self, item_id):
+        """Signalera de nouveau l'élément au prochain observe() s'il est toujours bloqué (remédiation reportée ou échouée)"""
+        series = self._series.get(item_id)
+        if series is not None:
+            series.flagged = False
+    
+    def total_throughput(self):
+        """Débit cumulé (octets/s) des éléments suivis ayant un débit mesurable"""
+        return sum(rate for rate in (series.throughput() for series in self._series.values()) if rate)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Queue Cache - État persistant des éléments de queue Sonarr/Radarr
+Permet une analyse incrémentale : seuls les éléments nouveaux ou modifiés sont réévalués
+"""
+
+import json
+import logging
+import zlib
+from pathlib import Path
+
+from atomic_file import write_json_atomic
+
+
+class QueueDiff:
+    """Résultat de la comparaison d'une queue avec l'état du cycle précédent"""
+    
+    __slots__ = ('new', 'changed', 'unchanged', 'gone', 'states')
+    
+    def __init__(self):
+        self.new = []
+        self.changed = []
+        self.unchanged = []
+        self.gone = []
+        self.states = {}
+    
+    @property
+    def delta(self):
+        """Éléments à réévaluer (nouveaux et modifiés)"""
+        return self.new + self.changed
+    
+    def forget(self, item_id):
+        """Retire un élément de l'état à enregistrer (il sera réévalué au prochain cycle)"""
+        self.states.pop(item_id, None)
+    
+    def summary(self):
+        return {
+            'new': len(self.new),
+            'changed': len(self.changed),
+            'unchanged': len(self.unchanged),
+            'gone': len(self.gone)
+        }
+
+
+class QueueStateCache:
+    """Cache mémoire + disque des empreintes des éléments de queue, indexé par id"""
+    
+    def __init__(self, path=None, rules_digest=None):
+        self.path = Path(path) if path else None
+        self.rules_digest = rules_digest
+        self.logger = logging.getLogger(__name__)
+        self._states = {}
+        self.load()
+    
+    @staticmethod
+    def _crc(text):
+        return zlib.crc32(text.encode('utf-8')) if text else 0
+    
+    @classmethod
+    def fingerprint(cls, item):
+        """Empreinte compacte des champs lus par les règles de détection
+        
+        (status, trackedDownloadState, trackedDownloadStatus, crc32(errorMessage),
+        crc32(statusMessages), sizeleft)
+        """
+        status_messages = item.get('statusMessages')
+        return (
+            item.get('status'),
+            item.get('trackedDownloadState'),
+            item.get('trackedDownloadStatus'),
+            cls._crc(item.get('errorMessage') or ''),
+            cls._crc(json.dumps(status_messages, sort_keys=True, ensure_ascii=False)) if status_messages else 0,
+            item.get('sizeleft')
+        )
+    
+    def diff(self, queue):
+        """Classe les éléments de la queue en nouveaux, modifiés, inchangés ou disparus"""
+        result = QueueDiff()
+        states = result.states
+        
+        for item in queue:
+            item_id = item.get('id')
+            fingerprint = self.fingerprint(item)
+            
+            if item_id is None:
+                # Élément non suivi : toujours réévalué
+                result.new.append(item)
+                continue
+            
+            states[item_id] = fingerprint
+            previous = self._states.get(item_id)
+            
+            if previous is None:
+                result.new.append(item)
+            elif previous != fingerprint:
+                result.changed.append(item)
+            else:
+                result.unchanged.append(item)
+        
+        result.gone = [item_id for item_id in self._states if item_id not in states]
+        return result
+    
+    def commit(self, diff):
+        """Enregistre l'état issu d'un diff (les éléments disparus sont évincés)"""
+        if diff.states == self._states:
+            return
+        
+        self._states = dict(diff.states)
+        self.save()
+    
+    def load(self):
+        """Charge l'état depuis le disque (ignoré s'il a été calculé avec d'autres règles)"""
+        if not self.path or not self.path.exists():
+            return
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('rules') != self.rules_digest:
+                self.logger.info(f"🧹 Règles de détection modifiées, cache de queue réinitialisé ({self.path.name})")
+                self.clear()
+                return
+            self._states = {int(item_id): tuple(fingerprint) for item_id, fingerprint in data['states'].items()}
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+            self.logger.warning(f"⚠️ Cache de queue illisible, réinitialisation : {e}")
+            self._states = {}
+    
+    def clear(self):
+        """Vide le cache en mémoire et sur le disque : tous les éléments seront réévalués"""
+        self._states = {}
+        if self.path:
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning(f"⚠️ Impossible de supprimer le cache de queue : {e}")
+    
+    def save(self):
+        """Sauvegarde atomique de l'état sur le disque"""
+        if not self.path:
+            return
+        
+        try:
+            write_json_atomic(self.path, {
+                'rules': self.rules_digest,
+                'states': {str(item_id): list(fingerprint) for item_id, fingerprint in self._states.items()}
+            })
+        except OSError as e:
+            self.logger.warning(f"⚠️ Impossible d'enregistrer le cache de queue : {e}")
+    
+    def __len__(self):
+        return len(self._states)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Queue Record - Projection compacte des éléments de queue Sonarr/Radarr
+Seuls les champs lus par le moniteur sont conservés (objets series/movie/episode ignorés),
+avec un parsing en flux optionnel via ijson
+"""
+
+from importlib.util import find_spec
+
+from urllib3.exceptions import HTTPError as Urllib3Error
+
+# Dépendance optionnelle (monitoring.queue_parser: stream), importée à la première utilisation
+STREAMING_AVAILABLE = find_spec('ijson') is not None
+
+QUEUE_FIELDS = (
+    'id', 'title', 'movieTitle', 'status', 'errorMessage',
+    'trackedDownloadState', 'trackedDownloadStatus', 'statusMessages',
+    'downloadId', 'episodeId', 'seriesId', 'movieId', 'sizeleft', 'added'
+)
+_QUEUE_FIELD_SET = frozenset(QUEUE_FIELDS)
+
+PARSER_FULL = "full"       # Dictionnaires complets (comportement historique)
+PARSER_LEAN = "lean"       # json puis projection page par page
+PARSER_STREAM = "stream"   # Projection pendant le parsing (ijson)
+
+
+class QueueParseError(ValueError):
+    """Page de queue illisible ou interrompue pendant le parsing en flux"""
+
+
+class QueueRecord:
+    """Élément de queue réduit aux champs utiles, compatible avec l'accès dict (.get, [])"""
+    
+    __slots__ = QUEUE_FIELDS
+    
+    def __init__(self, data):
+        for field in QUEUE_FIELDS:
+            setattr(self, field, data.get(field))
+    
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in _QUEUE_FIELD_SET else None
+        return default if value is None else value
+    
+    def __getitem__(self, key):
+        if key not in _QUEUE_FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __contains__(self, key):
+        return key in _QUEUE_FIELD_SET and getattr(self, key) is not None
+    
+    def to_dict(self):
+        return {field: getattr(self, field) for field in QUEUE_FIELDS if getattr(self, field) is not None}
+    
+    def __repr__(self):
+        return f"QueueRecord(id={self.id!r}, title={self.title!r}, status={self.status!r})"
+
+
+def project_page(data):
+    """Projette une page décodée (dict paginé ou liste directe) en QueueRecord"""
+    if isinstance(data, list):
+        return [QueueRecord(record) for record in data]
+    data['records'] = [QueueRecord(record) for record in data.get('records') or ()]
+    return data
+
+
+def stream_page(stream):
+    """Parse une page de queue en flux, sans construire les objets imbriqués inutiles
+    
+    Retourne {'totalRecords': n, 'records': [QueueRecord]} ; seuls les champs de
+    QUEUE_FIELDS de chaque enregistrement sont matérialisés.
+    """
+    import ijson
+    
+    try:
+        return _stream_page(ijson, stream)
+    except (ijson.JSONError, Urllib3Error, OSError) as e:
+        raise QueueParseError(f"page de queue illisible : {e}") from e
+
+
+def _stream_page(ijson, stream):
+    total_records = 0
+    records = []
+    builder = None
+    skip_depth = 0
+    
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if builder is None:
+            if prefix == 'totalRecords':
+                total_records = value
+            elif prefix == 'records.item' and event == 'start_map':
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            continue
+        
+        if skip_depth:
+            # Valeur d'un champ ignoré : on suit uniquement l'imbrication
+            if skip_depth < 0:
+                skip_depth = 1 if event in ('start_map', 'start_array') else 0
+            elif event in ('start_map', 'start_array'):
+                skip_depth += 1
+            elif event in ('end_map', 'end_array'):
+                skip_depth -= 1
+            continue
+        
+        if prefix == 'records.item':
+            if event == 'map_key' and value not in _QUEUE_FIELD_SET:
+                skip_depth = -1
+                continue
+            if event == 'end_map':
+                builder.event(event, value)
+                records.append(QueueRecord(builder.value))
+                builder = None
+                continue
+        
+        builder.event(event, value)
+    
+    return {'totalRecords': total_records, 'records': records}
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Scheduler - Planification adaptative des analyses par application
+Raccourcit l'intervalle après une erreur, l'allonge progressivement sur une queue inactive
+"""
+
+import time
+
+# Résultats d'analyse d'une application (retournés par process_application)
+OUTCOME_ACTIVE = "active"    # Erreurs détectées ou remédiées
+OUTCOME_IDLE = "idle"        # Queue vide ou inchangée
+OUTCOME_NORMAL = "normal"    # Activité normale
+OUTCOME_ERROR = "error"      # Application injoignable
+
+
+class AdaptiveScheduler:
+    """Échéances de prochaine analyse par application, bornées par min/max"""
+    
+    def __init__(self, base_interval=300, min_interval=30, max_interval=1800, backoff_factor=2.0):
+        self.min_interval = max(1, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.base_interval = min(max(base_interval, self.min_interval), self.max_interval)
+        self.backoff_factor = max(1.0, backoff_factor)
+        self._intervals = {}
+        self._deadlines = {}
+    
+    @classmethod
+    def from_config(cls, monitoring_config):
+        """Construit le scheduler depuis la section monitoring de la configuration"""
+        base_interval = monitoring_config.get('check_interval', 300)
+        return cls(
+            base_interval=base_interval,
+            min_interval=monitoring_config.get('min_interval', min(30, base_interval)),
+            max_interval=monitoring_config.get('max_interval', max(1800, base_interval)),
+            backoff_factor=float(monitoring_config.get('backoff_factor', 2.0))
+        )
+    
+    def due(self, app_names, now=None):
+        """Applications dont l'échéance est atteinte (les nouvelles sont dues immédiatement)"""
+        now = time.monotonic() if now is None else now
+        return [name for name in app_names if self._deadlines.get(name, now) <= now]
+    
+    def record(self, app_name, outcome, now=None):
+        """Enregistre le résultat d'une analyse et calcule la prochaine échéance"""
+        now = time.monotonic() if now is None else now
+        previous = self._intervals.get(app_name, self.base_interval)
+        
+        if outcome == OUTCOME_ACTIVE:
+            interval = self.min_interval
+        elif outcome == OUTCOME_IDLE:
+            interval = min(previous * self.backoff_factor, self.max_interval)
+        else:
+            interval = self.base_interval
+        
+        self._intervals[app_name] = interval
+        self._deadlines[app_name] = now + interval
+        return interval
+    
+    def trigger(self, app_name):
+        """Rend une application due immédiatement"""
+        self._deadlines[app_name] = 0
+    
+    def forget(self, app_name):
+        """Oublie une application (retirée ou désactivée)"""
+        self._intervals.pop(app_name, None)
+        self._deadlines.pop(app_name, None)
+    
+    def retain(self, app_names):
+        """Oublie les applications absentes de app_names (retirées ou désactivées au rechargement)"""
+        for app_name in set(self._deadlines) - set(app_names):
+            self.forget(app_name)
+    
+    def seconds_until_next(self, app_names, now=None):
+        """Délai avant la prochaine échéance parmi les applications données"""
+        now = time.monotonic() if now is None else now
+        deadlines = [self._deadlines.get(name, now) for name in app_names]
+        if not deadlines:
+            return self.base_interval
+        return max(0.0, min(deadlines) - now)
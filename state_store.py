@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+State Store - Journal SQLite (WAL) des remédiations Sonarr/Radarr
+Tentatives par application/élément, consultées avant chaque action pour appliquer
+actions.max_retries et actions.retry_delay, y compris après un redémarrage
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+RESULT_SUCCESS = "success"
+RESULT_FAILURE = "failure"
+
+# Limite de paramètres par requête (SQLITE_MAX_VARIABLE_NUMBER des anciennes versions)
+MAX_QUERY_PARAMS = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    app TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    title TEXT,
+    rule TEXT,
+    action TEXT NOT NULL,
+    result TEXT NOT NULL,
+    attempted_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_attempts_item ON attempts (app, item_key, attempted_at);
+CREATE INDEX IF NOT EXISTS idx_attempts_time ON attempts (attempted_at);
+"""
+
+
+def item_key(item):
+    """Identifiant stable d'un élément de queue entre deux releases : épisode, film ou téléchargement"""
+    if item.get('episodeId'):
+        return f"episode:{item['episodeId']}"
+    if item.get('movieId'):
+        return f"movie:{item['movieId']}"
+    if item.get('downloadId'):
+        return f"download:{item['downloadId']}"
+    return None
+
+
+class StateStore:
+    """Journal des tentatives de remédiation, écrit par lot une fois par cycle
+    
+    En lecture seule (mode simulation), la base existante est consultée sans
+    être modifiée : les tentatives enregistrées restent en mémoire.
+    """
+    
+    def __init__(self, path, retention_days=30, compact_interval=86400, clock=time.time, read_only=False):
+        self.path = Path(path)
+        self.read_only = read_only
+        self.retention_days = retention_days
+        self.compact_interval = compact_interval
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._pending = []
+        self._last_compaction = 0
+        
+        if read_only:
+            # Sans fichier -wal, aucun processus n'écrit la base : immutable évite de créer -wal/-shm
+            uri = f"{self.path.resolve().as_uri()}?mode=ro"
+            if not self.path.with_name(self.path.name + "-wal").exists():
+                uri += "&immutable=1"
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False, isolation_level=None)
+            return
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+    
+    @classmethod
+    def from_config(cls, config, read_only=False):
+        """Crée le journal depuis la section state (None si désactivé, ou absent en lecture seule)"""
+        state_config = config.get('state', {})
+        database = state_config.get('database', 'arr-monitor.db')
+        if not database:
+            return None
+        
+        path = Path(state_config.get('directory', 'data')) / database
+        if read_only and not path.exists():
+            return None
+        return cls(path, retention_days=state_config.get('retention_days', 30), read_only=read_only)
+    
+    def attempt_stats(self, app, keys):
+        """Nombre de tentatives et date de la dernière par élément : {item_key: (count, last_attempt)}
+        
+        Les écritures en attente du cycle courant sont incluses.
+        """
+        keys = sorted({key for key in keys if key})
+        stats = {}
+        
+        with self._lock:
+            for start in range(0, len(keys), MAX_QUERY_PARAMS):
+                chunk = keys[start:start + MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT item_key, COUNT(*), MAX(attempted_at) FROM attempts "
+                    f"WHERE app = ? AND item_key IN ({placeholders}) GROUP BY item_key",
+                    (app, *chunk)
+                )
+                for key, count, last_attempt in rows:
+                    stats[key] = (count, last_attempt)
+            
+            wanted = set(keys)
+            for pending_app, key, _, _, _, _, attempted_at in self._pending:
+                if pending_app != app or key not in wanted:
+                    continue
+                count, last_attempt = stats.get(key, (0, 0))
+                stats[key] = (count + 1, max(last_attempt, attempted_at))
+        
+        return stats
+    
+    def record(self, app, key, action, result, rule=None, title=None):
+        """Ajoute une tentative au lot en attente (écrit par flush)"""
+        if not key:
+            return
+        with self._lock:
+            self._pending.append((app, key, title, rule, action, result, self.clock()))
+    
+    def flush(self):
+        """Écrit le lot en attente dans une seule transaction, puis compacte si nécessaire"""
+        if self.read_only:
+            return 0
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if pending:
+                try:
+                    with self._conn:
+                        self._conn.execute("BEGIN")
+                        self._conn.executemany(
+                            "INSERT INTO attempts (app, item_key, title, rule, action, result, attempted_at) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            pending
+                        )
+                except sqlite3.Error as e:
+                    self.logger.error(f"❌ Écriture du journal de remédiation impossible : {e}")
+                    self._pending = pending + self._pending
+                    return 0
+            
+            if self.clock() - self._last_compaction >= self.compact_interval:
+                self._compact()
+        
+        return len(pending)
+    
+    def _compact(self):
+        """Rétention : purge des tentatives plus anciennes que retention_days et checkpoint du WAL"""
+        self._last_compaction = self.clock()
+        cutoff = self._last_compaction - self.retention_days * 86400
+        try:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                deleted = self._conn.execute("DELETE FROM attempts WHERE attempted_at < ?", (cutoff,)).rowcount
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            if deleted:
+                self.logger.debug(f"🧹 Journal de remédiation : {deleted} tentative(s) purgée(s)")
+        except sqlite3.Error as e:
+            self.logger.warning(f"⚠️ Compaction du journal de remédiation impossible : {e}")
+    
+    def recent(self, app=None, limit=50):
+        """Dernières tentatives (audit), les plus récentes d'abord"""
+        query = "SELECT app, item_key, title, rule, action, result, attempted_at FROM attempts"
+        params = ()
+        if app:
+            query += " WHERE app = ?"
+            params = (app,)
+        query += " ORDER BY attempted_at DESC LIMIT ?"
+        with self._lock:
+            return self._conn.execute(query, (*params, limit)).fetchall()
+    
+    def close(self):
+        """Écrit le lot en attente et ferme la base"""
+        self.flush()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Systemd Notify - Protocole sd_notify sans dépendance externe
+Disponibilité (READY), rechargement, arrêt et watchdog pour un service Type=notify
+"""
+
+import logging
+import os
+import socket
+import time
+
+
+class SystemdNotifier:
+    """Envoie les notifications d'état à systemd ($NOTIFY_SOCKET), sans effet hors systemd"""
+    
+    def __init__(self, address=None):
+        self.address = address if address is not None else os.environ.get('NOTIFY_SOCKET')
+        self.logger = logging.getLogger(__name__)
+        self.watchdog_interval = self._watchdog_interval()
+        self._last_watchdog = 0.0
+    
+    @property
+    def enabled(self):
+        return bool(self.address)
+    
+    @staticmethod
+    def _watchdog_interval():
+        """Demi-période du watchdog (WatchdogSec) en secondes, None si inactif"""
+        watchdog_usec = os.environ.get('WATCHDOG_USEC')
+        watchdog_pid = os.environ.get('WATCHDOG_PID')
+        if not watchdog_usec or not watchdog_usec.isdigit():
+            return None
+        if watchdog_pid and watchdog_pid != str(os.getpid()):
+            return None
+        return int(watchdog_usec) / 1_000_000 / 2
+    
+    def notify(self, state):
+        """Envoie un message d'état (ex. "READY=1") ; retourne False hors systemd ou en cas d'échec"""
+        if not self.enabled:
+            return False
+        
+        address = self.address
+        if address.startswith('@'):
+            address = '\0' + address[1:]
+        
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM | socket.SOCK_CLOEXEC) as sock:
+                sock.connect(address)
+                sock.sendall(state.encode('utf-8'))
+            return True
+        except OSError as e:
+            self.logger.debug(f"sd_notify impossible ({state.splitlines()[0]}) : {e}")
+            return False
+    
+    def ready(self, status=None):
+        return self.notify("READY=1" + (f"\nSTATUS={status}" if status else ""))
+    
+    def reloading(self):
+        monotonic_usec = time.clock_gettime_ns(time.CLOCK_MONOTONIC) // 1000
+        return self.notify(f"RELOADING=1\nMONOTONIC_USEC={monotonic_usec}")
+    
+    def stopping(self):
+        return self.notify("STOPPING=1")
+    
+    def status(self, text):
+        return self.notify(f"STATUS={text}")
+    
+    def watchdog(self, force=False):
+        """Entretient le watchdog, au plus une fois par demi-période (sauf force)"""
+        if self.watchdog_interval is None:
+            return False
+        now = time.monotonic()
+        if not force and now - self._last_watchdog < self.watchdog_interval:
+            return False
+        self._last_watchdog = now
+        return self.notify("WATCHDOG=1")
@@ -0,0 +1,67 @@
+import importlib.util
+import json
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture(scope="session")
+def arr_monitor_module():
+    """Module arr-monitor.py (nom de fichier non importable directement)"""
+    spec = importlib.util.spec_from_file_location('arr_monitor', REPO_ROOT / 'arr-monitor.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def recorded_queue():
+    """Enregistrements d'une queue /api/v3/queue enregistrée (tests/fixtures/<app>_queue.json)"""
+    def load(app_name):
+        with open(FIXTURES_DIR / f"{app_name}_queue.json", encoding='utf-8') as f:
+            return json.load(f)['records']
+    return load
+
+
+def write_config(directory, **sections):
+    """config.yaml du dépôt dans un répertoire temporaire : sans découverte, serveurs ni appel GitHub"""
+    with open(REPO_ROOT / 'config.yaml', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    
+    config['state'] = dict(config['state'], directory=str(directory / 'data'))
+    config['logging'] = dict(config['logging'], file=str(directory / 'logs' / 'arr-monitor.log'), json_file='')
+    config['discovery'] = dict(config['discovery'], enabled=False)
+    config['updates'] = dict(config['updates'], check_on_startup=False)
+    for section, values in sections.items():
+        config[section] = dict(config.get(section) or {}, **values)
+    
+    config_path = directory / 'config.yaml'
+    with open(config_path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+    return config_path
+
+
+@pytest.fixture
+def make_monitor(arr_monitor_module, tmp_path):
+    """Construit des ArrMonitor sur une configuration temporaire, libérés en fin de test"""
+    monitors = []
+    root_level = logging.getLogger().level
+    
+    def make(dry_run=False, **sections):
+        monitor = arr_monitor_module.ArrMonitor(str(write_config(tmp_path, **sections)), dry_run=dry_run)
+        monitors.append(monitor)
+        return monitor
+    
+    yield make
+    for monitor in monitors:
+        monitor.shutdown()
+        monitor.log_pipeline.stop()
+    logging.getLogger().setLevel(root_level)
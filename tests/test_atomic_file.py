@@ -0,0 +1,26 @@
+import json
+
+import pytest
+
+from atomic_file import write_json_atomic, write_text_atomic
+
+
+def test_write_json_creates_parent_and_leaves_no_temp_file(tmp_path):
+    path = tmp_path / 'data' / 'queue-sonarr.json'
+    
+    write_json_atomic(path, {'rules': 'abc', 'states': {'1': ['warning', 0]}})
+    
+    assert json.loads(path.read_text(encoding='utf-8')) == {'rules': 'abc', 'states': {'1': ['warning', 0]}}
+    assert sorted(p.name for p in path.parent.iterdir()) == ['queue-sonarr.json']
+
+
+def test_failed_write_keeps_previous_content(tmp_path):
+    path = tmp_path / 'config.yaml'
+    write_text_atomic(path, "applications: {}\n")
+    # Un répertoire à la place du fichier temporaire fait échouer l'écriture
+    (tmp_path / 'config.yaml.tmp').mkdir()
+    
+    with pytest.raises(OSError):
+        write_text_atomic(path, "tronqué")
+    
+    assert path.read_text(encoding='utf-8') == "applications: {}\n"
@@ -0,0 +1,146 @@
+import io
+import json
+import socketserver
+import tarfile
+import threading
+from http.server import BaseHTTPRequestHandler
+from types import SimpleNamespace
+
+import pytest
+
+from config_refresher import update_app_block
+from docker_discovery import DockerClient, DockerDiscovery, parse_arr_config
+
+CONTAINERS = [
+    {"Id": "a1", "Names": ["/sonarr"], "Image": "lscr.io/linuxserver/sonarr:latest",
+     "NetworkSettings": {"Networks": {"traefik_proxy": {"IPAddress": "172.18.0.5"}}}, "Ports": [], "Mounts": []},
+    {"Id": "b2", "Names": ["/radarr"], "Image": "lscr.io/linuxserver/radarr:latest",
+     "NetworkSettings": {"Networks": {"bridge": {"IPAddress": "172.17.0.3"}}}, "Ports": [], "Mounts": []},
+    {"Id": "c3", "Names": ["/films-4k"], "Image": "hotio/radarr:release",
+     "NetworkSettings": {"Networks": {"bridge": {"IPAddress": ""}}},
+     "Ports": [{"PrivatePort": 7879, "PublicPort": 17879}], "Mounts": []},
+    {"Id": "d4", "Names": ["/plex"], "Image": "plexinc/pms-docker",
+     "NetworkSettings": {}, "Ports": [], "Mounts": []}
+]
+
+CONFIG_XML = {
+    "a1": "<Config><Port>8989</Port><UrlBase></UrlBase><ApiKey>sonarrkey</ApiKey></Config>",
+    "b2": "<Config><Port>7878</Port><UrlBase></UrlBase><ApiKey>radarrkey</ApiKey></Config>",
+    "c3": "<Config><Port>7879</Port><UrlBase>/4k/</UrlBase><ApiKey>radarr4kkey</ApiKey></Config>"
+}
+
+
+def _tar(name, text):
+    data = text.encode('utf-8')
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w') as archive:
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+class _DockerHandler(BaseHTTPRequestHandler):
+    """Sous-ensemble de l'API Docker Engine : /containers/json et /containers/{id}/archive"""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def address_string(self):
+        return "unix"
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _reply(self, status, body=b'', content_type='application/json'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        if self.path == '/containers/json':
+            return self._reply(200, json.dumps(self.server.containers).encode('utf-8'))
+        parts = self.path.split('/')
+        if len(parts) > 3 and parts[3].startswith('archive') and parts[2] in CONFIG_XML:
+            return self._reply(200, _tar('config.xml', CONFIG_XML[parts[2]]), 'application/x-tar')
+        self._reply(404)
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+@pytest.fixture
+def docker_socket(tmp_path):
+    socket_path = str(tmp_path / "docker.sock")
+    server = _UnixServer(socket_path, _DockerHandler)
+    server.paths = []
+    server.containers = CONTAINERS
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield SimpleNamespace(path=socket_path, server=server)
+    server.shutdown()
+    server.server_close()
+
+
+def _discovery(socket_path):
+    # Aucun chemin de repli lisible : la config ne peut venir que de l'archive
+    return DockerDiscovery(socket_path=socket_path, settings_storage="", user="nobody-arr-monitor-test")
+
+
+def test_discover_over_unix_socket(docker_socket):
+    discovered = _discovery(docker_socket.path).discover()
+    
+    assert discovered == {
+        'sonarr': {'type': 'sonarr', 'url': "http://172.18.0.5:8989", 'api_key': "sonarrkey"},
+        'radarr': {'type': 'radarr', 'url': "http://172.17.0.3:7878", 'api_key': "radarrkey"},
+        'films-4k': {'type': 'radarr', 'url': "http://localhost:17879/4k", 'api_key': "radarr4kkey"}
+    }
+    assert '/containers/json' in docker_socket.server.paths
+    assert any(path.startswith('/containers/c3/archive?path=') for path in docker_socket.server.paths)
+
+
+def test_discover_single_instance_keeps_type_name(docker_socket):
+    docker_socket.server.containers = CONTAINERS[:2]
+    
+    discovered = _discovery(docker_socket.path).discover()
+    
+    assert sorted(discovered) == ['radarr', 'sonarr']
+    assert discovered['radarr']['type'] == 'radarr'
+
+
+def test_discover_without_docker_returns_empty(tmp_path):
+    assert _discovery(str(tmp_path / "absent.sock")).discover() == {}
+
+
+def test_client_reads_file_from_archive(docker_socket):
+    client = DockerClient(docker_socket.path)
+    try:
+        xml_text = client.read_file("c3", "/config/config.xml")
+    finally:
+        client.close()
+    
+    assert parse_arr_config(xml_text) == {'api_key': "radarr4kkey", 'port': 7879, 'url_base': "/4k"}
+
+
+def test_update_app_block_writes_type():
+    text = "applications:\n  sonarr:\n    enabled: true\n    url: \"http://old:8989\"\n    api_key: \"k\"\n"
+    
+    updated = update_app_block(text, 'films-4k', {'enabled': True, 'type': 'radarr',
+                                                  'url': "http://localhost:17879/4k", 'api_key': "radarr4kkey"})
+    
+    assert '  films-4k:\n    enabled: true\n    type: "radarr"\n' in updated
+
+
+@pytest.mark.parametrize("app_config, app_name, expected", [
+    ({'type': 'radarr'}, 'films-4k', 'radarr'),
+    ({'type': 'sonarr'}, 'radarr-anime', 'sonarr'),
+    ({}, 'radarr-4k', 'radarr'),
+    ({}, 'series', 'sonarr')
+])
+def test_app_type_drives_search_command(arr_monitor_module, app_config, app_name, expected):
+    monitor = SimpleNamespace(config={'applications': {app_name: app_config}})
+    
+    assert arr_monitor_module.ArrMonitor.get_app_type(monitor, app_name) == expected
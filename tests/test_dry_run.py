@@ -0,0 +1,80 @@
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+from action_plan import ACTION_BLOCKLIST, ActionPlan
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'benchmarks'))
+
+from arr_simulator import ArrSimulator, KIND_SONARR  # noqa: E402
+
+
+@pytest.fixture
+def simulator():
+    with ArrSimulator(kind=KIND_SONARR, queue_size=40, failure_ratio=0.25, history_size=20) as sim:
+        yield sim
+
+
+def _snapshot(directory):
+    return {path.relative_to(directory): (path.stat().st_size, path.stat().st_mtime_ns)
+            for path in directory.rglob('*') if path.is_file()}
+
+
+def test_dry_run_leaves_state_untouched(make_monitor, simulator, tmp_path, caplog):
+    applications = {'sonarr': {'enabled': True, 'url': simulator.url, 'api_key': simulator.api_key}}
+    actions = {'retry_delay': 0}
+    
+    # Un premier cycle réel crée le journal SQLite et les caches
+    monitor = make_monitor(applications=applications, actions=actions)
+    monitor.run_cycle()
+    monitor.shutdown()
+    simulator.reset()
+    state_dir = tmp_path / 'data'
+    before = _snapshot(state_dir)
+    assert before
+    
+    monitor = make_monitor(dry_run=True, applications=applications, actions=actions)
+    with caplog.at_level(logging.INFO):
+        monitor.run_cycle()
+    monitor.shutdown()
+    
+    assert monitor.state_store.read_only
+    assert _snapshot(state_dir) == before
+    assert len(simulator.queue) == 40
+    plan = monitor.action_plan.to_dict()
+    assert [action['type'] for action in plan['applications']['sonarr']['actions']][:1] == [ACTION_BLOCKLIST]
+    assert any(record.getMessage().startswith("🚫 [simulation] sonarr") for record in caplog.records)
+
+
+def test_dry_run_without_database_opens_nothing(make_monitor, arr_monitor_module, monkeypatch, tmp_path):
+    checks = []
+    monkeypatch.setattr(arr_monitor_module.ArrMonitor, 'check_for_updates_async', lambda self: checks.append(self))
+    
+    monitor = make_monitor(dry_run=True, updates={'check_on_startup': True})
+    
+    assert monitor.state_store is None
+    assert checks == []
+    assert not (tmp_path / 'data').exists()
+
+
+def test_plan_separates_apps_behind_one_host(make_monitor):
+    monitor = make_monitor(dry_run=True)
+    monitor._register_app_host('sonarr', "https://media.example.org/sonarr")
+    monitor._register_app_host('sonarr-4k', "https://media.example.org/sonarr4k/")
+    monitor._register_app_host('radarr', "http://172.18.0.6:7878")
+    
+    assert monitor._resolve_app("https://media.example.org/sonarr/api/v3/queue/1") == 'sonarr'
+    assert monitor._resolve_app("https://media.example.org/sonarr4k/api/v3/command") == 'sonarr-4k'
+    assert monitor._resolve_app("http://172.18.0.6:7878/api/v3/queue/bulk") == 'radarr'
+    assert monitor._resolve_app("https://media.example.org/lidarr/api/v1/queue") == 'unknown'
+
+
+def test_action_plan_defaults_to_host():
+    plan = ActionPlan()
+    plan.intercept('POST', "http://sonarr:8989/api/v3/command", json={'name': 'MissingEpisodeSearch'})
+    
+    assert plan.to_dict()['applications']['sonarr:8989']['actions'] == [
+        {'type': 'search', 'command': 'MissingEpisodeSearch'}
+    ]
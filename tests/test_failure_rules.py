@@ -0,0 +1,213 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from diagnose_report import summarize_queue
+from failure_rules import (ACTION_BLOCKLIST_SEARCH, ACTION_IGNORE, ACTION_REMOVE, DEFAULT_RULES,
+                           FailureClassifier, FailureRule)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _classifier(*rules, stall=None):
+    config = {'detection': {'rules': list(rules)}}
+    if stall is not None:
+        config['detection']['stall'] = stall
+    return FailureClassifier.from_config(config)
+
+
+def _by_title(records):
+    return {record['title']: record for record in records}
+
+
+def _matches(classifier, records):
+    """{titre: nom de la règle} des éléments reconnus"""
+    return {record['title']: rule.name for record in records
+            for rule in [classifier.classify(record)] if rule is not None}
+
+
+# Règle par défaut
+
+def test_default_rule_only_matches_qbittorrent_error(recorded_queue):
+    classifier = FailureClassifier.from_config({})
+    
+    assert [rule.name for rule in classifier.rules] == [DEFAULT_RULES[0]['name']]
+    assert _matches(classifier, recorded_queue('sonarr')) == {
+        "The.Show.S02E05.1080p.WEB.H264-GROUP": 'qbittorrent_error'
+    }
+    assert _matches(classifier, recorded_queue('radarr')) == {
+        "A.Movie.2019.1080p.BluRay.x264-GROUP": 'qbittorrent_error'
+    }
+    assert classifier.stall_rule is None
+
+
+def test_shipped_config_compiles_to_default_behaviour(recorded_queue):
+    with open(REPO_ROOT / 'config.yaml', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    
+    classifier = FailureClassifier.from_config(config)
+    
+    assert [rule.name for rule in classifier.rules] == ['qbittorrent_error']
+    assert classifier.classify(_by_title(recorded_queue('sonarr'))["The.Show.S02E05.1080p.WEB.H264-GROUP"]).action \
+        == ACTION_BLOCKLIST_SEARCH
+
+
+def test_disabled_rules_are_skipped():
+    classifier = _classifier(
+        {'name': 'off', 'enabled': False, 'status': 'failed', 'action': ACTION_REMOVE},
+        {'name': 'on', 'status': 'failed', 'action': ACTION_REMOVE}
+    )
+    
+    assert [rule.name for rule in classifier.rules] == ['on']
+
+
+# Index par statut et états suivis
+
+def test_status_index_only_evaluates_candidate_rules(recorded_queue):
+    classifier = _classifier(
+        {'name': 'failed', 'status': ['Failed'], 'action': ACTION_REMOVE},
+        {'name': 'client_down', 'status': 'downloadClientUnavailable', 'action': ACTION_IGNORE},
+        {'name': 'any_error', 'error_message': '.', 'action': ACTION_BLOCKLIST_SEARCH}
+    )
+    
+    assert set(classifier._by_status) == {'failed', 'downloadclientunavailable'}
+    assert [rule.name for rule in classifier._by_status['failed']] == ['failed', 'any_error']
+    assert [rule.name for rule in classifier._wildcard] == ['any_error']
+    
+    assert _matches(classifier, recorded_queue('sonarr')) == {
+        "The.Show.S02E05.1080p.WEB.H264-GROUP": 'any_error',
+        "Old.Show.S05E01.1080p.WEB.H264-GROUP": 'failed'
+    }
+    assert _matches(classifier, recorded_queue('radarr')) == {
+        "A.Movie.2019.1080p.BluRay.x264-GROUP": 'any_error',
+        "Un.Film.2015.MULTi.720p.BluRay.x264-GROUP": 'client_down'
+    }
+
+
+def test_status_match_is_case_insensitive():
+    classifier = _classifier({'name': 'failed', 'status': 'failed', 'action': ACTION_REMOVE})
+    
+    assert classifier.classify({'status': 'FAILED'}).name == 'failed'
+    assert classifier.classify({'status': None}) is None
+    assert classifier.classify({}) is None
+
+
+def test_tracked_state_and_status(recorded_queue):
+    classifier = _classifier(
+        {'name': 'blocked', 'tracked_download_state': ['importBlocked'], 'action': ACTION_BLOCKLIST_SEARCH},
+        {'name': 'tracked_error', 'tracked_download_status': 'error', 'action': ACTION_REMOVE}
+    )
+    
+    assert _matches(classifier, recorded_queue('sonarr')) == {
+        "The.Show.S02E06.1080p.WEB.H264-GROUP": 'blocked',
+        "Old.Show.S05E01.1080p.WEB.H264-GROUP": 'tracked_error'
+    }
+
+
+def test_all_criteria_of_a_rule_must_match(recorded_queue):
+    classifier = _classifier({
+        'name': 'pending_warning',
+        'status': 'completed',
+        'tracked_download_state': 'importPending',
+        'tracked_download_status': 'warning',
+        'action': ACTION_REMOVE
+    })
+    
+    assert _matches(classifier, recorded_queue('sonarr')) == {
+        "Other.Show.S01E03.720p.HDTV.x264-TVG": 'pending_warning'
+    }
+
+
+# statusMessages
+
+def test_status_messages_regex_matches_messages(recorded_queue):
+    classifier = _classifier({
+        'name': 'no_eligible_files',
+        'tracked_download_state': ['importPending', 'importBlocked'],
+        'status_messages': "No files found are eligible for import"
+    })
+    
+    assert _matches(classifier, recorded_queue('sonarr')) == {
+        "The.Show.S02E06.1080p.WEB.H264-GROUP": 'no_eligible_files'
+    }
+    assert _matches(classifier, recorded_queue('radarr')) == {}
+
+
+def test_status_messages_regex_matches_titles(recorded_queue):
+    # Titres et messages sont joints ligne par ligne : (?m) pour ancrer sur chaque ligne
+    classifier = _classifier(
+        {'name': 'sample_only', 'status_messages': r"(?im)\.sample\.mkv$"},
+        {'name': 'not_upgrade', 'status_messages': r"(?m)^Not an upgrade", 'action': ACTION_REMOVE}
+    )
+    
+    assert _matches(classifier, recorded_queue('sonarr')) == {
+        "Other.Show.S01E03.720p.HDTV.x264-TVG": 'sample_only'
+    }
+    assert _matches(classifier, recorded_queue('radarr')) == {
+        "Another.Movie.2021.1080p.WEB-DL.DDP5.1.H.264-GROUP": 'not_upgrade'
+    }
+
+
+def test_status_messages_rule_ignores_items_without_messages():
+    classifier = _classifier({'name': 'anything', 'status_messages': ".*"})
+    
+    assert classifier.classify({'status': 'warning', 'statusMessages': []}) is None
+    assert classifier.classify({'status': 'warning'}) is None
+    assert classifier.classify({'status': 'warning', 'statusMessages': ["texte brut"]}).name == 'anything'
+
+
+# Action ignore et ordre de déclaration
+
+def test_ignore_rule_shadows_later_rules(recorded_queue):
+    classifier = _classifier(
+        {'name': 'warning_state', 'tracked_download_status': 'warning', 'action': ACTION_IGNORE},
+        DEFAULT_RULES[0]
+    )
+    records = recorded_queue('sonarr')
+    
+    rule = classifier.classify(_by_title(records)["The.Show.S02E05.1080p.WEB.H264-GROUP"])
+    
+    assert (rule.name, rule.action) == ('warning_state', ACTION_IGNORE)
+    # Reconnus mais jamais comptés comme erreurs
+    assert summarize_queue(records, classifier.classify, now=0)['error_count'] == 0
+
+
+def test_first_declared_rule_wins(recorded_queue):
+    qbittorrent = _by_title(recorded_queue('radarr'))["A.Movie.2019.1080p.BluRay.x264-GROUP"]
+    specific = {'name': 'specific', 'status': 'warning', 'error_message': 'qBittorrent', 'action': ACTION_REMOVE}
+    generic = {'name': 'generic', 'error_message': 'error', 'action': ACTION_BLOCKLIST_SEARCH}
+    
+    assert _classifier(specific, generic).classify(qbittorrent).name == 'specific'
+    # Une règle sans statut déclarée avant reste prioritaire sur une règle indexée
+    assert _classifier(generic, specific).classify(qbittorrent).name == 'generic'
+
+
+# Règles invalides
+
+@pytest.mark.parametrize("rule_config, message", [
+    ({'name': 'bad_action', 'status': 'failed', 'action': 'delete'}, "action inconnue"),
+    ({'name': 'bad_error_regex', 'error_message': "qBittorrent (error"}, "expression régulière invalide"),
+    ({'name': 'bad_messages_regex', 'status_messages': "[sample"}, "expression régulière invalide"),
+    ({'name': 'no_criteria', 'action': ACTION_REMOVE}, "au moins un critère"),
+    ({'name': 'unknown_key', 'status': 'failed', 'error': 'x'}, "unknown_key")
+])
+def test_invalid_rules_raise_value_error(rule_config, message):
+    with pytest.raises(ValueError, match=message):
+        _classifier(rule_config)
+
+
+def test_invalid_stall_action_raises_value_error():
+    with pytest.raises(ValueError, match="action inconnue"):
+        _classifier(DEFAULT_RULES[0], stall={'enabled': True, 'action': 'pause'})
+
+
+# Empreinte
+
+def test_digest_tracks_rule_changes():
+    base = FailureClassifier.from_config({})
+    
+    assert FailureClassifier.from_config({}).digest == base.digest
+    assert FailureClassifier([FailureRule(**DEFAULT_RULES[0])]).digest == base.digest
+    assert _classifier(dict(DEFAULT_RULES[0], action=ACTION_REMOVE)).digest != base.digest
+    assert _classifier(DEFAULT_RULES[0], stall={'enabled': True}).digest != base.digest
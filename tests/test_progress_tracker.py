@@ -0,0 +1,53 @@
+from progress_tracker import ProgressTracker, format_size
+
+
+def _item(item_id, sizeleft):
+    return {'id': item_id, 'sizeleft': sizeleft}
+
+
+def test_stalled_item_flagged_after_window():
+    tracker = ProgressTracker(window=600, samples=4)
+    
+    assert tracker.observe([_item(1, 1000), _item(2, 1000)], now=0) == []
+    tracker.observe([_item(1, 1000), _item(2, 800)], now=300)
+    stalled = tracker.observe([_item(1, 1000), _item(2, 600)], now=600)
+    
+    assert [item['id'] for item in stalled] == [1]
+
+
+def test_throughput_and_eta_over_sample_window():
+    tracker = ProgressTracker(window=3600, samples=3)
+    for now, sizeleft in ((0, 10_000), (100, 9_000), (200, 8_000), (300, 6_000)):
+        tracker.observe([_item(7, sizeleft)], now=now)
+    
+    series = tracker.get(7)
+    # Fenêtre de 3 échantillons : 200 s pour 3000 octets
+    assert series.span() == 200
+    assert series.throughput() == 15.0
+    assert series.eta() == 400.0
+    assert tracker.total_throughput() == 15.0
+
+
+def test_no_rate_without_progress():
+    tracker = ProgressTracker(window=60)
+    tracker.observe([_item(1, 500)], now=0)
+    
+    assert tracker.get(1).throughput() is None
+    tracker.observe([_item(1, 500)], now=120)
+    assert tracker.get(1).throughput() == 0.0
+    assert tracker.get(1).eta() is None
+
+
+def test_items_leaving_queue_are_evicted():
+    tracker = ProgressTracker()
+    tracker.observe([_item(1, 10), _item(2, 10)], now=0)
+    tracker.observe([_item(2, 5)], now=60)
+    
+    assert len(tracker) == 1
+    assert tracker.get(1) is None
+
+
+def test_format_size():
+    assert format_size(512) == "512 o"
+    assert format_size(1536) == "1.5 Ko"
+    assert format_size(3 * 1024 ** 3) == "3.0 Go"
@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'benchmarks'))
+
+from arr_simulator import ArrSimulator, KIND_SONARR, API_PREFIX  # noqa: E402
+
+
+class FlakyPageSimulator(ArrSimulator):
+    """Simulateur dont une page de queue peut être forcée en échec ou vide"""
+    
+    failing_page = None
+    empty_page = None
+    
+    def handle(self, method, path, query, body):
+        if method == 'GET' and path == f"{API_PREFIX}/queue":
+            page = query.get('page', ['1'])[0]
+            if page == self.failing_page:
+                self._count(method, path)
+                return 503, None
+            if page == self.empty_page:
+                status, payload = super().handle(method, path, query, body)
+                return status, dict(payload, records=[])
+        return super().handle(method, path, query, body)
+
+
+@pytest.fixture
+def simulator():
+    with FlakyPageSimulator(kind=KIND_SONARR, queue_size=100, failure_ratio=0.0) as sim:
+        yield sim
+
+
+def _monitor(make_monitor, simulator):
+    return make_monitor(
+        applications={'sonarr': {'enabled': True, 'url': simulator.url, 'api_key': simulator.api_key}},
+        monitoring={'queue_page_size': 25}
+    )
+
+
+@pytest.mark.parametrize('page_attr', ['failing_page', 'empty_page'])
+def test_incomplete_queue_is_an_error(make_monitor, simulator, page_attr):
+    monitor = _monitor(make_monitor, simulator)
+    assert len(monitor.get_queue('sonarr', simulator.url, simulator.api_key)) == 100
+    
+    assert monitor.run_cycle()['sonarr'] != 'error'
+    assert len(monitor.get_queue_cache('sonarr')) == 100
+    
+    setattr(simulator, page_attr, '2')
+    assert monitor.get_queue('sonarr', simulator.url, simulator.api_key) is None
+    assert monitor.run_cycle()['sonarr'] == 'error'
+    # Le cache n'est pas réduit aux éléments de la première page
+    assert len(monitor.get_queue_cache('sonarr')) == 100
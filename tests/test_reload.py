@@ -0,0 +1,89 @@
+import logging
+import os
+
+import yaml
+
+from cycle_profiler import CycleProfiler
+
+
+def _reload(monitor, **sections):
+    """Réécrit des sections du fichier de configuration puis recharge (comme SIGHUP)"""
+    with open(monitor.config_path, encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    for section, values in sections.items():
+        config[section] = dict(config.get(section) or {}, **values)
+    with open(monitor.config_path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+    assert monitor.reload_config()
+
+
+def test_transport_rebuilt_when_timeouts_change(make_monitor):
+    monitor = make_monitor()
+    transport = monitor.transport
+    
+    _reload(monitor, monitoring={'check_interval': 120})
+    assert monitor.transport is transport
+    
+    _reload(monitor, monitoring={'read_timeout': 7, 'max_retries': 1})
+    assert monitor.transport is not transport
+    assert monitor.transport.max_retries == 1
+    assert monitor.transport.read_timeout in (7, 7 * 1.5)
+
+
+def test_reload_keeps_dry_run_interception(make_monitor):
+    monitor = make_monitor()
+    monitor.enable_dry_run()
+    
+    _reload(monitor, monitoring={'connect_timeout': 2}, state={'queue_cache': True})
+    
+    assert monitor.transport.interceptor == monitor.action_plan.intercept
+    assert monitor.config['state']['queue_cache'] is False
+
+
+def test_privacy_and_log_level_follow_reload(make_monitor):
+    monitor = make_monitor(privacy={'anonymize_logs': True}, logging={'level': 'INFO'})
+    
+    _reload(monitor, privacy={'anonymize_logs': False}, logging={'level': 'DEBUG'})
+    
+    assert monitor.anonymizing_filter.anonymizer is monitor.anonymizer
+    assert monitor.anonymizer.enabled is False
+    assert logging.getLogger().level == logging.DEBUG
+
+
+def test_discovery_and_profiling_rebuilt(make_monitor, tmp_path):
+    monitor = make_monitor()
+    
+    _reload(monitor, discovery={'docker_network': 'arr_net'},
+            profiling={'enabled': True, 'trace_file': str(tmp_path / 'trace.jsonl')})
+    
+    assert monitor.config_refresher.discovery.docker_network == 'arr_net'
+    assert isinstance(monitor.profiler, CycleProfiler)
+
+
+def test_startup_only_settings_are_reported(make_monitor, tmp_path, caplog):
+    monitor = make_monitor()
+    
+    with caplog.at_level(logging.WARNING):
+        _reload(monitor, logging={'file': str(tmp_path / 'autre.log')}, state={'retention_days': 7})
+    
+    assert any("Redémarrage nécessaire" in record.getMessage()
+               and "logging.file" in record.getMessage() and "state.retention_days" in record.getMessage()
+               for record in caplog.records)
+
+
+def test_invalid_config_change_keeps_current_config(make_monitor, caplog):
+    monitor = make_monitor(discovery={'enabled': False})
+    config = monitor.config
+    
+    with open(monitor.config_path, 'w', encoding='utf-8') as f:
+        f.write("monitoring: [check_interval: 60\n")
+    stat = os.stat(monitor.config_path)
+    os.utime(monitor.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    
+    with caplog.at_level(logging.ERROR):
+        assert monitor.refresh_config() is False
+    
+    assert monitor.config is config
+    assert any("configuration conservée" in record.getMessage() for record in caplog.records)
+    # Fichier inchangé depuis : pas de nouvelle tentative au cycle suivant
+    assert monitor.refresh_config() is False
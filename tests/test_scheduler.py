@@ -0,0 +1,14 @@
+from scheduler import AdaptiveScheduler, OUTCOME_IDLE
+
+
+def test_retain_forgets_removed_applications():
+    scheduler = AdaptiveScheduler(base_interval=300, min_interval=30, max_interval=1800)
+    scheduler.record('sonarr', OUTCOME_IDLE, now=0)
+    scheduler.record('radarr', OUTCOME_IDLE, now=0)
+    assert scheduler.due(['sonarr', 'radarr'], now=10) == []
+    
+    # radarr désactivé puis réactivé : due immédiatement, intervalle de base
+    scheduler.retain(['sonarr'])
+    assert scheduler.due(['sonarr', 'radarr'], now=10) == ['radarr']
+    assert scheduler.record('radarr', OUTCOME_IDLE, now=10) == 600
+    assert scheduler.record('sonarr', OUTCOME_IDLE, now=10) == 1200
@@ -0,0 +1,63 @@
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'benchmarks'))
+
+from arr_simulator import ArrSimulator, KIND_SONARR  # noqa: E402
+
+
+@pytest.fixture
+def simulator():
+    # Aucun échec déclaré : seule la détection de blocage peut signaler des éléments
+    with ArrSimulator(kind=KIND_SONARR, queue_size=5, failure_ratio=0.0) as sim:
+        yield sim
+
+
+def _monitor(make_monitor, simulator, **actions):
+    return make_monitor(
+        applications={'sonarr': {'enabled': True, 'url': simulator.url, 'api_key': simulator.api_key}},
+        detection={'stall': {'enabled': True, 'window': 0, 'statuses': ['downloading']}},
+        actions=dict({'retry_delay': 0}, **actions)
+    )
+
+
+def _messages(caplog, marker):
+    return [record.getMessage() for record in caplog.records if marker in record.getMessage()]
+
+
+def test_abandoned_stalls_reported_once(make_monitor, simulator, caplog):
+    monitor = _monitor(make_monitor, simulator, max_retries=0)
+    
+    with caplog.at_level(logging.INFO):
+        outcomes = [monitor.run_cycle()['sonarr'] for _ in range(3)]
+    
+    assert 'active' not in outcomes
+    assert len(_messages(caplog, "téléchargement bloqué")) == 5
+    assert len(_messages(caplog, "abandon")) == 5
+    assert len(simulator.queue) == 5
+
+
+def test_stalls_without_auto_retry_reported_once(make_monitor, simulator, caplog):
+    monitor = _monitor(make_monitor, simulator, auto_retry=False)
+    
+    with caplog.at_level(logging.INFO):
+        outcomes = [monitor.run_cycle()['sonarr'] for _ in range(3)]
+    
+    assert outcomes[1:] == ['idle', 'idle']
+    assert len(_messages(caplog, "téléchargement bloqué")) == 5
+
+
+def test_deferred_stalls_are_reported_again(make_monitor, simulator, caplog):
+    monitor = _monitor(make_monitor, simulator, retry_delay=3600)
+    # Tentative récente enregistrée : la remédiation est reportée à chaque cycle
+    for item in simulator.queue:
+        monitor.state_store.record('sonarr', f"episode:{item['episodeId']}", 'blocklist_search', 'failure')
+    
+    with caplog.at_level(logging.INFO):
+        for _ in range(2):
+            monitor.run_cycle()
+    
+    assert len(_messages(caplog, "téléchargement bloqué")) == 10
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Transport - Couche HTTP mutualisée pour les API Sonarr/Radarr
+Pool de connexions keep-alive par hôte, limite de concurrence, timeouts configurables
+et nouvelles tentatives avec backoff exponentiel (jitter) sur les lectures
+"""
+
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Statuts transitoires justifiant une nouvelle tentative (*arr occupé, proxy, limitation)
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+class ArrTransport:
+    """Sessions requests par hôte *arr avec retries et limite de requêtes simultanées"""
+    
+    def __init__(self, connect_timeout=5, read_timeout=30, max_retries=3, backoff_base=0.5,
+                 backoff_max=10.0, max_connections_per_host=4, user_agent=None, hooks=None):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_connections_per_host = max(1, int(max_connections_per_host))
+        self.user_agent = user_agent
+        self.hooks = list(hooks or [])
+        self.interceptor = None
+        self.logger = logging.getLogger(__name__)
+        self._hosts = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, config, user_agent=None, hooks=None):
+        """Construit le transport depuis la section monitoring de la configuration"""
+        monitoring_config = config.get('monitoring', {})
+        return cls(
+            connect_timeout=monitoring_config.get('connect_timeout', 5),
+            read_timeout=monitoring_config.get('read_timeout', 30),
+            max_retries=monitoring_config.get('max_retries', 3),
+            backoff_base=monitoring_config.get('retry_backoff', 0.5),
+            max_connections_per_host=monitoring_config.get('max_connections_per_host', 4),
+            user_agent=user_agent,
+            hooks=hooks
+        )
+    
+    def extend_timeouts(self, factor):
+        """Allonge les timeouts (serveurs lents, ARM64)"""
+        self.connect_timeout *= factor
+        self.read_timeout *= factor
+    
+    def set_user_agent(self, user_agent):
+        self.user_agent = user_agent
+        with self._lock:
+            for session, _ in self._hosts.values():
+                session.headers['User-Agent'] = user_agent
+    
+    def _host(self, url):
+        """Session et sémaphore dédiés à l'hôte de l'URL (créés à la demande)"""
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        with self._lock:
+            host = self._hosts.get(key)
+            if host is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1,
+                                      pool_maxsize=self.max_connections_per_host,
+                                      max_retries=0)
+                session.mount(f"{parts.scheme}://", adapter)
+                if self.user_agent:
+                    session.headers['User-Agent'] = self.user_agent
+                for hook in self.hooks:
+                    session.hooks['response'].append(hook)
+                host = self._hosts[key] = (session, threading.BoundedSemaphore(self.max_connections_per_host))
+            return host
+    
+    def _backoff(self, attempt, response=None):
+        """Délai avant la tentative suivante : Retry-After si fourni, sinon exponentiel avec jitter"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(ceiling / 2, ceiling)
+    
+    def request(self, method, url, **kwargs):
+        """Exécute une requête ; les méthodes idempotentes sont retentées sur erreur transitoire
+        
+        Si un intercepteur est défini (mode simulation), les requêtes mutantes lui
+        sont confiées au lieu d'être envoyées.
+        """
+        method = method.upper()
+        if self.interceptor is not None and method not in IDEMPOTENT_METHODS:
+            return self.interceptor(method, url, **kwargs)
+        session, semaphore = self._host(url)
+        kwargs.setdefault('timeout', (self.connect_timeout, self.read_timeout))
+        retries = self.max_retries if method in IDEMPOTENT_METHODS else 0
+        
+        attempt = 0
+        while True:
+            response = None
+            try:
+                with semaphore:
+                    response = session.request(method, url, **kwargs)
+                if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                    return response
+                reason = f"HTTP {response.status_code}"
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= retries:
+                    raise
+                reason = type(e).__name__
+            
+            delay = self._backoff(attempt, response)
+            attempt += 1
+            self.logger.debug(f"🔁 {urlsplit(url).netloc} {reason}, nouvelle tentative {attempt}/{retries} dans {delay:.1f}s")
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+    
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+    
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+    
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+    
+    def close(self):
+        with self._lock:
+            for session, _ in self._hosts.values():
+                session.close()
+            self._hosts.clear()
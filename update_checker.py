@@ -1,23 +1,27 @@
 #!/usr/bin/env python3
 """
 Update Checker - Vérification automatique des mises à jour GitHub
+Réponse de la dernière release mise en cache sur disque (TTL + ETag/If-None-Match)
 """
 
 import requests
 import json
 import logging
-from packaging import version
-import sys
+import time
 from pathlib import Path
 
+from atomic_file import write_json_atomic
+
 class UpdateChecker:
-    def __init__(self, repo="kesurof/Arr-Monitor", current_version=None):
+    def __init__(self, repo="kesurof/Arr-Monitor", current_version=None, cache_path=None, cache_ttl=86400):
         self.repo = repo
         # Lire la version depuis le fichier .version si pas fournie
         if current_version is None:
             current_version = self._read_version_file()
         self.current_version = current_version
         self.api_url = f"https://api.github.com/repos/{repo}/releases/latest"
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.cache_ttl = cache_ttl
         self.logger = logging.getLogger(__name__)
     
     def _read_version_file(self):
@@ -31,15 +35,53 @@ class UpdateChecker:
             pass
         return "1.1.4"  # Fallback
         
+    def _load_cache(self):
+        """Cache disque : {'repo', 'etag', 'fetched_at', 'release'} (None si absent ou illisible)"""
+        if not self.cache_path or not self.cache_path.exists():
+            return None
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return cache if isinstance(cache, dict) and cache.get('repo') == self.repo else None
+    
+    def _save_cache(self, release, etag=None):
+        if not self.cache_path:
+            return
+        try:
+            write_json_atomic(self.cache_path, {'repo': self.repo, 'etag': etag, 'fetched_at': time.time(),
+                                                'release': release})
+        except OSError as e:
+            self.logger.debug(f"Cache des mises à jour non enregistré : {e}")
+    
     def get_latest_release(self):
-        """Récupère les informations de la dernière release GitHub"""
+        """Récupère les informations de la dernière release GitHub
+        
+        Avec un cache, la réponse est réutilisée pendant cache_ttl secondes puis
+        revalidée par If-None-Match (un 304 ne consomme pas de quota GitHub).
+        """
+        cache = self._load_cache()
+        if cache is not None and time.time() - cache.get('fetched_at', 0) < self.cache_ttl:
+            return cache.get('release')
+        
+        headers = {'Accept': 'application/vnd.github+json'}
+        if cache is not None and cache.get('etag'):
+            headers['If-None-Match'] = cache['etag']
+        
         try:
-            response = requests.get(self.api_url, timeout=10)
+            response = requests.get(self.api_url, headers=headers, timeout=10)
+            if response.status_code == 304:
+                self._save_cache(cache.get('release'), cache.get('etag'))
+                return cache.get('release')
             response.raise_for_status()
-            return response.json()
+            release = response.json()
+            self._save_cache(release, response.headers.get('ETag'))
+            return release
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
                 self.logger.info("ℹ️  Aucune release disponible sur GitHub pour le moment")
+                self._save_cache(None, e.response.headers.get('ETag'))
                 return None
             else:
                 self.logger.error(f"❌ Erreur HTTP lors de la vérification des mises à jour : {e}")
@@ -60,6 +102,9 @@ class UpdateChecker:
         download_url = latest_release.get('html_url', '')
         
         try:
+            # Import différé : packaging n'est chargé que lorsqu'une release est à comparer
+            from packaging import version
+            
             if version.parse(latest_version) > version.parse(self.current_version):
                 return latest_version, release_notes, download_url
             else:
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Webhook Server - Réception des notifications Webhook de Sonarr/Radarr
+Les événements (DownloadFailed, ManualInteractionRequired...) déclenchent une
+réanalyse ciblée de l'application concernée, le polling devenant un filet de sécurité
+"""
+
+import base64
+import hmac
+import json
+import logging
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+WEBHOOK_PATH_PREFIX = "/webhook/"
+MAX_BODY_SIZE = 1024 * 1024
+
+
+def _basic_auth_password(header):
+    """Mot de passe d'un en-tête Authorization: Basic (None si absent ou invalide)"""
+    if not header or not header.startswith('Basic '):
+        return None
+    try:
+        decoded = base64.b64decode(header[6:]).decode('utf-8')
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return decoded.partition(':')[2]
+
+
+class WebhookServer:
+    """Serveur HTTP recevant POST /webhook/<application> dans un thread dédié
+    
+    handler(app_name, payload) traite l'événement et retourne le code HTTP à
+    renvoyer. Si un jeton est configuré, il doit être fourni en paramètre
+    ?token= ou comme mot de passe (authentification Basic du webhook *arr).
+    """
+    
+    def __init__(self, handler, host="0.0.0.0", port=9311, token=None):
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.token = token or None
+        self.logger = logging.getLogger(__name__)
+        self._server = None
+    
+    def _authorized(self, query, authorization):
+        if self.token is None:
+            return True
+        candidates = parse_qs(query).get('token', []) + [_basic_auth_password(authorization) or '']
+        return any(hmac.compare_digest(candidate.encode('utf-8'), self.token.encode('utf-8'))
+                   for candidate in candidates)
+    
+    def start(self):
+        # Import différé : serveur HTTP chargé uniquement s'il est activé
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                parts = urlsplit(self.path)
+                if not parts.path.startswith(WEBHOOK_PATH_PREFIX):
+                    return self._reply(404)
+                if not server._authorized(parts.query, self.headers.get('Authorization')):
+                    return self._reply(401)
+                
+                try:
+                    length = int(self.headers.get('Content-Length') or 0)
+                except ValueError:
+                    return self._reply(400)
+                if length > MAX_BODY_SIZE:
+                    return self._reply(413)
+                try:
+                    payload = json.loads(self.rfile.read(length) or b'{}')
+                except ValueError:
+                    return self._reply(400)
+                if not isinstance(payload, dict):
+                    return self._reply(400)
+                
+                app_name = parts.path[len(WEBHOOK_PATH_PREFIX):].strip('/')
+                try:
+                    status = server.handler(app_name, payload)
+                except Exception as e:
+                    server.logger.error(f"❌ Webhook {app_name} : erreur de traitement : {e}")
+                    status = 500
+                self._reply(status)
+            
+            def _reply(self, status):
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="webhook-server", daemon=True).start()
+        self.logger.info(f"📬 Webhooks Sonarr/Radarr acceptés sur http://{self.host}:{self.port}{WEBHOOK_PATH_PREFIX}<application>")
+    
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None